@@ -1,18 +1,34 @@
-import time
+import asyncio
 import argparse
 import traceback
 
 import cv2
 
-from src.detection.detector import detect_cat, debug_draw
-from src.detection.camera import get_camera, read_frame
+from src.detection.detector import debug_draw, get_model
+from src.detection.camera import get_camera
+from src.detection.cascade import ResolutionCascade
+from src.detection.motion import MotionCropDetector
+from src.detection.prefilter import PresencePrefilter
+from src.detection.preprocessing import BlobPreprocessor
 from src.deterrent import get_deterrent
+from src.decision import DeterrentController
+from src.loop import DetectionLoop
+from src.pipeline import Pipeline
+from src.history.store import DetectionLog
+from src.utils.profiler import SamplingProfiler
 from src.config import (
-    DETERRENT_DURATION,
-    FREQUENCY,
     CAMERA_INDEX,
-    DETECTION_HOLD_TIME,
     DETERRENT_TYPE,
+    CASCADE_ENABLED,
+    PREFILTER_ENABLED,
+    MOTION_CROPS_ENABLED,
+    FUSED_PREPROCESS,
+    INPUT_SIZE,
+    PREPROCESS_MODE,
+    HISTORY_ENABLED,
+    HISTORY_DIR,
+    REMOTE_INFERENCE_URL,
+    PROFILE_DURATION,
 )
 from src.utils.logger import logger
 
@@ -25,51 +41,85 @@ def main():
     deterrent = get_deterrent(deterrent_type=DETERRENT_TYPE)
     deterrent.setup()
     cap = get_camera(index=CAMERA_INDEX)
+    controller = DeterrentController()
+    if CASCADE_ENABLED and REMOTE_INFERENCE_URL is not None:
+        # The cascade runs its models locally, the server has a single input size
+        logger.warning("Resolution cascade disabled while using remote inference")
+    cascade = (
+        ResolutionCascade()
+        if CASCADE_ENABLED and REMOTE_INFERENCE_URL is None
+        else None
+    )
+    prefilter = PresencePrefilter() if PREFILTER_ENABLED else None
+    motion = MotionCropDetector() if MOTION_CROPS_ENABLED and cascade is None else None
+    # Each input size needs its own exported model, fail now if one is missing
+    if cascade is not None:
+        get_model(cascade.low_size)
+    if motion is not None:
+        get_model(motion.crop_size)
+    preprocessor = (
+        BlobPreprocessor(input_size=INPUT_SIZE, mode=PREPROCESS_MODE)
+        # Remote inference takes letterboxed frames through detect_objects
+        if FUSED_PREPROCESS and REMOTE_INFERENCE_URL is None
+        else None
+    )
+    history = DetectionLog(HISTORY_DIR) if HISTORY_ENABLED else None
 
-    # State
-    cat_detected_since = None
-    deterrent_active = False
-
-    try:
-        while True:
-            frame = read_frame(cap)
-            detection = detect_cat(frame, debug=debug_mode)
+    loop = DetectionLoop(
+        cap,
+        deterrent,
+        controller=controller,
+        cascade=cascade,
+        prefilter=prefilter,
+        motion=motion,
+        preprocessor=preprocessor,
+        history=history,
+        # Detection boxes are only needed by the debug view and the history log
+        want_boxes=debug_mode or history is not None,
+    )
 
-            if detection["detected"]:
-                now = time.time()
-                if cat_detected_since is None:
-                    cat_detected_since = now
-                elif now - cat_detected_since >= DETECTION_HOLD_TIME:
-                    if not deterrent_active:
-                        deterrent_active = True
-                        logger.info(f"Deterrent activated for {DETERRENT_DURATION}s")
-                        deterrent.activate(DETERRENT_DURATION)
-                    else:
-                        if now - cat_detected_since >= DETERRENT_DURATION:
-                            cat_detected_since = None
-                            deterrent_active = False
-            else:
-                cat_detected_since = None
-                deterrent_active = False
+    pipeline = Pipeline(loop, display=show_debug if debug_mode else None)
 
-            if debug_mode:
-                debug_draw(frame, detection)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    logger.info("Exiting debug mode")
-                    break
+    profiler = SamplingProfiler()
+    profiler.install_signal()
+    if args.profile is not None:
+        profiler.start(args.profile)
 
-            time.sleep(FREQUENCY)
+    try:
+        asyncio.run(pipeline.run())
     except KeyboardInterrupt:
         logger.info("Shutdown requested by user")
     except Exception as e:
         logger.error(f"Unhandled exception: {e}")
         logger.error(traceback.format_exc())
     finally:
+        profiler.stop()
         deterrent.cleanup()
         cap.release()
+        if history is not None:
+            history.close()
+        if cascade is not None:
+            cascade.log_report()
+        if prefilter is not None:
+            prefilter.log_report()
+        if motion is not None:
+            motion.log_report()
+        pipeline.log_report()
         if debug_mode:
             cv2.destroyAllWindows()
         logger.info("System shut down cleanly")
+        logger.complete()
+
+
+def show_debug(frame, detection: dict) -> bool:
+    """
+    Shows the detection overlay. Returns False once 'q' is pressed.
+    """
+    debug_draw(frame, detection)
+    if cv2.waitKey(1) & 0xFF == ord("q"):
+        logger.info("Exiting debug mode")
+        return False
+    return True
 
 
 def parse_args():
@@ -79,6 +129,14 @@ def parse_args():
         action="store_true",
         help="Enable debug webcam view with detection overlay",
     )
+    parser.add_argument(
+        "--profile",
+        type=float,
+        nargs="?",
+        const=PROFILE_DURATION,
+        metavar="SECONDS",
+        help="Profile the running pipeline at startup (SIGUSR1 toggles it anytime)",
+    )
     return parser.parse_args()
 
 
@@ -1,13 +1,98 @@
 CAMERA_INDEX: int = 1
+# Requested capture properties, None keeps the driver default
+CAMERA_WIDTH: int | None = 640  # Close to INPUT_SIZE to avoid a big downscale
+CAMERA_HEIGHT: int | None = 480
+CAMERA_FPS: float | None = 30
+CAMERA_FOURCC: str | None = "MJPG"  # Compressed capture is cheaper than YUYV
+CAMERA_BUFFER_SIZE: int | None = 1  # Frames queued by the driver
 INTERESTED_CLASSES: list[str] = [
     "cat",
     "dog",
     "teddy bear",
 ]
 CONFIDENCE_THRESHOLD: float = 0.5
-SCORE_THRESHOLD: float = 0.4
+SCORE_THRESHOLD: float = 0.4  # IoU above which NMS drops the weaker box
+NMS_TOP_K: int | None = 200  # Only the best candidates enter NMS
+NMS_MAX_DETECTIONS: int | None = 50  # Stop NMS once this many boxes are kept
 DETERRENT_DURATION: float = 1.5  # Seconds
-FREQUENCY: float = 0.1  # Seconds
+FREQUENCY: float = 0.1  # Seconds between camera reads
 PREPROCESS_MODE = "pad"
+INPUT_SIZE: int = 640  # Model input (square)
+FUSED_PREPROCESS: bool = True  # Raw frame -> model blob in one pass
+# cv2.dnn backend/target/threads: "off", "cache" (use python -m src.models.autotune
+# results) or "startup" (benchmark on the first run on a new machine or model)
+DNN_AUTOTUNE: str = "cache"
+DNN_TUNING_CACHE: str = "assets/dnn_tuning.json"
 DETECTION_HOLD_TIME: float = 1.0
-DETERRENT_TYPE: str = "llm"
+DETERRENT_TYPE: str | list[str] = "llm"  # A list runs several in parallel
+DETERRENT_TIMEOUT: float = 5.0  # Seconds a deterrent may overrun
+# Repeated (on, off) seconds for the GPIO deterrent, None for one solid pulse
+GPIO_PULSE_PATTERN: list[tuple[float, float]] | None = None
+
+# Pipeline: stages run as asyncio tasks joined by drop-oldest queues
+PIPELINE_QUEUE_SIZE: int = 1  # Items buffered between stages
+PIPELINE_REPORT_INTERVAL: float = 300.0  # Seconds between throughput logs (0 = off)
+
+# Remote inference: send letterboxed JPEG frames to src.detection.inference_server
+REMOTE_INFERENCE_URL: str | None = None  # e.g. "http://nuc.local:8765"
+REMOTE_INFERENCE_TIMEOUT: float = 0.5  # Seconds before falling back to local inference
+REMOTE_RETRY_INTERVAL: float = 30.0  # Seconds to stay local after a failure
+REMOTE_JPEG_QUALITY: int = 80
+INFERENCE_SERVER_PORT: int = 8765
+INFERENCE_SERVER_MAX_BATCH: int = 8
+INFERENCE_SERVER_MAX_WAIT: float = 0.01  # Seconds to wait for a batch to fill
+
+# Speech worker
+SPEECH_QUEUE_SIZE: int = 4  # Utterances waiting to be spoken, oldest dropped first
+
+# Creative speech (Ollama LLM)
+LLM_MODEL: str = "HammerAI/openhermes-2.5-mistral"
+LLM_BASE_URL: str | None = None  # None uses the local Ollama default
+LLM_LATENCY_BUDGET: float = 2.0  # Seconds to wait for a sentence before falling back
+LLM_KEEP_ALIVE: str = "30m"  # How long Ollama keeps the model loaded
+LLM_REQUEST_TIMEOUT: float = 60.0  # HTTP timeout, also bounds abandoned requests
+
+# Resolution cascade: run a small input while idle, escalate on a candidate
+CASCADE_ENABLED: bool = False
+CASCADE_LOW_INPUT_SIZE: int = 320
+CASCADE_CANDIDATE_THRESHOLD: float = 0.25  # Low-res score that escalates
+
+# Presence prefilter: a tiny classifier gates full detection
+PREFILTER_ENABLED: bool = False
+PREFILTER_MODEL_PATH: str = "assets/presence.onnx"
+PREFILTER_INPUT_SIZE: int = 64
+PREFILTER_THRESHOLD: float = 0.2  # Lower = higher recall, fewer frames skipped
+PREFILTER_REFRESH_FRAMES: int = 30  # Force a full inference every N frames (0 = off)
+
+# Motion-guided crops: only run detection on regions that moved
+MOTION_CROPS_ENABLED: bool = False  # Ignored when the cascade is enabled
+MOTION_CROP_INPUT_SIZE: int = 320  # Model input for each crop
+MOTION_WIDTH: int = 320  # Frame width the background model runs at
+MOTION_HISTORY: int = 500  # Frames the background model remembers
+MOTION_VAR_THRESHOLD: float = 16.0  # Higher = less sensitive to noise
+MOTION_MIN_AREA: int = 400  # Smallest moving blob in frame pixels
+MOTION_CROP_MARGIN: float = 0.5  # Context around a blob, as a fraction of its size
+MOTION_MIN_CROP: int = 160  # Smallest crop side in frame pixels
+MOTION_MAX_CROPS: int = 3  # Nearby crops are merged down to this many
+MOTION_MAX_COVERAGE: float = 0.5  # Crops covering more of the frame run full frame
+MOTION_REFRESH_FRAMES: int = 30  # Force a full-frame inference every N frames (0 = off)
+
+# Detection history (binary, one segment file per day)
+HISTORY_ENABLED: bool = False
+HISTORY_DIR: str = "history"
+HISTORY_FLUSH_INTERVAL: float = 5.0  # Seconds between flushes to disk
+
+# Sampling profiler (--profile, or send SIGUSR1 to toggle)
+PROFILE_DURATION: float = 60.0  # Seconds per profiling window
+PROFILE_INTERVAL: float = 0.005  # Seconds between stack samples
+PROFILE_DIR: str = "profiles"
+PROFILE_TOP: int = 15  # Functions listed per stage in the summary
+
+# Logging
+LOG_LEVEL: str = "DEBUG"
+LOG_ENQUEUE: bool = True  # Write logs from a background thread
+LOG_JSON_PATH: str | None = None  # e.g. "logs/snooper.jsonl"
+LOG_ROTATION: str = "10 MB"
+LOG_RETENTION: int = 5  # Rotated JSON log files to keep
+LOG_RATE_LIMIT: float = 1.0  # Seconds between repeats of a hot-path message
+LOG_SAMPLE_EVERY: int = 1  # Only consider every Nth hot-path message
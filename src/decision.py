@@ -0,0 +1,41 @@
+from src.config import DETECTION_HOLD_TIME, DETERRENT_DURATION
+
+
+class DeterrentController:
+    """
+    Decides when to fire the deterrent from per-frame detection results.
+
+    A cat has to be seen continuously for `hold_time` seconds before the
+    deterrent fires. While the cat stays, the deterrent is re-armed once
+    `duration` seconds have passed since it was first seen.
+    """
+
+    def __init__(
+        self,
+        hold_time: float = DETECTION_HOLD_TIME,
+        duration: float = DETERRENT_DURATION,
+    ) -> None:
+        self.hold_time = hold_time
+        self.duration = duration
+        self.cat_detected_since: float | None = None
+        self.deterrent_active = False
+
+    def update(self, detected: bool, now: float) -> bool:
+        """
+        Feeds one detection result. Returns True if the deterrent should fire now.
+        """
+        if not detected:
+            self.cat_detected_since = None
+            self.deterrent_active = False
+            return False
+
+        if self.cat_detected_since is None:
+            self.cat_detected_since = now
+        elif now - self.cat_detected_since >= self.hold_time:
+            if not self.deterrent_active:
+                self.deterrent_active = True
+                return True
+            if now - self.cat_detected_since >= self.duration:
+                self.cat_detected_since = None
+                self.deterrent_active = False
+        return False
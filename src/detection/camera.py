@@ -1,30 +1,121 @@
 import cv2
 from src.utils.logger import logger
-from src.config import PREPROCESS_MODE
+from src.config import (
+    PREPROCESS_MODE,
+    CAMERA_WIDTH,
+    CAMERA_HEIGHT,
+    CAMERA_FPS,
+    CAMERA_FOURCC,
+    CAMERA_BUFFER_SIZE,
+)
 from src.detection.preprocessing import letterbox_image
 
 
-def get_camera(index: int = 0) -> cv2.VideoCapture:
+def get_camera(
+    index: int = 0,
+    width: int | None = CAMERA_WIDTH,
+    height: int | None = CAMERA_HEIGHT,
+    fps: float | None = CAMERA_FPS,
+    fourcc: str | None = CAMERA_FOURCC,
+    buffer_size: int | None = CAMERA_BUFFER_SIZE,
+) -> cv2.VideoCapture:
     """
-    Returns a cv2.VideoCapture object for the specified camera index.
+    Returns a cv2.VideoCapture object for the specified camera index,
+    configured with the requested capture properties.
     If the camera cannot be opened, raises an IOError.
     """
     cap = cv2.VideoCapture(index)
     if not cap.isOpened():
         logger.error("Cannot open webcam")
         raise IOError("Cannot open webcam")
+    configure_capture(
+        cap,
+        width=width,
+        height=height,
+        fps=fps,
+        fourcc=fourcc,
+        buffer_size=buffer_size,
+    )
     logger.debug("Webcam initialized")
     return cap
 
 
+def _decode_fourcc(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def configure_capture(
+    cap: cv2.VideoCapture,
+    width: int | None = None,
+    height: int | None = None,
+    fps: float | None = None,
+    fourcc: str | None = None,
+    buffer_size: int | None = None,
+) -> dict:
+    """
+    Requests capture properties and reads back what the driver accepted.
+    Properties left as None keep the driver default. Logs the actual
+    settings and warns about every request the driver did not honour.
+
+    Returns:
+        Dict with the actual 'width', 'height', 'fps', 'fourcc' and 'buffer_size'
+    """
+    # FOURCC must be set before the size for V4L2 to pick the right mode
+    if fourcc is not None:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter.fourcc(*fourcc))
+    if width is not None:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height is not None:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps is not None:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    if buffer_size is not None:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    actual = {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": float(cap.get(cv2.CAP_PROP_FPS)),
+        "fourcc": _decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+    requested = {
+        "width": width,
+        "height": height,
+        "fps": fps,
+        "fourcc": fourcc,
+        "buffer_size": buffer_size,
+    }
+    for name, value in requested.items():
+        if value is not None and actual[name] != value:
+            logger.warning("Camera ignored {}={}, using {}", name, value, actual[name])
+
+    logger.info(
+        "Camera capture: {}x{} @ {:.1f} fps, {}, buffer {}",
+        actual["width"],
+        actual["height"],
+        actual["fps"],
+        actual["fourcc"],
+        actual["buffer_size"],
+    )
+    return actual
+
+
 def read_frame(
-    cap: cv2.VideoCapture, input_size: int = 640, preprocess: bool = True
+    cap: cv2.VideoCapture,
+    input_size: int = 640,
+    preprocess: bool = True,
+    out: cv2.typing.MatLike | None = None,
 ) -> cv2.typing.MatLike:
     """
     Reads a frame from the specified cv2.VideoCapture object.
     If the frame cannot be read, raises a RuntimeError.
+
+    Passing the previous frame as `out` lets the capture decode into it
+    instead of allocating a new image every call.
     """
-    ret, frame = cap.read()
+    ret, frame = cap.read() if out is None else cap.read(out)
     if not ret:
         logger.error("Failed to read from camera")
         raise RuntimeError("Failed to read from camera")
@@ -0,0 +1,168 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import cv2
+
+from src.config import (
+    CASCADE_CANDIDATE_THRESHOLD,
+    CASCADE_LOW_INPUT_SIZE,
+    DETECTION_HOLD_TIME,
+    INPUT_SIZE,
+    INTERESTED_CLASSES,
+    PREPROCESS_MODE,
+)
+from src.detection import detector
+from src.detection.preprocessing import BlobPreprocessor, unletterbox_box
+from src.utils.logger import logger
+
+
+@dataclass
+class TierStats:
+    frames: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return 1000 * self.seconds / self.frames if self.frames else 0.0
+
+
+class ResolutionCascade:
+    """
+    Runs detection on a small input while the sink is empty and escalates to the
+    full input size when a low-resolution candidate appears.
+
+    Once escalated, the full-size model keeps running for `hold_time` seconds
+    after its last positive detection, which covers the DETECTION_HOLD_TIME
+    confirmation window.
+    """
+
+    def __init__(
+        self,
+        low_size: int = CASCADE_LOW_INPUT_SIZE,
+        high_size: int = INPUT_SIZE,
+        candidate_threshold: float = CASCADE_CANDIDATE_THRESHOLD,
+        hold_time: float = DETECTION_HOLD_TIME,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.low_size = low_size
+        self.high_size = high_size
+        self.candidate_threshold = candidate_threshold
+        self.hold_time = hold_time
+        self._clock = clock
+        self.escalated_until: float | None = None
+        self.stats: dict[int, TierStats] = {
+            low_size: TierStats(),
+            high_size: TierStats(),
+        }
+        self._preprocessors: dict[int, BlobPreprocessor] = {
+            size: BlobPreprocessor(input_size=size, mode=PREPROCESS_MODE)
+            for size in (low_size, high_size)
+        }
+
+    @property
+    def escalated(self) -> bool:
+        return self.escalated_until is not None and self._clock() < self.escalated_until
+
+    def _run(
+        self,
+        frame: cv2.typing.MatLike,
+        input_size: int,
+        confidence_threshold: float | None = None,
+    ) -> list[dict]:
+        """
+        Preprocesses the raw frame for input_size and runs detection on it.
+        Boxes are returned in raw frame coordinates.
+        """
+        start = time.perf_counter()
+        blob, scale, pad_w, pad_h = self._preprocessors[input_size](frame)
+        detections = detector.detect_blob(
+            blob, confidence_threshold=confidence_threshold
+        )
+        self._record(input_size, start)
+
+        for det in detections:
+            det["bbox"] = unletterbox_box(det["bbox"], scale, pad_w, pad_h)
+        return detections
+
+    def _run_any(
+        self,
+        frame: cv2.typing.MatLike,
+        input_size: int,
+        confidence_threshold: float | None = None,
+    ) -> bool:
+        """
+        Like _run, but only answers whether an interested class is present.
+        """
+        start = time.perf_counter()
+        blob = self._preprocessors[input_size](frame)[0]
+        found = detector.detect_blob_any(
+            blob, confidence_threshold=confidence_threshold
+        )
+        self._record(input_size, start)
+        return found
+
+    def _record(self, input_size: int, start: float) -> None:
+        stats = self.stats[input_size]
+        stats.frames += 1
+        stats.seconds += time.perf_counter() - start
+
+    def detect(
+        self,
+        frame: cv2.typing.MatLike,
+        debug: bool = False,
+        show_all: bool = True,
+    ) -> dict:
+        """
+        Same contract as detect_cat, but takes the raw camera frame.
+        """
+        if not self.escalated:
+            if debug:
+                detections = self._run(
+                    frame, self.low_size, confidence_threshold=self.candidate_threshold
+                )
+                candidate = any(d["label"] in INTERESTED_CLASSES for d in detections)
+            else:
+                detections = []
+                candidate = self._run_any(
+                    frame, self.low_size, confidence_threshold=self.candidate_threshold
+                )
+            if not candidate:
+                return detector.detection_result(detections, debug, show_all)
+            logger.debug("Low-resolution candidate found, escalating")
+
+        if debug:
+            result = detector.detection_result(
+                self._run(frame, self.high_size), debug, show_all
+            )
+        else:
+            result = {"detected": self._run_any(frame, self.high_size)}
+        if result["detected"]:
+            self.escalated_until = self._clock() + self.hold_time
+        return result
+
+    def report(self) -> dict[int, dict]:
+        """
+        Returns frames, total seconds, mean latency and time share per tier.
+        """
+        total = sum(s.seconds for s in self.stats.values()) or 1.0
+        return {
+            size: {
+                "frames": s.frames,
+                "seconds": s.seconds,
+                "mean_ms": s.mean_ms,
+                "share": s.seconds / total,
+            }
+            for size, s in self.stats.items()
+        }
+
+    def log_report(self) -> None:
+        for size, tier in self.report().items():
+            logger.info(
+                "Cascade tier {}: {} frames, {:.1f}s total, {:.1f} ms/frame, {:.0%} of time",
+                size,
+                tier["frames"],
+                tier["seconds"],
+                tier["mean_ms"],
+                tier["share"],
+            )
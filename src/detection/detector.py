@@ -1,22 +1,56 @@
 import cv2
 import numpy as np
 from src.models.yolo_config import load_model, load_class_names, get_class_id
-from src.config import CONFIDENCE_THRESHOLD, SCORE_THRESHOLD, INTERESTED_CLASSES
-from src.utils.logger import logger
+from src.detection.preprocessing import BlobPreprocessor, unletterbox_box
+from src.detection.nms import decode_outputs, nms
+from src.detection.remote import RemoteInferenceClient
+from src.config import (
+    CONFIDENCE_THRESHOLD,
+    SCORE_THRESHOLD,
+    INTERESTED_CLASSES,
+    INPUT_SIZE,
+    NMS_TOP_K,
+    NMS_MAX_DETECTIONS,
+    REMOTE_INFERENCE_URL,
+)
+from src.utils.logger import logger, debug_enabled, rate_limiter
 
 model = load_model()
+_models: dict[int, cv2.dnn.Net] = {}
 CLASS_NAMES = load_class_names()
 CAT_CLASS_ID = get_class_id("cat", CLASS_NAMES)
+INTERESTED_CLASS_IDS = np.array(
+    [i for i, name in CLASS_NAMES.items() if name in INTERESTED_CLASSES], dtype=np.intp
+)
+remote = RemoteInferenceClient(REMOTE_INFERENCE_URL) if REMOTE_INFERENCE_URL else None
+
+
+def get_model(input_size: int = INPUT_SIZE) -> cv2.dnn.Net:
+    """
+    Returns the model for the given input size, loading variants on first use.
+    """
+    if input_size == INPUT_SIZE:
+        return model
+    if input_size not in _models:
+        _models[input_size] = load_model(input_size)
+    return _models[input_size]
 
 
 def detect_objects(
     frame: cv2.typing.MatLike,
+    confidence_threshold: float | None = None,
+    score_threshold: float | None = None,
 ) -> list[dict]:
     """
     Runs YOLOv8 object detection on the given frame.
+    The model variant is picked from the frame size. With a remote inference
+    server configured, the frame is sent there first and only run locally if
+    the server is down or slow.
 
     Args:
-        frame: Original BGR image (H, W, C)
+        frame: Letterboxed BGR image (H, W, C)
+        confidence_threshold: Overrides CONFIDENCE_THRESHOLD
+        score_threshold: Overrides SCORE_THRESHOLD
 
     Returns:
         List of detections, each a dict:
@@ -27,52 +61,183 @@ def detect_objects(
                 'score': float
             }
     """
+    if remote is not None:
+        detections = remote.detect(
+            frame,
+            CONFIDENCE_THRESHOLD
+            if confidence_threshold is None
+            else confidence_threshold,
+            SCORE_THRESHOLD if score_threshold is None else score_threshold,
+        )
+        if detections is not None:
+            return detections
+
+    return detect_blob(
+        frame_to_blob(frame),
+        confidence_threshold=confidence_threshold,
+        score_threshold=score_threshold,
+        input_size=frame.shape[0],
+    )
+
+
+def detect_any(
+    frame: cv2.typing.MatLike, confidence_threshold: float | None = None
+) -> bool:
+    """
+    Returns True if any interested class is in the letterboxed frame.
+    Same answer as checking the labels from detect_objects, without decoding
+    boxes or running NMS.
+    """
+    if confidence_threshold is None:
+        confidence_threshold = CONFIDENCE_THRESHOLD
+    if remote is not None:
+        detections = remote.detect(frame, confidence_threshold, SCORE_THRESHOLD)
+        if detections is not None:
+            return any(d["label"] in INTERESTED_CLASSES for d in detections)
+    return detect_blob_any(
+        frame_to_blob(frame),
+        confidence_threshold=confidence_threshold,
+        input_size=frame.shape[0],
+    )
+
+
+def frame_to_blob(frame: cv2.typing.MatLike) -> np.ndarray:
+    """
+    Converts a letterboxed BGR frame into the model input at its own size.
+    """
     height, width = frame.shape[:2]
-    blob = cv2.dnn.blobFromImage(
-        frame, 1 / 255.0, (height, width), swapRB=True, crop=False
+    return cv2.dnn.blobFromImage(
+        frame, 1 / 255.0, (width, height), swapRB=True, crop=False
     )
-    model.setInput(blob)
-    outputs = model.forward()[0].T
-    boxes, confidences, class_ids = [], [], []
-
-    for detection in outputs:
-        class_scores = detection[4:]
-        class_id = np.argmax(class_scores)
-        confidence = class_scores[class_id]
-
-        if confidence > CONFIDENCE_THRESHOLD:
-            cx, cy, w, h = detection[:4]
-            x1 = int(cx - w / 2)
-            y1 = int(cy - h / 2)
-            x2 = int(cx + w / 2)
-            y2 = int(cy + h / 2)
-
-            boxes.append([x1, y1, x2 - x1, y2 - y1])
-            confidences.append(float(confidence))
-            class_ids.append(class_id)
-
-    indices = cv2.dnn.NMSBoxes(
-        boxes, confidences, CONFIDENCE_THRESHOLD, SCORE_THRESHOLD
+
+
+def forward(blob: np.ndarray, input_size: int | None = None) -> np.ndarray:
+    """
+    Runs the model on one preprocessed input and returns its raw output
+    (4 + num_classes, num_anchors).
+    """
+    net = get_model(blob.shape[2] if input_size is None else input_size)
+    net.setInput(blob)
+    return net.forward()[0]
+
+
+def detect_blob(
+    blob: np.ndarray,
+    confidence_threshold: float | None = None,
+    score_threshold: float | None = None,
+    input_size: int | None = None,
+) -> list[dict]:
+    """
+    Runs YOLOv8 object detection on a preprocessed model input.
+    Boxes are in input (letterboxed) coordinates.
+
+    Args:
+        blob: Float32 NCHW input (1, 3, S, S), RGB scaled to [0, 1]
+        confidence_threshold: Overrides CONFIDENCE_THRESHOLD
+        score_threshold: Overrides SCORE_THRESHOLD
+        input_size: Model variant to use, defaults to the blob size S
+
+    Returns:
+        List of detection dicts, as for detect_objects
+    """
+    if confidence_threshold is None:
+        confidence_threshold = CONFIDENCE_THRESHOLD
+    if score_threshold is None:
+        score_threshold = SCORE_THRESHOLD
+    return postprocess_outputs(
+        forward(blob, input_size), confidence_threshold, score_threshold
+    )
+
+
+def detect_blob_any(
+    blob: np.ndarray,
+    confidence_threshold: float | None = None,
+    input_size: int | None = None,
+) -> bool:
+    """
+    Returns True if any interested class is in a preprocessed model input.
+    The boolean counterpart of detect_blob.
+    """
+    if confidence_threshold is None:
+        confidence_threshold = CONFIDENCE_THRESHOLD
+    return interested_present(forward(blob, input_size), confidence_threshold)
+
+
+def interested_present(outputs: np.ndarray, confidence_threshold: float) -> bool:
+    """
+    Checks raw YOLOv8 output for an interested class above the threshold.
+
+    Only the interested class rows are scanned for candidates. NMS is
+    class-aware and always keeps the best box of each class, so a candidate
+    survives it whenever its anchor's best class is interested, which is all
+    that is checked for the few anchors that pass.
+
+    The NMS_TOP_K and NMS_MAX_DETECTIONS caps are not applied, as that would
+    need every candidate's score. In a frame crowded with higher-scoring
+    boxes of other classes, postprocess_outputs can drop an interested box
+    that this still reports, so the answer can only err towards detecting.
+
+    Args:
+        outputs: Raw model output (4 + num_classes, num_anchors)
+        confidence_threshold: Minimum class score, as for decode_outputs
+    """
+    ids = INTERESTED_CLASS_IDS[INTERESTED_CLASS_IDS < outputs.shape[0] - 4]
+    if ids.size == 0:
+        return False
+    candidates = np.flatnonzero(outputs[4 + ids].max(axis=0) > confidence_threshold)
+    if candidates.size == 0:
+        return False
+    best = outputs[4:, candidates].argmax(axis=0)
+    return bool(np.isin(best, ids).any())
+
+
+def postprocess_outputs(
+    outputs: np.ndarray, confidence_threshold: float, score_threshold: float
+) -> list[dict]:
+    """
+    Turns raw YOLOv8 output for one image into detection dicts.
+
+    Args:
+        outputs: Raw model output (4 + num_classes, num_anchors)
+        confidence_threshold: Minimum class score
+        score_threshold: NMS IoU threshold
+
+    Returns:
+        List of detection dicts, as for detect_objects
+    """
+    boxes, scores, class_ids = decode_outputs(outputs, confidence_threshold)
+    indices = nms(
+        boxes,
+        scores,
+        class_ids,
+        score_threshold,
+        top_k=NMS_TOP_K,
+        max_detections=NMS_MAX_DETECTIONS,
     )
 
     detections = []
     for i in indices:
-        i = i[0] if isinstance(i, (tuple, list, np.ndarray)) else i
-        x, y, w, h = boxes[i]
-        x1, y1, x2, y2 = x, y, x + w, y + h
+        x1, y1, x2, y2 = (int(v) for v in boxes[i])
+        class_id = int(class_ids[i])
+        score = float(scores[i])
 
-        label = (
-            CLASS_NAMES[class_ids[i]] if class_ids[i] < len(CLASS_NAMES) else "object"
-        )
-        logger.debug(
-            f"Detected {label} (conf: {confidences[i]:.2f}) at {x1}, {y1}, {x2}, {y2}"
-        )
+        label = CLASS_NAMES[class_id] if class_id < len(CLASS_NAMES) else "object"
+        if debug_enabled() and rate_limiter.allow(("detected", label)):
+            logger.debug(
+                "Detected {} (conf: {:.2f}) at {}, {}, {}, {}",
+                label,
+                score,
+                x1,
+                y1,
+                x2,
+                y2,
+            )
         detections.append(
             {
                 "bbox": (x1, y1, x2, y2),
-                "class_id": class_ids[i],
+                "class_id": class_id,
                 "label": label,
-                "score": confidences[i],
+                "score": score,
             }
         )
 
@@ -83,18 +248,46 @@ def detect_cat(
     frame: cv2.typing.MatLike,
     debug: bool = False,
     show_all: bool = True,
+    preprocessor: BlobPreprocessor | None = None,
 ) -> dict:
     """
     Detects all cats in the frame using YOLOv8 Nano.
     Returns a dictionary with "detected": bool and "detections": list of cat boxes.
+
+    Without a preprocessor the frame must already be letterboxed. With one,
+    the raw frame is converted in a single pass and boxes are mapped back to
+    raw frame coordinates.
+
+    Boxes are only decoded when debug asks for them; otherwise the answer is
+    read straight from the raw model output.
+    """
+    if not debug:
+        if preprocessor is None:
+            return {"detected": detect_any(frame)}
+        return {"detected": detect_blob_any(preprocessor(frame)[0])}
+
+    if preprocessor is None:
+        all_detections = detect_objects(frame)
+    else:
+        blob, scale, pad_w, pad_h = preprocessor(frame)
+        all_detections = detect_blob(blob)
+        for det in all_detections:
+            det["bbox"] = unletterbox_box(det["bbox"], scale, pad_w, pad_h)
+    return detection_result(all_detections, debug, show_all)
+
+
+def detection_result(detections: list[dict], debug: bool, show_all: bool) -> dict:
+    """
+    Builds the detect_cat result from decoded detections.
+    "detected" is set when any of them is an interested class; with debug,
+    "detections" lists all of them or only the interested ones.
     """
-    all_detections = detect_objects(frame)
-    cat_detections = [d for d in all_detections if d["label"] in INTERESTED_CLASSES]
+    cat_detections = [d for d in detections if d["label"] in INTERESTED_CLASSES]
 
     result: dict = {"detected": len(cat_detections) > 0}
 
     if debug:
-        result["detections"] = all_detections if show_all else cat_detections
+        result["detections"] = detections if show_all else cat_detections
 
     return result
 
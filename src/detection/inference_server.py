@@ -0,0 +1,261 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+from src.config import (
+    CONFIDENCE_THRESHOLD,
+    INFERENCE_SERVER_MAX_BATCH,
+    INFERENCE_SERVER_MAX_WAIT,
+    INFERENCE_SERVER_PORT,
+    SCORE_THRESHOLD,
+)
+from src.detection.remote import DETECT_PATH
+from src.utils.logger import logger
+
+
+@dataclass
+class _Request:
+    image: np.ndarray
+    confidence_threshold: float
+    score_threshold: float
+    done: threading.Event = field(default_factory=threading.Event)
+    detections: list[dict] | None = None
+    error: Exception | None = None
+
+
+def model_forward(blob: np.ndarray) -> np.ndarray:
+    """
+    Runs the local model on an NCHW batch and returns (N, 4 + classes, anchors).
+    """
+    from src.detection.detector import get_model
+
+    net = get_model(blob.shape[2])
+    net.setInput(blob)
+    return net.forward()
+
+
+class BatchingDetector:
+    """
+    Collects requests from concurrent clients into batches.
+
+    A worker thread takes the first waiting request, waits up to `max_wait`
+    seconds for up to `max_batch - 1` more, and runs images of the same size
+    through one forward pass. Models exported with a fixed batch size of one
+    are detected on their first batch, which is then rerun one image at a
+    time, as are all later requests.
+    """
+
+    def __init__(
+        self,
+        forward: Callable[[np.ndarray], np.ndarray] = model_forward,
+        max_batch: int = INFERENCE_SERVER_MAX_BATCH,
+        max_wait: float = INFERENCE_SERVER_MAX_WAIT,
+    ) -> None:
+        self.forward = forward
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batching = True
+        self.batch_sizes: Counter[int] = Counter()
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(
+        self, image: np.ndarray, confidence_threshold: float, score_threshold: float
+    ) -> list[dict]:
+        """
+        Queues one letterboxed BGR image and blocks until it is processed.
+        """
+        request = _Request(image, confidence_threshold, score_threshold)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        assert request.detections is not None
+        return request.detections
+
+    def _collect(self, first: _Request) -> list[_Request]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                break
+            if request is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            by_shape: dict[tuple, list[_Request]] = {}
+            for request in batch:
+                by_shape.setdefault(request.image.shape, []).append(request)
+            for group in by_shape.values():
+                try:
+                    self._run(group)
+                except Exception as e:
+                    logger.error("Inference failed: {}", e)
+                    for request in group:
+                        request.error = e
+                finally:
+                    for request in group:
+                        request.done.set()
+
+    def _run(self, group: list[_Request]) -> None:
+        from src.detection.detector import postprocess_outputs
+
+        blob = cv2.dnn.blobFromImages(
+            [r.image for r in group], 1 / 255.0, swapRB=True, crop=False
+        )
+        outputs = None
+        if len(group) == 1:
+            outputs = self.forward(blob)
+        elif self.batching:
+            try:
+                outputs = self.forward(blob)
+            except cv2.error as e:
+                # Static batch-1 exports reject larger inputs outright
+                logger.warning(
+                    "Model does not accept batches ({}), running images singly", e
+                )
+                self.batching = False
+            else:
+                if outputs.shape[0] != len(group):
+                    logger.warning(
+                        "Model does not accept batches, running images singly"
+                    )
+                    self.batching = False
+                    outputs = None
+        if outputs is None:
+            outputs = np.concatenate(
+                [self.forward(blob[i : i + 1]) for i in range(len(group))]
+            )
+            self.batch_sizes.update([1] * len(group))
+        else:
+            self.batch_sizes[len(group)] += 1
+
+        for request, output in zip(group, outputs):
+            request.detections = postprocess_outputs(
+                output, request.confidence_threshold, request.score_threshold
+            )
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    server: "InferenceServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != DETECT_PATH:
+            self._reply(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        data = np.frombuffer(self.rfile.read(length), dtype=np.uint8)
+        image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+        if image is None:
+            self._reply(400, {"error": "body is not an image"})
+            return
+        try:
+            confidence = float(
+                self.headers.get("X-Confidence-Threshold", CONFIDENCE_THRESHOLD)
+            )
+            score = float(self.headers.get("X-Score-Threshold", SCORE_THRESHOLD))
+            detections = self.server.detector.submit(image, confidence, score)
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+            return
+        self._reply(200, {"detections": detections})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("{} - {}", self.address_string(), format % args)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """
+    HTTP front end for a BatchingDetector. POST a JPEG to /detect.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], detector: BatchingDetector | None = None
+    ) -> None:
+        super().__init__(address, InferenceRequestHandler)
+        self.detector = detector or BatchingDetector()
+        self.connections = 0
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self.detector.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.detector.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batching YOLO inference server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=INFERENCE_SERVER_PORT)
+    parser.add_argument("--max-batch", type=int, default=INFERENCE_SERVER_MAX_BATCH)
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=INFERENCE_SERVER_MAX_WAIT,
+        help="Seconds to wait for a batch to fill",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    detector = BatchingDetector(max_batch=args.max_batch, max_wait=args.max_wait)
+    server = InferenceServer((args.host, args.port), detector)
+    logger.info("Inference server listening on {}:{}", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutdown requested by user")
+    finally:
+        server.server_close()
+        logger.info("Batch sizes served: {}", dict(detector.batch_sizes))
+
+
+if __name__ == "__main__":
+    main()
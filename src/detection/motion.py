@@ -0,0 +1,293 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import combinations
+
+import cv2
+import numpy as np
+
+from src.config import (
+    INPUT_SIZE,
+    MOTION_CROP_INPUT_SIZE,
+    MOTION_CROP_MARGIN,
+    MOTION_HISTORY,
+    MOTION_MAX_COVERAGE,
+    MOTION_MAX_CROPS,
+    MOTION_MIN_AREA,
+    MOTION_MIN_CROP,
+    MOTION_REFRESH_FRAMES,
+    MOTION_VAR_THRESHOLD,
+    MOTION_WIDTH,
+)
+from src.detection import detector
+from src.detection.preprocessing import letterbox_image, unletterbox_box
+from src.utils.logger import logger
+
+Box = tuple[int, int, int, int]
+
+# MOG2 marks shadows as 127 and foreground as 255
+FOREGROUND = 255
+
+
+def box_area(box: Box) -> int:
+    x1, y1, x2, y2 = box
+    return (x2 - x1) * (y2 - y1)
+
+
+def box_union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def boxes_overlap(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def expand_box(box: Box, margin: float, min_size: int, width: int, height: int) -> Box:
+    """
+    Grows a box by `margin` of its larger side on every edge, to at least
+    `min_size` per side, and clips it to the frame.
+    """
+    x1, y1, x2, y2 = box
+    pad = margin * max(x2 - x1, y2 - y1)
+    half_w = max((x2 - x1) / 2 + pad, min_size / 2)
+    half_h = max((y2 - y1) / 2 + pad, min_size / 2)
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    return (
+        max(0, int(cx - half_w)),
+        max(0, int(cy - half_h)),
+        min(width, int(cx + half_w)),
+        min(height, int(cy + half_h)),
+    )
+
+
+def merge_boxes(boxes: list[Box], max_boxes: int) -> list[Box]:
+    """
+    Merges overlapping boxes, then keeps merging the pair whose union adds
+    the least area until at most `max_boxes` remain.
+    """
+    boxes = list(boxes)
+    while True:
+        pair = next(
+            (
+                (i, j)
+                for i, j in combinations(range(len(boxes)), 2)
+                if boxes_overlap(boxes[i], boxes[j])
+            ),
+            None,
+        )
+        if pair is None and len(boxes) > max_boxes:
+            pair = min(
+                combinations(range(len(boxes)), 2),
+                key=lambda p: box_area(box_union(boxes[p[0]], boxes[p[1]]))
+                - box_area(boxes[p[0]])
+                - box_area(boxes[p[1]]),
+            )
+        if pair is None:
+            return boxes
+        i, j = pair
+        boxes[i] = box_union(boxes[i], boxes[j])
+        del boxes[j]
+
+
+@dataclass
+class MotionStats:
+    frames: int = 0
+    still_frames: int = 0  # No motion, nothing run
+    crop_frames: int = 0
+    full_frames: int = 0
+    crops: int = 0
+    crop_seconds: float = 0.0
+    full_seconds: float = 0.0
+
+    @property
+    def crop_mean_ms(self) -> float:
+        return 1000 * self.crop_seconds / self.crop_frames if self.crop_frames else 0.0
+
+    @property
+    def full_mean_ms(self) -> float:
+        return 1000 * self.full_seconds / self.full_frames if self.full_frames else 0.0
+
+
+class MotionCropDetector:
+    """
+    Runs detection only where the frame changed.
+
+    A MOG2 background model on a downscaled frame finds moving blobs, which
+    are expanded and merged into a few crops. Each crop is letterboxed to the
+    small crop input size and detected on its own; boxes are mapped back to
+    frame coordinates. Frames without motion skip inference entirely.
+
+    The full frame is still detected every `refresh_frames` frames, whenever
+    the crops would cover most of the frame, and while a cat is being
+    confirmed, since a cat sitting still fades into the background model.
+    """
+
+    def __init__(
+        self,
+        crop_size: int = MOTION_CROP_INPUT_SIZE,
+        full_size: int = INPUT_SIZE,
+        motion_width: int = MOTION_WIDTH,
+        min_area: int = MOTION_MIN_AREA,
+        margin: float = MOTION_CROP_MARGIN,
+        min_crop: int = MOTION_MIN_CROP,
+        max_crops: int = MOTION_MAX_CROPS,
+        max_coverage: float = MOTION_MAX_COVERAGE,
+        refresh_frames: int = MOTION_REFRESH_FRAMES,
+        history: int = MOTION_HISTORY,
+        var_threshold: float = MOTION_VAR_THRESHOLD,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.crop_size = crop_size
+        self.full_size = full_size
+        self.motion_width = motion_width
+        self.min_area = min_area
+        self.margin = margin
+        self.min_crop = min_crop
+        self.max_crops = max_crops
+        self.max_coverage = max_coverage
+        self.refresh_frames = refresh_frames
+        self._clock = clock
+        self.subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=history, varThreshold=var_threshold, detectShadows=True
+        )
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.stats = MotionStats()
+        self.last_crops: list[Box] = []
+        self._since_full = 0
+        self._last_detected = False
+
+    def regions(self, frame: cv2.typing.MatLike) -> list[Box]:
+        """
+        Updates the background model and returns moving blobs in frame
+        coordinates.
+        """
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.motion_width / width)
+        small = (
+            cv2.resize(
+                frame,
+                (int(width * scale), int(height * scale)),
+                interpolation=cv2.INTER_AREA,
+            )
+            if scale < 1.0
+            else frame
+        )
+        mask = self.subtractor.apply(small)
+        mask = cv2.morphologyEx(
+            (mask == FOREGROUND).astype(np.uint8), cv2.MORPH_OPEN, self._kernel
+        )
+        count, _, blobs, _ = cv2.connectedComponentsWithStats(mask)
+        min_area = self.min_area * scale * scale
+        return [
+            (
+                int(x / scale),
+                int(y / scale),
+                int((x + w) / scale),
+                int((y + h) / scale),
+            )
+            # Label 0 is the background
+            for x, y, w, h, area in blobs[1:count]
+            if area >= min_area
+        ]
+
+    def crops(self, frame: cv2.typing.MatLike) -> list[Box]:
+        height, width = frame.shape[:2]
+        expanded = [
+            expand_box(box, self.margin, self.min_crop, width, height)
+            for box in self.regions(frame)
+        ]
+        return merge_boxes(expanded, self.max_crops)
+
+    def _detect_region(
+        self, image: cv2.typing.MatLike, input_size: int, debug: bool
+    ) -> list[dict] | bool:
+        """
+        Letterboxes an image to input_size and detects on it. Returns boxes in
+        image coordinates, or only whether an interested class is present.
+        """
+        letterboxed, scale, pad_w, pad_h = letterbox_image(image, input_size)
+        if not debug:
+            return detector.detect_any(letterboxed)
+        detections = detector.detect_objects(letterboxed)
+        for det in detections:
+            det["bbox"] = unletterbox_box(det["bbox"], scale, pad_w, pad_h)
+        return detections
+
+    def _detect_crop(
+        self, frame: cv2.typing.MatLike, box: Box, debug: bool = True
+    ) -> list[dict] | bool:
+        """
+        Detects on one crop at the crop input size, mapping boxes to the frame.
+        """
+        x1, y1, x2, y2 = box
+        found = self._detect_region(frame[y1:y2, x1:x2], self.crop_size, debug)
+        if isinstance(found, bool):
+            return found
+        for det in found:
+            bx1, by1, bx2, by2 = det["bbox"]
+            det["bbox"] = (bx1 + x1, by1 + y1, bx2 + x1, by2 + y1)
+        return found
+
+    def detect(
+        self,
+        frame: cv2.typing.MatLike,
+        debug: bool = False,
+        show_all: bool = True,
+    ) -> dict:
+        """
+        Same contract as detect_cat, but takes the raw camera frame.
+        """
+        self.stats.frames += 1
+        self._since_full += 1
+        height, width = frame.shape[:2]
+        # Keep the background model current even on full-frame passes
+        crops = self.crops(frame)
+        self.last_crops = crops
+        coverage = sum(box_area(c) for c in crops) / (width * height)
+        full = (
+            self._last_detected
+            or coverage > self.max_coverage
+            or (self.refresh_frames > 0 and self._since_full >= self.refresh_frames)
+        )
+
+        if not full and not crops:
+            self.stats.still_frames += 1
+            self._last_detected = False
+            return detector.detection_result([], debug, show_all)
+
+        start = self._clock()
+        if full:
+            found = self._detect_region(frame, self.full_size, debug)
+            self.stats.full_frames += 1
+            self.stats.full_seconds += self._clock() - start
+            self._since_full = 0
+        else:
+            if debug:
+                found = [d for box in crops for d in self._detect_crop(frame, box)]
+            else:
+                # Stops at the first crop with a cat
+                found = any(self._detect_crop(frame, box, False) for box in crops)
+            self.stats.crop_frames += 1
+            self.stats.crops += len(crops)
+            self.stats.crop_seconds += self._clock() - start
+
+        if debug:
+            result = detector.detection_result(found, debug, show_all)
+        else:
+            result = {"detected": bool(found)}
+        self._last_detected = result["detected"]
+        return result
+
+    def log_report(self) -> None:
+        stats = self.stats
+        logger.info(
+            "Motion crops: {} frames, {} still, {} cropped ({:.1f} crops, "
+            "{:.1f} ms/frame), {} full frame ({:.1f} ms/frame)",
+            stats.frames,
+            stats.still_frames,
+            stats.crop_frames,
+            stats.crops / stats.crop_frames if stats.crop_frames else 0.0,
+            stats.crop_mean_ms,
+            stats.full_frames,
+            stats.full_mean_ms,
+        )
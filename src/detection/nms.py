@@ -0,0 +1,83 @@
+import numpy as np
+
+
+def decode_outputs(
+    outputs: np.ndarray, confidence_threshold: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decodes raw YOLOv8 output into candidate boxes above the threshold.
+
+    Args:
+        outputs: Raw model output (4 + num_classes, num_anchors)
+        confidence_threshold: Minimum best-class score to keep a candidate
+
+    Returns:
+        boxes (K, 4) int32 as (x1, y1, x2, y2), truncated like int()
+        scores (K,) float32
+        class_ids (K,) int64
+    """
+    class_scores = outputs[4:]
+    class_ids = class_scores.argmax(axis=0)
+    scores = class_scores[class_ids, np.arange(class_scores.shape[1])]
+    keep = scores > confidence_threshold
+
+    cx, cy, w, h = outputs[:4, keep]
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    return boxes.astype(np.int32), scores[keep], class_ids[keep]
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: np.ndarray,
+    iou_threshold: float,
+    top_k: int | None = None,
+    max_detections: int | None = None,
+) -> np.ndarray:
+    """
+    Class-aware greedy non-maximum suppression on NumPy arrays.
+
+    Boxes of different classes never suppress each other. Matches
+    cv2.dnn.NMSBoxesBatched, including the order of equal scores.
+
+    Args:
+        boxes: (K, 4) as (x1, y1, x2, y2)
+        scores: (K,) candidate scores
+        class_ids: (K,) candidate classes
+        iou_threshold: Boxes overlapping a kept box by more than this are dropped
+        top_k: Only consider the top_k highest-scoring candidates
+        max_detections: Stop once this many boxes are kept
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Shift each class into its own region so classes cannot overlap
+    boxes = boxes.astype(np.float64)
+    offsets = class_ids.astype(np.float64) * (boxes.max() - boxes.min() + 1)
+    boxes += offsets[:, None]
+
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        if max_detections is not None and len(keep) >= max_detections:
+            break
+        inter_w = np.minimum(boxes[best, 2], boxes[rest, 2]) - np.maximum(
+            boxes[best, 0], boxes[rest, 0]
+        )
+        inter_h = np.minimum(boxes[best, 3], boxes[rest, 3]) - np.maximum(
+            boxes[best, 1], boxes[rest, 1]
+        )
+        inter = np.clip(inter_w, 0, None) * np.clip(inter_h, 0, None)
+        union = areas[best] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
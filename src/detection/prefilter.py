@@ -0,0 +1,136 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from src.config import (
+    PREFILTER_INPUT_SIZE,
+    PREFILTER_MODEL_PATH,
+    PREFILTER_REFRESH_FRAMES,
+    PREFILTER_THRESHOLD,
+)
+from src.utils.logger import logger
+
+PresenceClassifier = Callable[[np.ndarray], float]
+
+
+def load_presence_classifier(
+    model_path: str = PREFILTER_MODEL_PATH,
+) -> PresenceClassifier:
+    """
+    Loads a tiny ONNX presence classifier.
+
+    The model takes a (1, 3, S, S) RGB blob scaled to [0, 1] and outputs either
+    a single presence probability or two-class logits (absent, present).
+    """
+    net = cv2.dnn.readNetFromONNX(model_path)
+
+    def classify(image: np.ndarray) -> float:
+        blob = cv2.dnn.blobFromImage(image, 1 / 255.0, swapRB=True, crop=False)
+        net.setInput(blob)
+        output = net.forward().ravel()
+        if output.size == 1:
+            return float(output[0])
+        exp = np.exp(output - output.max())
+        return float(exp[-1] / exp.sum())
+
+    return classify
+
+
+def calibrate_threshold(
+    scores: Sequence[float], labels: Sequence[bool], target_recall: float = 0.99
+) -> float:
+    """
+    Returns the highest threshold that still passes `target_recall` of the
+    frames labelled as containing an animal.
+
+    Args:
+        scores: Presence probabilities from the classifier
+        labels: True where the frame really contains an animal
+        target_recall: Fraction of positive frames that must pass
+    """
+    positives = np.sort(np.asarray(scores, dtype=np.float32)[np.asarray(labels)])
+    if positives.size == 0:
+        raise ValueError("Calibration needs at least one positive frame.")
+    allowed_misses = int(np.floor((1 - target_recall) * positives.size))
+    # Frames pass when score >= threshold, so keep the lowest kept positive
+    return float(positives[allowed_misses])
+
+
+@dataclass
+class PrefilterStats:
+    frames: int = 0
+    full_runs: int = 0
+
+    @property
+    def avoided(self) -> int:
+        return self.frames - self.full_runs
+
+    @property
+    def avoided_ratio(self) -> float:
+        return self.avoided / self.frames if self.frames else 0.0
+
+
+class PresencePrefilter:
+    """
+    First detection stage: scores a heavily downscaled frame for animal
+    presence and only lets frames through to full YOLO above a threshold.
+    """
+
+    def __init__(
+        self,
+        classifier: PresenceClassifier | None = None,
+        input_size: int = PREFILTER_INPUT_SIZE,
+        threshold: float = PREFILTER_THRESHOLD,
+        refresh_frames: int = PREFILTER_REFRESH_FRAMES,
+        model_path: str = PREFILTER_MODEL_PATH,
+    ) -> None:
+        self.classifier = classifier or load_presence_classifier(model_path)
+        self.input_size = input_size
+        self.threshold = threshold
+        self.refresh_frames = refresh_frames
+        self.stats = PrefilterStats()
+        self.last_probability: float = 0.0
+        self._since_full = 0
+
+    def presence(self, frame: cv2.typing.MatLike) -> float:
+        """
+        Returns the presence probability for the frame.
+        """
+        small = cv2.resize(
+            frame,
+            (self.input_size, self.input_size),
+            interpolation=cv2.INTER_AREA,
+        )
+        return self.classifier(small)
+
+    def should_run(self, frame: cv2.typing.MatLike, force: bool = False) -> bool:
+        """
+        Returns True if full detection should run on this frame.
+
+        Args:
+            frame: BGR frame, raw or letterboxed
+            force: Skip the classifier, e.g. while a detection is being confirmed
+        """
+        self.stats.frames += 1
+        self._since_full += 1
+        run = force or (
+            self.refresh_frames > 0 and self._since_full >= self.refresh_frames
+        )
+        if not run:
+            self.last_probability = self.presence(frame)
+            run = self.last_probability >= self.threshold
+        if run:
+            self.stats.full_runs += 1
+            self._since_full = 0
+        return run
+
+    def log_report(self) -> None:
+        logger.info(
+            "Prefilter: {} frames, {} full inferences, {} avoided ({:.0%})",
+            self.stats.frames,
+            self.stats.full_runs,
+            self.stats.avoided,
+            self.stats.avoided_ratio,
+        )
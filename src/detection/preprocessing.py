@@ -50,3 +50,110 @@ def letterbox_image(
 
     else:
         raise ValueError(f"Invalid mode '{mode}'. Use 'pad' or 'crop'.")
+
+
+def unletterbox_box(
+    bbox: tuple[int, int, int, int], scale: float, pad_w: int, pad_h: int
+) -> tuple[int, int, int, int]:
+    """
+    Maps a box from letterboxed coordinates back to the original frame.
+
+    Args:
+        bbox: (x1, y1, x2, y2) in the letterboxed image
+        scale, pad_w, pad_h: values returned by letterbox_image
+
+    Returns:
+        (x1, y1, x2, y2) in original frame coordinates
+    """
+    x1, y1, x2, y2 = bbox
+    return (
+        int((x1 - pad_w) / scale),
+        int((y1 - pad_h) / scale),
+        int((x2 - pad_w) / scale),
+        int((y2 - pad_h) / scale),
+    )
+
+
+class BlobPreprocessor:
+    """
+    Turns a raw BGR frame into a float32 NCHW model input in a single pass.
+
+    The frame is resized once into a reused buffer, and a single fused
+    conversion swaps BGR to RGB, scales to [0, 1] and writes the planes straight
+    into the reused blob. Padding is written only when the frame geometry
+    changes. Matches letterbox_image followed by cv2.dnn.blobFromImage.
+    """
+
+    def __init__(self, input_size: int = 640, mode: str = "pad") -> None:
+        if mode not in ("pad", "crop"):
+            raise ValueError(f"Invalid mode '{mode}'. Use 'pad' or 'crop'.")
+        self.input_size = input_size
+        self.mode = mode
+        self.blob = np.empty((1, 3, input_size, input_size), dtype=np.float32)
+        self._resized: np.ndarray | None = None
+        self._geometry: tuple | None = None
+        self._scale_factor = np.float32(1 / 255.0)
+
+    def _prepare(self, original_h: int, original_w: int) -> None:
+        """
+        Computes the letterbox geometry and (re)allocates buffers for a new frame size.
+        """
+        input_size = self.input_size
+        if self.mode == "pad":
+            scale = min(input_size / original_w, input_size / original_h)
+            new_w, new_h = int(original_w * scale), int(original_h * scale)
+            pad_w = (input_size - new_w) // 2
+            pad_h = (input_size - new_h) // 2
+            # Source region of the resized frame and its place in the blob
+            src = (slice(None), slice(None))
+            dst = (slice(pad_h, pad_h + new_h), slice(pad_w, pad_w + new_w))
+            self.blob.fill(114 / 255.0)
+        else:
+            scale = input_size / min(original_w, original_h)
+            new_w, new_h = int(original_w * scale), int(original_h * scale)
+            x_start = (new_w - input_size) // 2
+            y_start = (new_h - input_size) // 2
+            src = (
+                slice(y_start, y_start + input_size),
+                slice(x_start, x_start + input_size),
+            )
+            dst = (slice(None), slice(None))
+            # Negative pads shift boxes back by the crop offset
+            pad_w, pad_h = -x_start, -y_start
+
+        self._resized = np.empty((new_h, new_w, 3), dtype=np.uint8)
+        self._geometry = (
+            (original_h, original_w),
+            (new_w, new_h),
+            src,
+            dst,
+            scale,
+            pad_w,
+            pad_h,
+        )
+
+    def __call__(self, frame: cv2.typing.MatLike) -> tuple[np.ndarray, float, int, int]:
+        """
+        Args:
+            frame: Raw BGR image (H, W, C)
+
+        Returns:
+            blob (1, 3, input_size, input_size), reused between calls
+            scale, pad_w, pad_h for unletterbox_box
+        """
+        shape = frame.shape[:2]
+        if self._geometry is None or self._geometry[0] != shape:
+            self._prepare(*shape)
+        _, new_size, src, dst, scale, pad_w, pad_h = self._geometry  # type: ignore[misc]
+
+        resized = cv2.resize(
+            frame, new_size, dst=self._resized, interpolation=cv2.INTER_LINEAR
+        )
+        region = resized[src]
+        for channel in range(3):
+            np.multiply(
+                region[..., 2 - channel],
+                self._scale_factor,
+                out=self.blob[0, channel][dst],
+            )
+        return self.blob, scale, pad_w, pad_h
@@ -0,0 +1,165 @@
+import http.client
+import json
+import queue
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import cv2
+
+from src.config import (
+    REMOTE_INFERENCE_TIMEOUT,
+    REMOTE_JPEG_QUALITY,
+    REMOTE_RETRY_INTERVAL,
+)
+from src.utils.logger import logger
+
+DETECT_PATH = "/detect"
+
+
+@dataclass
+class RemoteStats:
+    requests: int = 0
+    failures: int = 0
+    skipped: int = 0  # Frames sent to local inference while the server was down
+
+
+class RemoteInferenceClient:
+    """
+    Sends letterboxed frames as JPEG to an inference server.
+
+    Connections are kept alive and pooled, so a steady stream of frames
+    costs no TCP handshakes. A request on a pooled connection the server
+    has since closed is retried once on a fresh one. After a timeout or
+    error the server is treated as down for `retry_interval` seconds, and
+    detect() returns None at once so the caller can run the model locally.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = REMOTE_INFERENCE_TIMEOUT,
+        retry_interval: float = REMOTE_RETRY_INTERVAL,
+        jpeg_quality: int = REMOTE_JPEG_QUALITY,
+        pool_size: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported inference server URL '{url}'")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path.rstrip("/") + DETECT_PATH
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.jpeg_quality = jpeg_quality
+        self._clock = clock
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(
+            maxsize=pool_size
+        )
+        self._down_until = 0.0
+        self.connections_opened = 0
+        self.stats = RemoteStats()
+
+    def available(self) -> bool:
+        return self._clock() >= self._down_until
+
+    def _connect(self) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """
+        Returns a connection and whether it was reused from the pool.
+        """
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def detect(
+        self,
+        frame: cv2.typing.MatLike,
+        confidence_threshold: float,
+        score_threshold: float,
+    ) -> list[dict] | None:
+        """
+        Returns detections in frame coordinates, or None if the server is
+        down, slow or returned an error.
+        """
+        if not self.available():
+            self.stats.skipped += 1
+            return None
+
+        ok, jpeg = cv2.imencode(
+            ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        )
+        if not ok:
+            raise ValueError("Could not encode frame as JPEG")
+
+        self.stats.requests += 1
+        headers = {
+            "Content-Type": "image/jpeg",
+            "X-Confidence-Threshold": str(confidence_threshold),
+            "X-Score-Threshold": str(score_threshold),
+        }
+        payload = jpeg.tobytes()
+        conn, reused = self._acquire()
+        try:
+            try:
+                response = self._post(conn, payload, headers)
+            except (OSError, http.client.HTTPException) as e:
+                # A slow server would only time out again
+                if not reused or isinstance(e, TimeoutError):
+                    raise
+                # The server dropped the idle keep-alive connection
+                logger.debug("Pooled connection failed ({}), reconnecting", e)
+                conn.close()
+                conn = self._connect()
+                response = self._post(conn, payload, headers)
+            body = response.read()
+            if response.status != 200:
+                raise http.client.HTTPException(f"HTTP {response.status}")
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            self.stats.failures += 1
+            self._down_until = self._clock() + self.retry_interval
+            logger.warning(
+                "Inference server {}:{} failed ({}), using local inference for {}s",
+                self.host,
+                self.port,
+                e or type(e).__name__,
+                self.retry_interval,
+            )
+            return None
+        self._release(conn)
+
+        return [
+            {
+                "bbox": tuple(d["bbox"]),
+                "class_id": d["class_id"],
+                "label": d["label"],
+                "score": d["score"],
+            }
+            for d in json.loads(body)["detections"]
+        ]
+
+    def _post(
+        self, conn: http.client.HTTPConnection, body: bytes, headers: dict
+    ) -> http.client.HTTPResponse:
+        conn.request("POST", self.path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
@@ -1,17 +1,56 @@
+from importlib import import_module
+from importlib.metadata import entry_points
+
 from src.deterrent._deterrent import Deterrent
-from src.deterrent.gpio_deterrent import GpioDeterrent
-from src.deterrent.audio_deterrent import AudioDeterrent
-from src.deterrent.speech_deterrent import SpeechDeterrent
-
-
-def get_deterrent(deterrent_type: str) -> Deterrent:
-    if deterrent_type == "gpio":
-        return GpioDeterrent()
-    if deterrent_type == "gunshots":
-        return AudioDeterrent(audio_name="gunshots")
-    if deterrent_type == "speech":
-        return SpeechDeterrent(creative=False)
-    if deterrent_type == "llm":
-        return SpeechDeterrent(creative=True)
-
-    raise ValueError(f"Unknown deterrent type: {deterrent_type}")
+
+ENTRY_POINT_GROUP = "sink_snooper.deterrents"
+
+# Deterrent type -> ("module:Class", constructor kwargs). Modules are only
+# imported when their type is selected, so unused backends cost nothing.
+DETERRENT_REGISTRY: dict[str, tuple[str, dict]] = {
+    "gpio": ("src.deterrent.gpio_deterrent:GpioDeterrent", {}),
+    "gunshots": (
+        "src.deterrent.audio_deterrent:AudioDeterrent",
+        {"audio_name": "gunshots"},
+    ),
+    "speech": ("src.deterrent.speech_deterrent:SpeechDeterrent", {"creative": False}),
+    "llm": ("src.deterrent.speech_deterrent:SpeechDeterrent", {"creative": True}),
+}
+
+
+def register_deterrent(deterrent_type: str, target: str, **kwargs) -> None:
+    """
+    Registers a deterrent type as a "module:Class" target, imported on first use.
+    """
+    DETERRENT_REGISTRY[deterrent_type] = (target, kwargs)
+
+
+def _load_class(target: str) -> type[Deterrent]:
+    module_name, _, class_name = target.partition(":")
+    return getattr(import_module(module_name), class_name)
+
+
+def _find_entry_point(deterrent_type: str) -> tuple[str, dict] | None:
+    """
+    Looks up deterrents installed by other packages under ENTRY_POINT_GROUP.
+    """
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name == deterrent_type:
+            return entry_point.value, {}
+    return None
+
+
+def get_deterrent(deterrent_type: str | list[str]) -> Deterrent:
+    if isinstance(deterrent_type, list):
+        from src.deterrent.composite_deterrent import CompositeDeterrent
+
+        duplicates = sorted({t for t in deterrent_type if deterrent_type.count(t) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate deterrent types: {', '.join(duplicates)}")
+        return CompositeDeterrent({t: get_deterrent(t) for t in deterrent_type})
+
+    entry = DETERRENT_REGISTRY.get(deterrent_type) or _find_entry_point(deterrent_type)
+    if entry is None:
+        raise ValueError(f"Unknown deterrent type: {deterrent_type}")
+    target, kwargs = entry
+    return _load_class(target)(**kwargs)
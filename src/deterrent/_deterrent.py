@@ -6,6 +6,20 @@ class Deterrent(ABC):
     def setup(self):
         pass
 
+    def prepare(self, duration: float) -> None:
+        """
+        Called as soon as a cat is first seen, before the hold time has
+        passed. Deterrents can start building their output here so that a
+        following activate() is near-instant. Must return quickly: slow work
+        belongs on a background thread. Optional, does nothing by default.
+        """
+
+    def discard(self) -> None:
+        """
+        Called when the cat leaves before the deterrent fired. Drops whatever
+        prepare() started. Optional, does nothing by default.
+        """
+
     @abstractmethod
     def activate(self, duration: float):
         pass
@@ -1,18 +1,54 @@
 from typing import Optional
 
+import threading
 import traceback
 
+import numpy as np
 from pydub import AudioSegment
 from pydub.playback import play
+from pydub.utils import db_to_float
 
 from src.utils.logger import logger
 
 from src.deterrent._deterrent import Deterrent
 
+# Sample type by pydub sample width in bytes
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+# Gain pydub fades to and from in a crossfade
+SILENT_POWER = db_to_float(-120)
+
+
+def fade_gains(frames: int, fade_frames: float, from_power: float, to_power: float):
+    """
+    Per-frame gains of a linear fade, computed as pydub's fade() computes them.
+    """
+    step = (to_power - from_power) / fade_frames
+    return from_power + step * np.arange(frames, dtype=np.float64)
+
+
+def crossfade_samples(tail: np.ndarray, head: np.ndarray, fade_frames: float):
+    """
+    Fades `tail` out and `head` in over the same frames and mixes them,
+    with the flooring and clipping of pydub's append(crossfade=...).
+
+    Args:
+        tail, head: Samples (frames, channels) of equal shape
+        fade_frames: Fade length in frames, fractional as pydub computes it
+    """
+    info = np.iinfo(tail.dtype)
+    frames = len(tail)
+    fade_out = fade_gains(frames, fade_frames, 1.0, SILENT_POWER)
+    fade_in = fade_gains(frames, fade_frames, SILENT_POWER, 1.0)
+    mixed = np.floor(tail * fade_out[:, None]) + np.floor(head * fade_in[:, None])
+    return np.clip(mixed, info.min, info.max).astype(tail.dtype)
+
 
 class AudioDeterrent(Deterrent):
     def __init__(self, audio_name: str = "gunshots") -> None:
         self.audio_name = audio_name
+        # Looped clips by duration, built once and replayed on every activation
+        self._loops: dict[float, AudioSegment] = {}
+        self._loops_lock = threading.Lock()
 
     def setup(self):
         if self.audio_name == "gunshots":
@@ -21,11 +57,32 @@ class AudioDeterrent(Deterrent):
             return
         raise ValueError(f"Unknown audio name: {self.audio_name}")
 
-    def activate(self, duration: float) -> None:
-        if self.audio_name == "gunshots":
-            audio = self._loop_gunshots(duration)
-        else:
+    def _get_loop(self, duration: float) -> AudioSegment:
+        """
+        Returns the looped clip for the duration, building it on first use.
+        Concurrent callers wait for a build in progress instead of repeating it.
+        """
+        if self.audio_name != "gunshots":
             raise ValueError(f"Unknown audio name: {self.audio_name}")
+        with self._loops_lock:
+            audio = self._loops.get(duration)
+            if audio is None:
+                audio = self._loops[duration] = self._loop_gunshots(duration)
+            return audio
+
+    def prepare(self, duration: float) -> None:
+        """
+        Builds the looped clip in the background during the hold window.
+        Built clips are kept even if the cat leaves, as they never change.
+        """
+        if self.audio_name != "gunshots" or duration in self._loops:
+            return
+        threading.Thread(
+            target=self._get_loop, args=(duration,), name="audio-prepare", daemon=True
+        ).start()
+
+    def activate(self, duration: float) -> None:
+        audio = self._get_loop(duration)
 
         try:
             logger.debug(f"Playing audio for {duration} seconds")
@@ -50,17 +107,45 @@ class AudioDeterrent(Deterrent):
     ) -> AudioSegment:
         """
         Splices an audio segment and loops a segment for a specified number of times.
+
+        The loop is written into one preallocated sample buffer: every repeat
+        after the first is the same crossfade followed by the same samples,
+        so the cost is linear in the output length. Output matches chained
+        AudioSegment.append(segment, crossfade=cross_fade) calls.
         """
         segment: AudioSegment = audio[start_time:end_time]  # type: ignore[misc]
-        looped_segment: AudioSegment = segment
-        for _ in range(loop_times - 1):
-            if cross_fade is not None:
-                looped_segment = looped_segment.append(segment, crossfade=cross_fade)
-            else:
-                looped_segment += segment
-        looped_segment += audio[end_time:]  # type: ignore[misc]
+        rest: AudioSegment = audio[end_time:]  # type: ignore[misc]
+        dtype = SAMPLE_DTYPES[audio.sample_width]
+        channels = audio.channels
+        samples = np.frombuffer(segment.raw_data, dtype).reshape(-1, channels)
+        after = np.frombuffer(rest.raw_data, dtype).reshape(-1, channels)
+
+        loop_times = max(loop_times, 1)
+        overlap = 0
+        if cross_fade and loop_times > 1:
+            fade_frames = segment.frame_count(ms=cross_fade)
+            overlap = int(fade_frames)
+            if 2 * overlap > len(samples):
+                raise ValueError(
+                    f"Crossfade of {cross_fade}ms needs a segment of at least "
+                    f"{2 * cross_fade}ms, got {len(segment)}ms"
+                )
+
+        # First copy without its tail, the repeats, then the last tail
+        period = len(samples) - overlap
+        looped_frames = loop_times * period + overlap
+        out = np.empty((looped_frames + len(after), channels), dtype)
+        out[:period] = samples[:period]
+        repeats = out[period : loop_times * period].reshape(-1, period, channels)
+        if overlap:
+            repeats[:, :overlap] = crossfade_samples(
+                samples[period:], samples[:overlap], fade_frames
+            )
+        repeats[:, overlap:] = samples[overlap:period]
+        out[loop_times * period : looped_frames] = samples[period:]
+        out[looped_frames:] = after
 
-        return looped_segment
+        return segment._spawn(out.tobytes())
 
     def _loop_gunshots(self, duration: float = 1.5) -> AudioSegment:
         """
@@ -84,3 +169,4 @@ class AudioDeterrent(Deterrent):
 
     def cleanup(self):
         self.audio = None  # type: ignore
+        self._loops.clear()
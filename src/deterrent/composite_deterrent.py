@@ -0,0 +1,143 @@
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from src.config import DETERRENT_TIMEOUT
+from src.deterrent._deterrent import Deterrent
+from src.utils.logger import logger
+
+
+class CompositeDeterrent(Deterrent):
+    """
+    Runs several deterrents together, so total activation time is the slowest
+    child rather than the sum of all of them.
+
+    Children are set up concurrently and activated in parallel. A child that
+    fails or overruns its timeout is logged and never affects the others.
+    """
+
+    def __init__(
+        self, children: dict[str, Deterrent], timeout: float = DETERRENT_TIMEOUT
+    ) -> None:
+        if not children:
+            raise ValueError("CompositeDeterrent needs at least one child.")
+        self.children = children
+        self.timeout = timeout
+        self.active: dict[str, Deterrent] = {}
+        self.latencies: dict[str, float | None] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: dict[str, Future] = {}
+
+    @staticmethod
+    def _timed(func, *args) -> float:
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+    def _run_all(
+        self, method: str, children: dict[str, Deterrent], timeout: float, *args
+    ) -> dict[str, float | None]:
+        """
+        Calls `method` on every child in parallel, each with its own timeout.
+        Returns per-child latency, or None for children that failed or timed out.
+        """
+        assert self._executor is not None, "Executor not initialized"
+        futures: dict[str, Future] = {}
+        for name, child in children.items():
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                logger.warning("Deterrent '{}' still busy, skipping {}", name, method)
+                continue
+            futures[name] = self._executor.submit(
+                self._timed, getattr(child, method), *args
+            )
+            self._running[name] = futures[name]
+
+        deadline = time.monotonic() + timeout
+        latencies: dict[str, float | None] = {name: None for name in children}
+        for name, future in futures.items():
+            done, _ = wait([future], timeout=max(0.0, deadline - time.monotonic()))
+            if not done:
+                logger.error(
+                    "Deterrent '{}' {} timed out after {}s", name, method, timeout
+                )
+                continue
+            try:
+                latencies[name] = future.result()
+            except Exception as e:
+                logger.error("Deterrent '{}' {} failed: {}", name, method, e)
+                logger.debug(traceback.format_exc())
+        return latencies
+
+    def setup(self):
+        """
+        Sets up all children concurrently. Children that fail are left out.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.children), thread_name_prefix="deterrent"
+        )
+        latencies = self._run_all("setup", self.children, self.timeout)
+        self.active = {
+            name: child
+            for name, child in self.children.items()
+            if latencies[name] is not None
+        }
+        if not self.active:
+            raise RuntimeError("No deterrent could be set up.")
+        logger.debug("Composite deterrent ready: {}", ", ".join(self.active))
+
+    def prepare(self, duration: float) -> None:
+        """
+        Lets every child prepare. Children return quickly, so they are called
+        in turn rather than through the executor.
+        """
+        self._call_each("prepare", self.active, duration)
+
+    def discard(self) -> None:
+        self._call_each("discard", self.active)
+
+    def _call_each(self, method: str, children: dict[str, Deterrent], *args) -> None:
+        for name, child in children.items():
+            try:
+                getattr(child, method)(*args)
+            except Exception as e:
+                logger.error("Deterrent '{}' {} failed: {}", name, method, e)
+
+    def activate(self, duration: float):
+        """
+        Activates all children in parallel and waits for them, each child
+        getting `duration` plus the timeout.
+        """
+        self.latencies = self._run_all(
+            "activate", self.active, duration + self.timeout, duration
+        )
+        logger.info(
+            "Deterrent latencies: {}",
+            ", ".join(
+                f"{name}={'timeout/error' if t is None else f'{t:.3f}s'}"
+                for name, t in self.latencies.items()
+            ),
+        )
+
+    def cleanup(self):
+        """
+        Cleans up every child, isolating errors. Children still busy get up to
+        the timeout to finish and are then cleaned up directly from this thread.
+        """
+        if self._executor is None:
+            return
+        wait([f for f in self._running.values() if not f.done()], timeout=self.timeout)
+        busy = {
+            name: child
+            for name, child in self.children.items()
+            if name in self._running and not self._running[name].done()
+        }
+        idle = {
+            name: child for name, child in self.children.items() if name not in busy
+        }
+        self._run_all("cleanup", idle, self.timeout)
+        for name in busy:
+            logger.warning("Deterrent '{}' still busy, cleaning up anyway", name)
+        self._call_each("cleanup", busy)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
@@ -1,9 +1,15 @@
+from src.config import GPIO_PULSE_PATTERN
 from src.deterrent._deterrent import Deterrent
+from src.deterrent.gpio_pulse import (
+    GpioBackend,
+    PulsePattern,
+    PulseScheduler,
+    RPiBackend,
+)
 from src.utils.logger import logger
 
 try:
     import RPi.GPIO as GPIO  # type: ignore
-    import time
 
     IS_PI = True
 except ImportError:
@@ -13,36 +19,54 @@ PIN = 17  # GPIO pin
 
 
 class GpioDeterrent(Deterrent):
-    def __init__(self, pin: int = PIN) -> None:
+    def __init__(
+        self,
+        pin: int = PIN,
+        backend: GpioBackend | None = None,
+        pattern: PulsePattern | None = GPIO_PULSE_PATTERN,
+    ) -> None:
         self.pin = pin
+        self.backend = backend
+        self.pattern = pattern
+        self.scheduler: PulseScheduler | None = None
+
+    def _get_backend(self) -> GpioBackend | None:
+        if self.backend is None and IS_PI:
+            self.backend = RPiBackend(GPIO)  # type: ignore
+        return self.backend
 
     def setup(self):
         """
-        Sets up the GPIO pin for the deterrent.
+        Sets up the GPIO pin and starts its pulse scheduler.
         """
-        if not IS_PI:
+        backend = self._get_backend()
+        if backend is None:
             logger.debug("Skipping GPIO setup (not on Pi)")
             return
-        GPIO.setmode(GPIO.BCM)  # type: ignore
-        GPIO.setup(self.pin, GPIO.OUT)  # type: ignore
+        backend.setup(self.pin)
+        self.scheduler = PulseScheduler(backend, self.pin)
+        self.scheduler.start()
         logger.debug("GPIO setup complete")
 
     def activate(self, duration: float) -> None:
         """
-        Activates the deterrent for the specified duration.
+        Pulses the deterrent for the specified duration without blocking.
+        Re-triggering while a pulse is active extends it.
         """
-        if not IS_PI:
-            logger.info(f"Simulated deterrent activated for {duration}s")
+        if self.scheduler is None:
+            logger.info("Simulated deterrent activated for {}s", duration)
             return
-        GPIO.output(self.pin, GPIO.HIGH)  # type: ignore
-        time.sleep(duration)  # type: ignore
-        GPIO.output(self.pin, GPIO.LOW)  # type: ignore
-        logger.debug(f"Deterrent activated for {duration}s")
+        self.scheduler.pulse(duration, self.pattern)
+        logger.debug("Deterrent activated for {}s", duration)
 
     def cleanup(self) -> None:
         """
-        Cleans up the GPIO pin.
+        Stops any pulse and cleans up the GPIO pin.
         """
-        if IS_PI:
-            GPIO.cleanup()  # type: ignore
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        backend = self._get_backend()
+        if backend is not None:
+            backend.cleanup()
             logger.debug("GPIO cleanup complete")
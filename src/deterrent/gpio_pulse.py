@@ -0,0 +1,187 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+
+PulsePattern = Sequence[tuple[float, float]]  # Repeated (on, off) seconds
+
+# Wake this early and busy-wait the rest, so edges land close to schedule
+SPIN_TIME = 0.0005
+
+
+def duty_cycle(period: float, duty: float) -> PulsePattern:
+    """
+    Returns a pattern switching on for `duty` of every `period` seconds.
+    """
+    if not 0 < duty <= 1:
+        raise ValueError("Duty must be in (0, 1].")
+    return [(period * duty, period * (1 - duty))]
+
+
+def burst(count: int, on: float, off: float, pause: float) -> PulsePattern:
+    """
+    Returns a pattern of `count` short pulses followed by a pause.
+    """
+    return [(on, off)] * (count - 1) + [(on, pause)]
+
+
+class GpioBackend(ABC):
+    @abstractmethod
+    def setup(self, pin: int):
+        pass
+
+    @abstractmethod
+    def write(self, pin: int, high: bool):
+        pass
+
+    @abstractmethod
+    def cleanup(self):
+        pass
+
+
+class RPiBackend(GpioBackend):
+    """
+    Drives pins through RPi.GPIO.
+    """
+
+    def __init__(self, gpio) -> None:
+        self.gpio = gpio
+
+    def setup(self, pin: int):
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(pin, self.gpio.OUT)
+
+    def write(self, pin: int, high: bool):
+        self.gpio.output(pin, self.gpio.HIGH if high else self.gpio.LOW)
+
+    def cleanup(self):
+        self.gpio.cleanup()
+
+
+class FakeGPIO(GpioBackend):
+    """
+    Records every edge with its timestamp, for tests and non-Pi machines.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.edges: list[tuple[float, int, bool]] = []
+        self.state: dict[int, bool] = {}
+
+    def setup(self, pin: int):
+        self.state[pin] = False
+
+    def write(self, pin: int, high: bool):
+        self.edges.append((self._clock(), pin, high))
+        self.state[pin] = high
+
+    def cleanup(self):
+        self.state.clear()
+
+
+class PulseScheduler:
+    """
+    Drives one pin from a timer thread so callers never block on a pulse.
+
+    Every edge time is computed from the pulse start rather than from the
+    previous wake-up, so timer jitter does not accumulate. Re-triggering an
+    active pulse with the same pattern extends it instead of restarting it.
+    """
+
+    def __init__(
+        self,
+        backend: GpioBackend,
+        pin: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backend = backend
+        self.pin = pin
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._high = False
+        self._start = 0.0
+        self._end = 0.0
+        self._pattern: PulsePattern | None = None
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"gpio-pulse-{self.pin}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._end = 0.0
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._set(False)
+
+    @property
+    def active(self) -> bool:
+        return self._clock() < self._end
+
+    def pulse(self, duration: float, pattern: PulsePattern | None = None) -> None:
+        """
+        Starts (or extends) a pulse of `duration` seconds and returns immediately.
+        """
+        with self._cond:
+            now = self._clock()
+            if now < self._end and pattern == self._pattern:
+                self._end = max(self._end, now + duration)
+            else:
+                self._start = now
+                self._end = now + duration
+                self._pattern = pattern
+            self._cond.notify()
+
+    def _set(self, high: bool) -> None:
+        if high != self._high:
+            self.backend.write(self.pin, high)
+            self._high = high
+
+    def _state_at(self, t: float) -> tuple[bool, float]:
+        """
+        Returns the pin state at time t and the time of the next edge.
+        """
+        if t >= self._end:
+            return False, float("inf")
+        if not self._pattern:
+            return True, self._end
+        period = sum(on + off for on, off in self._pattern)
+        cycle_start = t - (t - self._start) % period
+        edge = cycle_start
+        for on, off in self._pattern:
+            if t < edge + on:
+                return True, min(edge + on, self._end)
+            if t < edge + on + off:
+                return False, min(edge + on + off, self._end)
+            edge += on + off
+        return False, min(cycle_start + period, self._end)
+
+    def _step(self, now: float) -> float:
+        """
+        Sets the pin to its state at `now` and returns the time of the next edge.
+        """
+        high, next_edge = self._state_at(now)
+        self._set(high)
+        return next_edge
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                next_edge = self._step(self._clock())
+                wait = next_edge - self._clock()
+                if wait > SPIN_TIME:
+                    self._cond.wait(timeout=min(wait - SPIN_TIME, 3600))
+                    continue
+            # Spin without the lock, so pulse() and stop() are never held up
+            while self._running and self._clock() < next_edge:
+                pass
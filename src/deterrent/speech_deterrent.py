@@ -2,32 +2,109 @@ import json
 from pathlib import Path
 import random
 import math
+import queue
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache
 from typing import Optional
 
 import pyttsx3
 from langchain_ollama import OllamaLLM
 
+from src.config import (
+    LLM_BASE_URL,
+    LLM_KEEP_ALIVE,
+    LLM_LATENCY_BUDGET,
+    LLM_MODEL,
+    LLM_REQUEST_TIMEOUT,
+    SPEECH_QUEUE_SIZE,
+)
 from src.deterrent._deterrent import Deterrent
+from src.deterrent.speech_worker import SpeechWorker
 from src.utils.logger import logger
 
-with open(Path("assets/phrases.json")) as f:
-    PHRASE_LOOKUP = json.load(f)
+PHRASES_PATH = Path("assets/phrases.json")
 
-ALL_PHRASES = list(
-    set(str.lower(p) for phrases in PHRASE_LOOKUP.values() for p in phrases)
-)
+
+@cache
+def load_phrases() -> tuple[dict[str, list[str]], list[str]]:
+    """
+    Loads the phrase lookup on first use.
+    Returns the phrases by category and all unique lowercased phrases.
+    """
+    with open(PHRASES_PATH) as f:
+        phrase_lookup = json.load(f)
+    all_phrases = list(
+        set(str.lower(p) for phrases in phrase_lookup.values() for p in phrases)
+    )
+    return phrase_lookup, all_phrases
+
+
+# End of a sentence: terminal punctuation, optional closing quotes, then space
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+def iter_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Groups streamed text chunks into sentences, yielding each one as soon as
+    its end is seen. Whatever is left when the stream ends is yielded last.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            sentence = buffer[start : match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+@dataclass
+class CreativeStats:
+    activations: int = 0
+    fallbacks: int = 0
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.fallbacks / self.activations if self.activations else 0.0
+
+
+_END_OF_STREAM = object()
+
+
+@dataclass
+class LlmStream:
+    """
+    One LLM response being streamed into a sentence queue by its own thread.
+    """
+
+    sentences: queue.Queue
+    cancelled: threading.Event
+    thread: threading.Thread
+
+    @property
+    def running(self) -> bool:
+        return self.thread.is_alive()
 
 
 class SpeechProvider:
     def __init__(self, category: str = "any") -> None:
+        phrase_lookup, all_phrases = load_phrases()
         if category == "any":
             logger.debug("No category selected, allowing any category")
             self.category = None
-            self.phrases = ALL_PHRASES
+            self.phrases = all_phrases
         else:
             self.category = str.lower(category)
             logger.debug(f"Selected category: {self.category}")
-            self.phrases = list(set(PHRASE_LOOKUP[self.category]))
+            self.phrases = list(set(phrase_lookup[self.category]))
 
     def get_phrase(self) -> str:
         return random.choice(self.phrases)
@@ -39,12 +116,25 @@ class SpeechDeterrent(Deterrent):
         category: str = "any",
         creative: bool = False,
         voice: Optional[str] = "com.apple.voice.compact.en-US.Samantha",
+        latency_budget: float = LLM_LATENCY_BUDGET,
+        max_queue: int = SPEECH_QUEUE_SIZE,
     ) -> None:
         self.category = category
         self.creative = creative
+        self.latency_budget = latency_budget
+        self.max_queue = max_queue
         self.llm = None
         self.engine = None
         self.provider = None
+        self.worker: SpeechWorker | None = None
+        self._creative_thread: threading.Thread | None = None
+        # LLM stream started by prepare(), consumed by the next activation
+        self._prepared: LlmStream | None = None
+        # Discarded stream, reused while its request is still running
+        self._spare: LlmStream | None = None
+        self._prepared_lock = threading.Lock()
+        self.time_to_first_audio: float | None = None
+        self.creative_stats = CreativeStats()
         if voice:
             self._voice_selection = voice
         else:
@@ -55,21 +145,51 @@ class SpeechDeterrent(Deterrent):
         Initializes the SpeechDeterrent, including text-to-speech engine and optional LLM.
         """
         try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty("voice", self._select_voice())
-            # self.engine.setProperty("rate", 150)
             self.provider = SpeechProvider(category=self.category)
-            self.engine.startLoop(False)
+            self.worker = SpeechWorker(self._create_engine, max_queue=self.max_queue)
+            self.worker.start()
 
             if self.creative:
                 logger.debug("Using creative mode")
-                self.llm = OllamaLLM(model="HammerAI/openhermes-2.5-mistral")  # type: ignore
+                # One client per deterrent, so its HTTP connection is reused
+                self.llm = OllamaLLM(
+                    model=LLM_MODEL,
+                    base_url=LLM_BASE_URL,
+                    keep_alive=LLM_KEEP_ALIVE,
+                    client_kwargs={"timeout": LLM_REQUEST_TIMEOUT},
+                )  # type: ignore
                 with open("assets/creative_prompt.txt", "r") as f:
                     self.prompt = f.read()
+                threading.Thread(
+                    target=self._warm_up, name="llm-warm-up", daemon=True
+                ).start()
         except Exception as e:
             logger.error(f"Failed to initialize SpeechDeterrent: {e}")
             raise
 
+    def _create_engine(self):
+        """
+        Creates the text-to-speech engine. Runs on the speech worker thread.
+        """
+        self.engine = pyttsx3.init()
+        self.engine.setProperty("voice", self._select_voice())
+        # self.engine.setProperty("rate", 150)
+        self.engine.startLoop(False)
+        return self.engine
+
+    def _warm_up(self) -> None:
+        """
+        Loads the model into Ollama ahead of the first activation.
+        An empty prompt only loads the model and keeps it alive.
+        """
+        assert self.llm is not None, "LLM not initialized"
+        start = time.perf_counter()
+        try:
+            self.llm.invoke("")
+            logger.debug("LLM warmed up in {:.1f}s", time.perf_counter() - start)
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed: {e}")
+
     def _select_voice(self):
         """
         Selects a suitable voice for the text-to-speech engine.
@@ -92,56 +212,207 @@ class SpeechDeterrent(Deterrent):
 
     def _activate_basic(self, duration: float) -> None:
         """
-        Activates the basic deterrent mode by speaking phrases.
+        Activates the basic deterrent mode by queueing phrases.
+        Each phrase is queued as the previous one starts speaking.
         """
-        assert self.engine is not None, "Engine not initialized"
         assert self.provider is not None, "Provider not initialized"
-        phrases_to_say = math.ceil(duration)
-        for _ in range(phrases_to_say):
+        assert self.worker is not None, "Worker not initialized"
+        phrases = []
+        for _ in range(math.ceil(duration)):
             try:
                 phrase = self.provider.get_phrase()
                 logger.debug(f"Phrase: {phrase}")
-                self.engine.say(phrase)
-                self.engine.iterate()
+                phrases.append(phrase)
             except Exception as e:
                 logger.error(f"Error during basic activation: {e}")
+        self.worker.say_all(phrases)
 
-    def _activate_creative(self, duration: float):
+    def _activate_creative(self, duration: float, generation: int | None = None):
         """
         Activates the creative deterrent mode using the LLM.
+        Falls back to a stock phrase if no sentence arrives within the latency budget.
+        Stops as soon as a newer activation pre-empts `generation`.
         """
         assert self.llm is not None, "LLM not initialized"
-        assert self.engine is not None, "Engine not initialized"
+        assert self.worker is not None, "Worker not initialized"
         if not self.llm:
             raise RuntimeError("LLM is not initialized for creative mode.")
 
+        self.creative_stats.activations += 1
+        with self._prepared_lock:
+            stream, self._prepared = self._prepared, None
+            if stream is None:
+                stream = self._claim_stream()
+            else:
+                logger.debug("Using the response prepared during the hold window")
+        sentences, cancelled = stream.sentences, stream.cancelled
+
+        # Speak each sentence as soon as the LLM has finished streaming it
+        start = time.perf_counter()
+        self.time_to_first_audio = None
+        while True:
+            try:
+                sentence = sentences.get(timeout=self.latency_budget)
+            except queue.Empty:
+                sentence = TimeoutError(
+                    f"no sentence within {self.latency_budget}s budget"
+                )
+            if sentence is _END_OF_STREAM:
+                break
+            if generation is not None and generation != self.worker.generation:
+                cancelled.set()
+                logger.debug("Creative response pre-empted by a newer activation")
+                break
+            if isinstance(sentence, Exception):
+                cancelled.set()
+                if self.time_to_first_audio is None:
+                    self._fallback(sentence)
+                else:
+                    logger.warning(f"LLM stopped mid-response: {sentence}")
+                break
+
+            if self.time_to_first_audio is None:
+                self.time_to_first_audio = time.perf_counter() - start
+                logger.debug("First sentence after {:.2f}s", self.time_to_first_audio)
+            logger.debug("Sentence: {}", sentence)
+            self._say(sentence)
+
+    def _start_stream(self) -> LlmStream:
+        """
+        Starts streaming a new LLM response.
+        """
+        sentences: queue.Queue = queue.Queue()
+        cancelled = threading.Event()
+        thread = threading.Thread(
+            target=self._stream_sentences,
+            args=(sentences, cancelled),
+            name="llm-stream",
+            daemon=True,
+        )
+        thread.start()
+        return LlmStream(sentences, cancelled, thread)
+
+    def _claim_stream(self) -> LlmStream:
+        """
+        Takes over the discarded stream if its request is still running, so
+        Ollama never has a second request queued behind it, or starts a new
+        one. Called with the prepared lock held.
+        """
+        spare, self._spare = self._spare, None
+        if spare is not None and spare.running:
+            logger.debug("Reusing the discarded response, still streaming")
+            return spare
+        return self._start_stream()
+
+    def prepare(self, duration: float) -> None:
+        """
+        In creative mode, starts generating the response during the hold
+        window so the first sentence is ready by the time activate() runs.
+        """
+        if not self.creative or self.llm is None:
+            return
+        with self._prepared_lock:
+            if self._prepared is None:
+                self._prepared = self._claim_stream()
+
+    def discard(self) -> None:
+        """
+        Sets aside a prepared response that was not spoken. Cancelling it
+        would not stop the request until its next sentence, so it keeps
+        streaming for the next prepare() or activation to pick up.
+        """
+        with self._prepared_lock:
+            prepared, self._prepared = self._prepared, None
+            if prepared is not None:
+                self._spare = prepared
+        if prepared is not None:
+            logger.debug("Discarded the prepared response")
+
+    def _stream_sentences(self, sentences: queue.Queue, cancelled: threading.Event):
+        """
+        Streams the LLM response into the queue sentence by sentence.
+        Errors are queued for the caller; the stream is dropped once cancelled.
+        """
+        assert self.llm is not None, "LLM not initialized"
+        try:
+            for sentence in iter_sentences(self.llm.stream(self.prompt)):
+                if cancelled.is_set():
+                    return
+                sentences.put(sentence)
+        except Exception as e:
+            sentences.put(e)
+        else:
+            sentences.put(_END_OF_STREAM)
+
+    def _fallback(self, reason: Exception) -> None:
+        """
+        Speaks a stock phrase when the LLM is too slow or fails.
+        """
+        assert self.provider is not None, "Provider not initialized"
+        self.creative_stats.fallbacks += 1
+        logger.warning(
+            "Falling back to stock phrase ({}), {}/{} activations ({:.0%})",
+            reason,
+            self.creative_stats.fallbacks,
+            self.creative_stats.activations,
+            self.creative_stats.fallback_rate,
+        )
+        self._say(self.provider.get_phrase())
+
+    def _say(self, text: str) -> None:
+        assert self.worker is not None, "Worker not initialized"
+        self.worker.say(text)
+
+    def _run_creative(self, duration: float, generation: int) -> None:
         try:
-            response = self.llm.invoke(self.prompt)
-            logger.debug(f"Response: {response}")
-            self.engine.say(response)
-            self.engine.iterate()
+            self._activate_creative(duration, generation)
         except Exception as e:
-            logger.error(f"Error during creative activation: {e}")
+            logger.error(f"Failed to activate SpeechDeterrent: {e}")
 
     def activate(self, duration: float):
         """
         Activates the deterrent for the specified duration.
+        Returns immediately: speech from earlier activations is pre-empted
+        and the new speech is queued on the worker.
         """
         try:
+            assert self.worker is not None, "Worker not initialized"
+            generation = self.worker.preempt()
             if self.creative:
-                self._activate_creative(duration)
+                self._creative_thread = threading.Thread(
+                    target=self._run_creative,
+                    args=(duration, generation),
+                    name="speech-creative",
+                    daemon=True,
+                )
+                self._creative_thread.start()
             else:
                 self._activate_basic(duration)
         except Exception as e:
             logger.error(f"Failed to activate SpeechDeterrent: {e}")
 
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the latest activation has been fully spoken.
+        """
+        if self._creative_thread is not None:
+            self._creative_thread.join(timeout)
+        return self.worker is None or self.worker.wait_idle(timeout)
+
     def cleanup(self) -> None:
         """
         Cleans up resources used by the SpeechDeterrent.
         """
         try:
-            if self.engine:
-                self.engine.stop()
+            with self._prepared_lock:
+                streams = [self._prepared, self._spare]
+                self._prepared = self._spare = None
+            for stream in streams:
+                if stream is not None:
+                    stream.cancelled.set()
+            if self.worker is not None:
+                self.worker.stop()
+            self.worker = None
             self.engine = None
             self.provider = None
         except Exception as e:
@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from src.config import SPEECH_QUEUE_SIZE
+from src.utils.logger import logger
+
+# Seconds between engine.iterate() calls while an utterance is playing
+ITERATE_INTERVAL = 0.01
+
+
+@dataclass
+class Utterance:
+    text: str
+    generation: int
+    enqueued_at: float
+    # Rest of a sequence, queued one at a time as each utterance starts
+    rest: Iterator[str] | None = None
+
+
+@dataclass
+class SpeechStats:
+    spoken: int = 0
+    dropped: int = 0  # Pushed out of a full queue
+    preempted: int = 0  # Discarded or cut off by a newer trigger
+    max_depth: int = 0
+    total_latency: float = 0.0  # Seconds from say() to the start of speech
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.spoken if self.spoken else 0.0
+
+
+class SpeechWorker:
+    """
+    Owns a pyttsx3 engine on a dedicated thread and speaks queued utterances
+    one after another, iterating the engine until each has finished.
+
+    say() never blocks. The queue is bounded and drops its oldest entry when
+    full. say_all() queues each text of a sequence only as the one before it
+    starts, so a long sequence never fills the queue. preempt() starts a new generation: queued utterances from earlier
+    generations are discarded and the one being spoken is cut off.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Any],
+        max_queue: int = SPEECH_QUEUE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            engine_factory: Creates the engine, called on the worker thread
+            max_queue: Utterances waiting to be spoken
+        """
+        self._engine_factory = engine_factory
+        self.max_queue = max_queue
+        self._clock = clock
+        self._queue: deque[Utterance] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._error: Exception | None = None
+        self._stopping = False
+        self._speaking = False
+        self.generation = 0
+        self.stats = SpeechStats()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        """
+        Starts the worker and waits for the engine. Re-raises engine errors.
+        """
+        self._thread = threading.Thread(
+            target=self._run, name="speech-worker", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def say(self, text: str) -> None:
+        with self._cond:
+            self._enqueue(text, self.generation)
+
+    def say_all(self, texts: Iterable[str]) -> None:
+        """
+        Speaks the texts in order, queueing each as the previous one starts.
+        """
+        rest = iter(texts)
+        first = next(rest, None)
+        if first is not None:
+            with self._cond:
+                self._enqueue(first, self.generation, rest)
+
+    def _enqueue(
+        self, text: str, generation: int, rest: Iterator[str] | None = None
+    ) -> None:
+        """
+        Appends an utterance. Called with the condition held.
+        """
+        if len(self._queue) >= self.max_queue:
+            dropped = self._queue.popleft()
+            self.stats.dropped += 1
+            logger.debug("Speech queue full, dropped {!r}", dropped.text)
+        self._queue.append(Utterance(text, generation, self._clock(), rest))
+        self.stats.max_depth = max(self.stats.max_depth, len(self._queue))
+        self._cond.notify_all()
+
+    def preempt(self) -> int:
+        """
+        Discards stale speech. Returns the new generation.
+        """
+        with self._cond:
+            self.generation += 1
+            self.stats.preempted += len(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+            return self.generation
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the queue is empty and nothing is being spoken.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._speaking, timeout
+            )
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self.generation += 1
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.log_report()
+
+    def log_report(self) -> None:
+        logger.info(
+            "Speech: {} spoken, {} dropped, {} pre-empted, max queue depth {}, "
+            "latency mean {:.2f}s max {:.2f}s",
+            self.stats.spoken,
+            self.stats.dropped,
+            self.stats.preempted,
+            self.stats.max_depth,
+            self.stats.mean_latency,
+            self.stats.max_latency,
+        )
+
+    def _run(self) -> None:
+        try:
+            engine = self._engine_factory()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                if self._stopping:
+                    break
+                utterance = self._queue.popleft()
+                self._speaking = True
+                if utterance.rest is not None:
+                    following = next(utterance.rest, None)
+                    if following is not None:
+                        self._enqueue(following, utterance.generation, utterance.rest)
+            try:
+                self._speak(engine, utterance)
+            except Exception as e:
+                logger.error(f"Error while speaking: {e}")
+            finally:
+                with self._cond:
+                    self._speaking = False
+                    self._cond.notify_all()
+
+        try:
+            engine.stop()
+        except Exception as e:
+            logger.error(f"Error stopping speech engine: {e}")
+
+    def _speak(self, engine: Any, utterance: Utterance) -> None:
+        latency = self._clock() - utterance.enqueued_at
+        self.stats.spoken += 1
+        self.stats.total_latency += latency
+        self.stats.max_latency = max(self.stats.max_latency, latency)
+        logger.debug(
+            "Speaking {!r} after {:.2f}s, {} queued",
+            utterance.text,
+            latency,
+            self.depth,
+        )
+
+        engine.say(utterance.text)
+        while True:
+            engine.iterate()
+            if utterance.generation != self.generation:
+                engine.stop()
+                self.stats.preempted += 1
+                return
+            if not engine.isBusy():
+                return
+            time.sleep(ITERATE_INTERVAL)
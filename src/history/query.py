@@ -0,0 +1,79 @@
+import argparse
+from datetime import datetime
+
+from src.config import HISTORY_DIR, INTERESTED_CLASSES
+from src.history.store import hourly_visit_counts, iter_records
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Query the detection history")
+    parser.add_argument("--dir", default=HISTORY_DIR, help="History directory")
+    parser.add_argument("--start", required=True, type=_timestamp, help="ISO time")
+    parser.add_argument("--end", type=_timestamp, help="ISO time, default now")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    records = subparsers.add_parser("records", help="Print detections in the range")
+    records.add_argument("--limit", type=int, default=100)
+
+    visits = subparsers.add_parser("visits", help="Count visits per hour")
+    visits.add_argument(
+        "--gap", type=float, default=60.0, help="Seconds that separate two visits"
+    )
+    visits.add_argument(
+        "--hour-of-day",
+        action="store_true",
+        help="Sum over days into a 24-hour histogram",
+    )
+    visits.add_argument(
+        "--all-classes",
+        action="store_true",
+        help="Count every class, not only INTERESTED_CLASSES",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    end = args.end or datetime.now().timestamp()
+
+    if args.command == "records":
+        printed = 0
+        for records in iter_records(args.dir, args.start, end):
+            for r in records[: args.limit - printed]:
+                print(
+                    f"{datetime.fromtimestamp(r['timestamp']).isoformat()} "
+                    f"class={r['class_id']} score={r['score']:.2f} "
+                    f"box=({r['x1']}, {r['y1']}, {r['x2']}, {r['y2']})"
+                )
+                printed += 1
+            if printed >= args.limit:
+                break
+        return
+
+    class_ids = None
+    if not args.all_classes:
+        from src.models.yolo_config import get_class_id, load_class_names
+
+        names = load_class_names()
+        class_ids = [get_class_id(c, names) for c in INTERESTED_CLASSES]
+
+    counts = hourly_visit_counts(
+        args.dir, args.start, end, class_ids=class_ids, visit_gap=args.gap
+    )
+    if args.hour_of_day:
+        histogram = [0] * 24
+        for hour, count in counts.items():
+            histogram[hour.hour] += count
+        for hour, count in enumerate(histogram):
+            print(f"{hour:02d}:00 {count:6d} {'#' * min(count, 60)}")
+    else:
+        for hour, count in sorted(counts.items()):
+            print(f"{hour.isoformat(timespec='minutes')} {count:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import os
+import time
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from src.config import HISTORY_FLUSH_INTERVAL
+from src.utils.logger import logger
+
+# One fixed-size record per detection, packed little-endian (24 bytes)
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),  # Unix time of the frame
+        ("class_id", "<i2"),
+        ("score", "<f4"),
+        ("x1", "<i2"),
+        ("y1", "<i2"),
+        ("x2", "<i2"),
+        ("y2", "<i2"),
+        ("reserved", "<i2"),
+    ]
+)
+MAGIC = b"SSSDET\x00\x01"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("record_size", "<u4"), ("reserved", "<u4")])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+SEGMENT_SUFFIX = ".det"
+
+
+def segment_path(directory: Path, day: date) -> Path:
+    return directory / f"{day.isoformat()}{SEGMENT_SUFFIX}"
+
+
+def check_header(path: Path) -> None:
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)[0]
+    if header["magic"] != MAGIC or header["record_size"] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a detection log segment")
+
+
+class DetectionLog:
+    """
+    Append-only binary detection log with one segment file per local day.
+
+    Each segment is a 16-byte header followed by fixed-size RECORD_DTYPE
+    records in time order, so readers can memory-map it and binary-search
+    by timestamp. A record cut short by a crash is ignored by readers and
+    dropped when the segment is next opened for writing.
+    """
+
+    def __init__(
+        self, directory: str | Path, flush_interval: float = HISTORY_FLUSH_INTERVAL
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._file = None
+        self._day: date | None = None
+        self._last_flush = time.monotonic()
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+
+    def _open_segment(self, day: date) -> None:
+        self.close()
+        path = segment_path(self.directory, day)
+        size = path.stat().st_size if path.exists() else 0
+        if size >= HEADER_SIZE:
+            check_header(path)
+            complete = size - (size - HEADER_SIZE) % RECORD_DTYPE.itemsize
+        else:
+            # Not even the header made it to disk
+            complete = 0
+        if complete != size:
+            # Appending after a torn record would misalign everything after it
+            logger.warning(
+                "Dropping {} bytes of a partial record from {}", size - complete, path
+            )
+            os.truncate(path, complete)
+        self._file = open(path, "ab")
+        if complete == 0:
+            header = np.array([(MAGIC, RECORD_DTYPE.itemsize, 0)], dtype=HEADER_DTYPE)
+            self._file.write(header.tobytes())
+        self._day = day
+
+    def append(self, timestamp: float, detections: list[dict]) -> None:
+        """
+        Appends one record per detection dict ('bbox', 'class_id', 'score').
+        """
+        if not detections:
+            return
+        day = datetime.fromtimestamp(timestamp).date()
+        if day != self._day:
+            self._open_segment(day)
+        assert self._file is not None
+        record = self._record[0]
+        for det in detections:
+            x1, y1, x2, y2 = det["bbox"]
+            record["timestamp"] = timestamp
+            record["class_id"] = det["class_id"]
+            record["score"] = det["score"]
+            record["x1"], record["y1"], record["x2"], record["y2"] = x1, y1, x2, y2
+            self._file.write(self._record.tobytes())
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._day = None
+
+
+def open_segment(path: Path) -> np.ndarray:
+    """
+    Memory-maps the complete records of a segment file.
+    """
+    size = path.stat().st_size
+    count = max(0, (size - HEADER_SIZE) // RECORD_DTYPE.itemsize)
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    check_header(path)
+    return np.memmap(
+        path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,)
+    )
+
+
+def iter_records(
+    directory: str | Path, start: float, end: float
+) -> Iterator[np.ndarray]:
+    """
+    Yields memory-mapped record slices with start <= timestamp < end, one per
+    daily segment, without reading anything outside the range.
+    """
+    directory = Path(directory)
+    day = datetime.fromtimestamp(start).date()
+    last_day = datetime.fromtimestamp(end).date()
+    while day <= last_day:
+        path = segment_path(directory, day)
+        if path.exists():
+            records = open_segment(path)
+            timestamps = records["timestamp"]
+            lo = np.searchsorted(timestamps, start, side="left")
+            hi = np.searchsorted(timestamps, end, side="left")
+            if hi > lo:
+                yield records[lo:hi]
+        day += timedelta(days=1)
+
+
+def hourly_visit_counts(
+    directory: str | Path,
+    start: float,
+    end: float,
+    class_ids: list[int] | None = None,
+    visit_gap: float = 60.0,
+) -> dict[datetime, int]:
+    """
+    Counts visits per local hour. A visit is a run of detections with no gap
+    longer than `visit_gap` seconds, counted in the hour it started.
+
+    Works one segment at a time, so memory stays flat over months of data.
+    """
+    counts: dict[datetime, int] = {}
+    last_seen = -np.inf
+    for records in iter_records(directory, start, end):
+        timestamps = np.asarray(records["timestamp"])
+        if class_ids is not None:
+            timestamps = timestamps[np.isin(records["class_id"], class_ids)]
+        if timestamps.size == 0:
+            continue
+        gaps = np.diff(timestamps, prepend=last_seen)
+        for visit_start in timestamps[gaps > visit_gap]:
+            hour = datetime.fromtimestamp(visit_start).replace(
+                minute=0, second=0, microsecond=0
+            )
+            counts[hour] = counts.get(hour, 0) + 1
+        last_seen = timestamps[-1]
+    return counts
@@ -0,0 +1,126 @@
+import time
+from collections.abc import Callable
+
+import cv2
+import numpy as np
+
+from src.config import DETERRENT_DURATION, INTERESTED_CLASSES
+from src.decision import DeterrentController
+from src.detection.camera import read_frame
+from src.detection.cascade import ResolutionCascade
+from src.detection.detector import detect_cat
+from src.detection.motion import MotionCropDetector
+from src.detection.prefilter import PresencePrefilter
+from src.detection.preprocessing import BlobPreprocessor
+from src.deterrent._deterrent import Deterrent
+from src.history.store import DetectionLog
+from src.utils.logger import logger
+
+# Shared result for frames the prefilter skips, never mutated
+NOT_DETECTED: dict = {"detected": False}
+
+
+class DetectionLoop:
+    """
+    One pass of the main loop: read, gate, detect, record and decide.
+
+    Steady-state passes reuse the camera frame buffer and the model input
+    blob, so an idle loop allocates nothing that outlives the pass.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        deterrent: Deterrent,
+        controller: DeterrentController | None = None,
+        cascade: ResolutionCascade | None = None,
+        prefilter: PresencePrefilter | None = None,
+        motion: MotionCropDetector | None = None,
+        preprocessor: BlobPreprocessor | None = None,
+        history: DetectionLog | None = None,
+        want_boxes: bool = False,
+        duration: float = DETERRENT_DURATION,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cap = cap
+        self.deterrent = deterrent
+        self.controller = controller or DeterrentController()
+        self.cascade = cascade
+        self.prefilter = prefilter
+        self.motion = motion
+        self.preprocessor = preprocessor
+        self.history = history
+        self.want_boxes = want_boxes
+        self.duration = duration
+        self._clock = clock
+        # Only raw frames can be read back into the previous buffer
+        self._letterbox = cascade is None and motion is None and preprocessor is None
+        self.frame: np.ndarray | None = None
+
+    def read(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Reads the latest frame, into `out` when given and the frame is raw.
+        """
+        return read_frame(
+            self.cap,
+            preprocess=self._letterbox,
+            out=None if self._letterbox else out,
+        )
+
+    def detect(self, frame: np.ndarray) -> dict:
+        """
+        Runs the prefilter gate and the detector on one frame.
+        """
+        if self.prefilter is not None and not self.prefilter.should_run(
+            frame, force=self.controller.cat_detected_since is not None
+        ):
+            return NOT_DETECTED
+        if self.cascade is not None:
+            return self.cascade.detect(frame, debug=self.want_boxes)
+        if self.motion is not None:
+            return self.motion.detect(frame, debug=self.want_boxes)
+        return detect_cat(frame, debug=self.want_boxes, preprocessor=self.preprocessor)
+
+    def decide(self, detection: dict, now: float) -> bool:
+        """
+        Records the detection and returns True if the deterrent should fire.
+        """
+        if self.history is not None and detection["detected"]:
+            self.history.append(
+                now,
+                [
+                    d
+                    for d in detection["detections"]
+                    if d["label"] in INTERESTED_CLASSES
+                ],
+            )
+        watching = self.controller.cat_detected_since is not None
+        fire = self.controller.update(detection["detected"], now)
+        if self.controller.cat_detected_since is None:
+            if watching:
+                self._hook("discard")
+        elif not watching:
+            # First sighting: build the output during the hold window
+            self._hook("prepare", self.duration)
+        return fire
+
+    def _hook(self, name: str, *args) -> None:
+        """
+        Calls an optional deterrent hook. Speculative work must never break
+        detection, so errors are only logged.
+        """
+        try:
+            getattr(self.deterrent, name)(*args)
+        except Exception as e:
+            logger.error("Deterrent {} failed: {}", name, e)
+
+    def step(self) -> dict:
+        """
+        Processes the latest frame. Returns the detection result.
+        """
+        self.frame = frame = self.read(out=self.frame)
+        detection = self.detect(frame)
+        if self.decide(detection, self._clock()):
+            logger.info("Deterrent activated for {}s", self.duration)
+            self.deterrent.activate(self.duration)
+        return detection
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.config import DNN_AUTOTUNE, DNN_TUNING_CACHE, INPUT_SIZE
+from src.models.manifest import file_sha256
+from src.utils.logger import logger
+
+BACKEND_NAMES = {
+    cv2.dnn.DNN_BACKEND_DEFAULT: "default",
+    cv2.dnn.DNN_BACKEND_OPENCV: "opencv",
+    cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE: "openvino",
+}
+CPU_TARGET_NAMES = {
+    cv2.dnn.DNN_TARGET_CPU: "cpu",
+    cv2.dnn.DNN_TARGET_CPU_FP16: "cpu_fp16",
+}
+
+# Thread count chosen for this process, by pin_threads() or the first tuned model
+_process_threads: int | None = None
+
+
+@dataclass(frozen=True)
+class DnnSettings:
+    backend: int
+    target: int
+    threads: int
+
+    def __str__(self) -> str:
+        return (
+            f"{BACKEND_NAMES.get(self.backend, self.backend)}/"
+            f"{CPU_TARGET_NAMES.get(self.target, self.target)} x{self.threads}"
+        )
+
+
+def machine_id() -> str:
+    """
+    Identifies the board and OpenCV build; tuning results do not carry over.
+    """
+    return "-".join(
+        [
+            platform.node(),
+            platform.machine(),
+            str(os.cpu_count()),
+            f"opencv{cv2.__version__}",
+        ]
+    )
+
+
+def cache_key(model_path: str, input_size: int) -> str:
+    return f"{machine_id()}:{file_sha256(model_path)}:{input_size}"
+
+
+def load_cache(path: str = DNN_TUNING_CACHE) -> dict[str, dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable tuning cache {}: {}", path, e)
+        return {}
+
+
+def save_cache(cache: dict[str, dict], path: str = DNN_TUNING_CACHE) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def candidate_settings(thread_counts: list[int] | None = None) -> list[DnnSettings]:
+    """
+    Every available CPU backend/target pair with each thread count.
+    """
+    if thread_counts is None:
+        cpus = os.cpu_count() or 1
+        thread_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    candidates = []
+    for backend in BACKEND_NAMES:
+        try:
+            targets = cv2.dnn.getAvailableTargets(backend)
+        except cv2.error:
+            continue
+        for target in map(int, targets):
+            if target not in CPU_TARGET_NAMES:
+                continue
+            candidates.extend(DnnSettings(backend, target, n) for n in thread_counts)
+    return candidates
+
+
+def pin_threads(threads: int) -> None:
+    """
+    Sets OpenCV's thread count, which is process-wide, and keeps models
+    loaded later from changing it.
+    """
+    global _process_threads
+    cv2.setNumThreads(threads)
+    _process_threads = threads
+
+
+def apply_settings(
+    net: cv2.dnn.Net, settings: DnnSettings, threads: bool = True
+) -> None:
+    net.setPreferableBackend(settings.backend)
+    net.setPreferableTarget(settings.target)
+    if threads:
+        # Thread count is process-wide in OpenCV
+        cv2.setNumThreads(settings.threads)
+
+
+def benchmark(
+    model_path: str,
+    settings: DnnSettings,
+    input_size: int = INPUT_SIZE,
+    warmup: int = 2,
+    repeats: int = 10,
+) -> float:
+    """
+    Returns the median forward time in milliseconds on a dummy input.
+    """
+    net = cv2.dnn.readNetFromONNX(model_path)
+    apply_settings(net, settings)
+    blob = np.random.default_rng(0).random(
+        (1, 3, input_size, input_size), dtype=np.float32
+    )
+    times = []
+    for i in range(warmup + repeats):
+        net.setInput(blob)
+        start = time.perf_counter()
+        net.forward()
+        if i >= warmup:
+            times.append(time.perf_counter() - start)
+    return 1000 * float(np.median(times))
+
+
+def tune(
+    model_path: str,
+    input_size: int = INPUT_SIZE,
+    candidates: list[DnnSettings] | None = None,
+    repeats: int = 10,
+) -> tuple[DnnSettings, list[tuple[DnnSettings, float]]]:
+    """
+    Benchmarks every candidate and returns the fastest with all timings.
+    Combinations that fail to run are skipped.
+    """
+    previous_threads = cv2.getNumThreads()
+    results = []
+    try:
+        for settings in candidates or candidate_settings():
+            try:
+                ms = benchmark(model_path, settings, input_size, repeats=repeats)
+            except cv2.error as e:
+                logger.debug("Skipping {}: {}", settings, e)
+                continue
+            logger.debug("{}: {:.1f} ms", settings, ms)
+            results.append((settings, ms))
+    finally:
+        cv2.setNumThreads(previous_threads)
+    if not results:
+        raise RuntimeError("No cv2.dnn backend could run the model")
+    best = min(results, key=lambda r: r[1])[0]
+    return best, results
+
+
+def tune_and_cache(
+    model_path: str,
+    input_size: int = INPUT_SIZE,
+    cache_path: str = DNN_TUNING_CACHE,
+    candidates: list[DnnSettings] | None = None,
+    repeats: int = 10,
+) -> tuple[DnnSettings, list[tuple[DnnSettings, float]]]:
+    best, results = tune(model_path, input_size, candidates, repeats)
+    timings = dict(results)
+    cache = load_cache(cache_path)
+    cache[cache_key(model_path, input_size)] = {
+        **asdict(best),
+        "forward_ms": timings[best],
+        "tuned_at": time.time(),
+    }
+    save_cache(cache, cache_path)
+    logger.info("Tuned {}: {} ({:.1f} ms)", model_path, best, timings[best])
+    return best, results
+
+
+def apply_tuning(
+    net: cv2.dnn.Net,
+    model_path: str,
+    input_size: int = INPUT_SIZE,
+    mode: str = DNN_AUTOTUNE,
+    cache_path: str = DNN_TUNING_CACHE,
+) -> DnnSettings | None:
+    """
+    Applies the cached settings for this machine and model to the net.
+    The thread count is process-wide, so only the first tuned model sets it,
+    unless pin_threads() already has.
+
+    Args:
+        mode: 'off', 'cache' to only use saved results, or 'startup' to tune
+            now when this machine has no result for the model yet
+
+    Returns:
+        The applied settings, or None if OpenCV defaults are kept
+    """
+    if mode == "off":
+        return None
+    cache = load_cache(cache_path)
+    if not cache and mode == "cache":
+        return None
+    try:
+        key = cache_key(model_path, input_size)
+    except OSError as e:
+        logger.warning("Cannot hash {} for tuning: {}", model_path, e)
+        return None
+
+    entry = cache.get(key)
+    if entry is not None:
+        settings = DnnSettings(entry["backend"], entry["target"], entry["threads"])
+    elif mode == "startup":
+        logger.info("No tuning for this machine and model, benchmarking...")
+        settings, _ = tune_and_cache(model_path, input_size, cache_path)
+    else:
+        return None
+    apply_settings(net, settings, threads=False)
+    if _process_threads is None:
+        pin_threads(settings.threads)
+    elif settings.threads != _process_threads:
+        logger.info(
+            "Keeping {} cv2 threads for the process instead of the {} tuned for {}",
+            _process_threads,
+            settings.threads,
+            model_path,
+        )
+    logger.debug("Using cv2.dnn settings {}", settings)
+    return settings
+
+
+def parse_args():
+    from src.models.yolo_config import get_model_path
+
+    parser = argparse.ArgumentParser(
+        description="Find the fastest cv2.dnn backend, target and thread count"
+    )
+    parser.add_argument("--input-size", type=int, default=INPUT_SIZE)
+    parser.add_argument("--model", help="ONNX model, default for the input size")
+    parser.add_argument("--threads", type=int, nargs="+", help="Counts to try")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--cache", default=DNN_TUNING_CACHE)
+    args = parser.parse_args()
+    if args.model is None:
+        args.model = get_model_path(args.input_size)
+    return args
+
+
+def main():
+    args = parse_args()
+    best, results = tune_and_cache(
+        args.model,
+        args.input_size,
+        cache_path=args.cache,
+        candidates=candidate_settings(args.threads),
+        repeats=args.repeats,
+    )
+    print(f"{'settings':<24}{'ms':>9}")
+    for settings, ms in sorted(results, key=lambda r: r[1]):
+        marker = "  <- best" if settings == best else ""
+        print(f"{str(settings):<24}{ms:>9.1f}{marker}")
+    print(f"Saved to {args.cache}")
+
+
+if __name__ == "__main__":
+    main()
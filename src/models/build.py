@@ -0,0 +1,126 @@
+import argparse
+import shutil
+from pathlib import Path
+
+import onnx
+
+from src.config import INPUT_SIZE
+from src.models.manifest import MANIFEST_PATH, record_files
+from src.models.yolo_config import LABELS_PATH, MODEL_PATH, get_model_path
+from src.utils.logger import logger
+
+DEFAULT_WEIGHTS = Path(MODEL_PATH).stem + ".pt"
+
+
+def slim_model(path: str) -> None:
+    """
+    Folds constants and removes redundant nodes with onnxslim, in place.
+    """
+    import onnxslim
+
+    before = onnx.load(path)
+    slimmed = onnxslim.slim(before)
+    onnx.checker.check_model(slimmed)
+    onnx.save(slimmed, path)
+    logger.info(
+        "Slimmed {}: {} -> {} nodes",
+        path,
+        len(before.graph.node),
+        len(slimmed.graph.node),
+    )
+
+
+def export_model(
+    weights: str = DEFAULT_WEIGHTS,
+    input_size: int = INPUT_SIZE,
+    simplify: bool = True,
+) -> str:
+    """
+    Exports YOLO weights to ONNX with a fixed batch of one and a fixed
+    square input, so OpenCV can plan the whole graph ahead of time.
+
+    Returns:
+        Path of the model in assets, named as load_model expects
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(weights)
+    exported = model.export(
+        format="onnx", imgsz=input_size, dynamic=False, batch=1, simplify=False
+    )
+    output = get_model_path(input_size)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(exported, output)
+    if simplify:
+        slim_model(output)
+
+    with open(LABELS_PATH, "w") as f:
+        for label in dict(model.names).values():
+            f.write(f"{label}\n")
+    return output
+
+
+def build(
+    input_sizes: list[int],
+    weights: str = DEFAULT_WEIGHTS,
+    simplify: bool = True,
+    manifest_path: str = MANIFEST_PATH,
+) -> list[str]:
+    """
+    Exports a model per input size and records all outputs in the manifest.
+    """
+    outputs = []
+    for size in input_sizes:
+        output = export_model(weights, size, simplify=simplify)
+        record_files(
+            [output],
+            manifest_path,
+            input_size=size,
+            weights=weights,
+            slimmed=simplify,
+        )
+        outputs.append(output)
+        logger.info("Built {}", output)
+    record_files([LABELS_PATH], manifest_path)
+    return outputs
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Export, simplify and checksum the detection models"
+    )
+    parser.add_argument(
+        "--input-size",
+        type=int,
+        nargs="+",
+        default=[INPUT_SIZE],
+        help="Fixed model input sizes to build",
+    )
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    parser.add_argument("--no-slim", action="store_true", help="Skip the onnxslim pass")
+    parser.add_argument(
+        "--record",
+        nargs="+",
+        metavar="FILE",
+        help="Only record checksums of existing files, e.g. a copied model",
+    )
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.record:
+        record_files(args.record, args.manifest)
+        logger.info("Recorded {} in {}", ", ".join(args.record), args.manifest)
+        return
+    build(
+        args.input_size,
+        weights=args.weights,
+        simplify=not args.no_slim,
+        manifest_path=args.manifest,
+    )
+
+
+if __name__ == "__main__":
+    main()
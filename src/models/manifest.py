@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import time
+from functools import cache
+from pathlib import Path
+
+MANIFEST_PATH = "assets/models.json"
+BUILD_COMMAND = "python -m src.models.build"
+
+
+@cache
+def _sha256(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """
+    SHA-256 of a file, computed once per file version.
+    """
+    stat = os.stat(path)
+    return _sha256(str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def load_manifest(manifest_path: str = MANIFEST_PATH) -> dict[str, dict]:
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def record_files(
+    paths: list[str], manifest_path: str = MANIFEST_PATH, **details
+) -> dict[str, dict]:
+    """
+    Adds or replaces the manifest entries for the given files.
+    Extra keyword arguments are stored with every entry.
+    """
+    manifest = load_manifest(manifest_path)
+    for path in paths:
+        manifest[Path(path).name] = {
+            "sha256": file_sha256(path),
+            "size": os.path.getsize(path),
+            "recorded_at": time.time(),
+            **details,
+        }
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
+def verify_file(path: str, manifest_path: str = MANIFEST_PATH) -> dict:
+    """
+    Checks a built file against the manifest and returns its entry.
+    Raises FileNotFoundError if the file or its entry is missing, and
+    RuntimeError if the checksum does not match.
+    """
+    if not Path(path).is_file():
+        raise FileNotFoundError(f"{path} is missing, build it with: {BUILD_COMMAND}")
+    entry = load_manifest(manifest_path).get(Path(path).name)
+    if entry is None:
+        raise FileNotFoundError(
+            f"{path} is not in {manifest_path}, rebuild it with: {BUILD_COMMAND}"
+        )
+    if file_sha256(path) != entry["sha256"]:
+        raise RuntimeError(
+            f"{path} does not match its checksum in {manifest_path}, "
+            f"rebuild it with: {BUILD_COMMAND}"
+        )
+    return entry
@@ -1,6 +1,10 @@
 import cv2
 from pathlib import Path
 
+from src.config import INPUT_SIZE
+from src.models.autotune import apply_tuning
+from src.models.manifest import BUILD_COMMAND, verify_file
+
 MODEL_PATH = "assets/yolov8n.onnx"
 LABELS_PATH = "assets/coco.names"
 
@@ -8,7 +12,10 @@ LABELS_PATH = "assets/coco.names"
 def load_class_names() -> dict[int, str]:
     """
     Loads the class names from the specified path.
+    The labels are built with the model and must match their checksum in the
+    manifest.
     """
+    verify_file(LABELS_PATH)
     with open(LABELS_PATH, "r") as f:
         class_names = [line.strip() for line in f.readlines()]
 
@@ -26,21 +33,34 @@ def get_class_id(class_name: str, class_names: dict[int, str]) -> int:
         raise RuntimeError(f"Class '{class_name}' not found in class mapping.")
 
 
-def load_model() -> cv2.dnn.Net:
+def get_model_path(input_size: int = INPUT_SIZE) -> str:
     """
-    Loads the YOLO model from the specified path.
+    Returns the model path for the given input size.
+    Models for sizes other than INPUT_SIZE live next to the main model with
+    the size as a suffix, e.g. assets/yolov8n-320.onnx.
     """
-    if not Path(MODEL_PATH).is_file():
-        from ultralytics import YOLO
-        import shutil
+    if input_size == INPUT_SIZE:
+        return MODEL_PATH
+    stem, suffix = MODEL_PATH.rsplit(".", 1)
+    return f"{stem}-{input_size}.{suffix}"
+
 
-        model = YOLO(MODEL_PATH.split("/")[-1].split(".")[0] + ".pt")
-        result = model.export(format="onnx")
-        shutil.move(result, MODEL_PATH)
-        labels = dict(model.names).values()
-        with open(LABELS_PATH, "w+") as f:
-            for label in labels:
-                f.write(f"{label}\n")
+def load_model(input_size: int = INPUT_SIZE) -> cv2.dnn.Net:
+    """
+    Loads the YOLO model from the specified path.
+    Models are exported with a fixed input size, so a non-default input size
+    needs its own variant. Models are built ahead of time with
+    `python -m src.models.build` and must match their checksum in the manifest.
+    Applies the tuned cv2.dnn settings for this machine, if any.
+    """
+    model_path = get_model_path(input_size)
+    if not Path(model_path).is_file():
+        raise FileNotFoundError(
+            f"No model exported for input size {input_size} at {model_path}, "
+            f"build it with: {BUILD_COMMAND} --input-size {input_size}"
+        )
 
-    net = cv2.dnn.readNetFromONNX(MODEL_PATH)
+    verify_file(model_path)
+    net = cv2.dnn.readNetFromONNX(model_path)
+    apply_tuning(net, model_path, input_size)
     return net
@@ -0,0 +1,272 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from src.config import FREQUENCY, PIPELINE_QUEUE_SIZE, PIPELINE_REPORT_INTERVAL
+from src.loop import DetectionLoop
+from src.utils.logger import logger
+
+
+class DropOldestQueue(asyncio.Queue):
+    """
+    Bounded queue that never blocks the producer: when full, the oldest
+    item is discarded to make room, so consumers always see fresh data.
+    """
+
+    def __init__(
+        self, maxsize: int = 1, on_drop: Callable[[Any], None] | None = None
+    ) -> None:
+        """
+        Args:
+            on_drop: Called with each discarded item, e.g. to release a buffer
+        """
+        super().__init__(maxsize=maxsize)
+        self.dropped = 0
+        self._on_drop = on_drop
+
+    def put_nowait(self, item) -> None:
+        if self.full():
+            dropped = self.get_nowait()
+            self.task_done()
+            self.dropped += 1
+            if self._on_drop is not None:
+                self._on_drop(dropped)
+        super().put_nowait(item)
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    busy: float = 0.0  # Seconds spent working, excluding waits on the queue
+    started: float = field(default_factory=time.monotonic)
+    queue: DropOldestQueue | None = None  # Input queue, for drop counts
+
+    @property
+    def dropped(self) -> int:
+        return self.queue.dropped if self.queue is not None else 0
+
+    def rate(self, now: float | None = None) -> float:
+        elapsed = (now or time.monotonic()) - self.started
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+    def utilization(self, now: float | None = None) -> float:
+        elapsed = (now or time.monotonic()) - self.started
+        return self.busy / elapsed if elapsed > 0 else 0.0
+
+
+class FramePool:
+    """
+    Frame buffers for the capture stage.
+
+    Each captured frame has exactly one owner at a time: the frame queue,
+    the inference stage, the display queue or the display stage. The owner
+    releases it once done, and only released buffers are handed out again,
+    so capture never writes into a frame that is still being read. When no
+    buffer is free, capture reads into a new one.
+    """
+
+    def __init__(self, max_free: int) -> None:
+        """
+        Args:
+            max_free: Released buffers kept for reuse, extras are let go
+        """
+        self.max_free = max_free
+        self._free: list[np.ndarray] = []
+
+    def acquire(self) -> np.ndarray | None:
+        return self._free.pop() if self._free else None
+
+    def release(self, frame: np.ndarray | None) -> None:
+        if frame is not None and len(self._free) < self.max_free:
+            self._free.append(frame)
+
+
+class Pipeline:
+    """
+    Runs capture, inference, decision, deterrent and display as independent
+    asyncio tasks joined by DropOldestQueues.
+
+    Blocking work (camera reads, the model, deterrents) runs on dedicated
+    single-thread executors, so a slow stage only drops its own backlog and
+    never stalls the others.
+    """
+
+    def __init__(
+        self,
+        loop: DetectionLoop,
+        frequency: float = FREQUENCY,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        report_interval: float = PIPELINE_REPORT_INTERVAL,
+        display: Callable[[np.ndarray, dict], bool] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            loop: Provides read, detect and decide for one frame
+            frequency: Seconds between camera reads
+            queue_size: Items each queue holds before dropping the oldest
+            report_interval: Seconds between throughput logs, 0 to disable
+            display: Called with (frame, detection); returns False to stop
+        """
+        self.loop = loop
+        self.frequency = frequency
+        self.report_interval = report_interval
+        self.display = display
+        self._clock = clock
+
+        # Queued frames, plus one held by each consumer and one being written
+        self._pool = FramePool(2 * queue_size + 3)
+        self.frames = DropOldestQueue(queue_size, on_drop=self._pool.release)
+        self.results = DropOldestQueue(queue_size)
+        self.activations = DropOldestQueue(queue_size)
+        self.shown = DropOldestQueue(
+            queue_size, on_drop=lambda item: self._pool.release(item[0])
+        )
+        self.stats = {
+            "capture": StageStats("capture"),
+            "inference": StageStats("inference", queue=self.frames),
+            "decision": StageStats("decision", queue=self.results),
+            "deterrent": StageStats("deterrent", queue=self.activations),
+        }
+        if display is not None:
+            self.stats["display"] = StageStats("display", queue=self.shown)
+
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+            for name in ("capture", "inference", "deterrent")
+        }
+        self._stopping: asyncio.Event | None = None
+
+    def stop(self) -> None:
+        """
+        Asks run() to cancel all stages and return.
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _in_executor(self, name: str, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executors[name], func, *args
+        )
+
+    async def _capture(self) -> None:
+        stats = self.stats["capture"]
+        while True:
+            started = time.monotonic()
+            buffer = self._pool.acquire()
+            frame = await self._in_executor("capture", self.loop.read, buffer)
+            if frame is not buffer:
+                # Letterboxed reads return new frames and leave the buffer unused
+                self._pool.release(buffer)
+            stats.busy += time.monotonic() - started
+            stats.items += 1
+            self.frames.put_nowait(frame)
+            await asyncio.sleep(max(0.0, self.frequency - (time.monotonic() - started)))
+
+    async def _inference(self) -> None:
+        stats = self.stats["inference"]
+        while True:
+            frame = await self.frames.get()
+            started = time.monotonic()
+            detection = await self._in_executor("inference", self.loop.detect, frame)
+            stats.busy += time.monotonic() - started
+            stats.items += 1
+            self.results.put_nowait((detection, self._clock()))
+            if self.display is not None:
+                self.shown.put_nowait((frame, detection))
+            else:
+                self._pool.release(frame)
+
+    async def _decision(self) -> None:
+        stats = self.stats["decision"]
+        while True:
+            detection, now = await self.results.get()
+            started = time.monotonic()
+            if self.loop.decide(detection, now):
+                self.activations.put_nowait(self.loop.duration)
+            stats.busy += time.monotonic() - started
+            stats.items += 1
+
+    async def _deterrent(self) -> None:
+        stats = self.stats["deterrent"]
+        while True:
+            duration = await self.activations.get()
+            logger.info("Deterrent activated for {}s", duration)
+            started = time.monotonic()
+            try:
+                await self._in_executor(
+                    "deterrent", self.loop.deterrent.activate, duration
+                )
+            except Exception as e:
+                # A failing deterrent must not take detection down with it
+                logger.error("Deterrent failed: {}", e)
+            stats.busy += time.monotonic() - started
+            stats.items += 1
+
+    async def _display(self) -> None:
+        assert self.display is not None
+        stats = self.stats["display"]
+        while True:
+            frame, detection = await self.shown.get()
+            started = time.monotonic()
+            keep_going = self.display(frame, detection)
+            self._pool.release(frame)
+            stats.busy += time.monotonic() - started
+            stats.items += 1
+            if not keep_going:
+                self.stop()
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.log_report()
+
+    async def run(self) -> None:
+        """
+        Runs until stop() is called, a stage fails or the task is cancelled.
+        A stage failure is re-raised after every stage has been cancelled.
+        """
+        self._stopping = asyncio.Event()
+        for stats in self.stats.values():
+            stats.started = time.monotonic()
+        stages = [self._capture(), self._inference(), self._decision()]
+        stages.append(self._deterrent())
+        if self.display is not None:
+            stages.append(self._display())
+        if self.report_interval > 0:
+            stages.append(self._monitor())
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        stopping = asyncio.create_task(self._stopping.wait())
+
+        try:
+            done, _ = await asyncio.wait(
+                [*tasks, stopping], return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for task in [*tasks, stopping]:
+                task.cancel()
+            await asyncio.gather(*tasks, stopping, return_exceptions=True)
+            for executor in self._executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        for task in done:
+            if task is not stopping and task.exception() is not None:
+                raise task.exception()  # type: ignore[misc]
+
+    def log_report(self) -> None:
+        now = time.monotonic()
+        for stats in self.stats.values():
+            logger.info(
+                "Stage {}: {} items ({:.1f}/s), {:.0%} busy, {} dropped",
+                stats.name,
+                stats.items,
+                stats.rate(now),
+                stats.utilization(now),
+                stats.dropped,
+            )
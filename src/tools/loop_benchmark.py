@@ -0,0 +1,113 @@
+import argparse
+from typing import Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+from src.deterrent.audio_deterrent import AudioDeterrent
+from src.utils.timing import time_call
+
+DURATIONS = [1.5, 5.0, 10.0, 20.0, 30.0, 60.0]
+
+
+def synthetic_gunshots(
+    seconds: float = 2.5,
+    frame_rate: int = 44100,
+    channels: int = 2,
+    seed: int = 0,
+) -> AudioSegment:
+    """
+    Builds a 16-bit clip of decaying noise bursts, five per second, standing
+    in for the gunshot recording.
+    """
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * frame_rate)
+    envelope = np.exp(-np.arange(frames) % (frame_rate // 5) / (frame_rate / 40))
+    noise = rng.normal(0, 12000, (frames, channels)) * envelope[:, None]
+    samples = np.clip(noise, -32768, 32767).astype(np.int16)
+    return AudioSegment(
+        samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels
+    )
+
+
+class LegacyAudioDeterrent(AudioDeterrent):
+    """
+    AudioDeterrent with the loop built by chained AudioSegment.append calls,
+    as before the sample-array version. Each append copies everything built
+    so far, so the cost grows quadratically with the duration.
+    """
+
+    @staticmethod
+    def _splice_and_loop_mp3(
+        audio: AudioSegment,
+        start_time: float,
+        end_time: float,
+        loop_times: int,
+        cross_fade: Optional[int] = 100,
+    ) -> AudioSegment:
+        segment: AudioSegment = audio[start_time:end_time]  # type: ignore[misc]
+        looped_segment: AudioSegment = segment
+        for _ in range(loop_times - 1):
+            if cross_fade is not None:
+                looped_segment = looped_segment.append(segment, crossfade=cross_fade)
+            else:
+                looped_segment += segment
+        looped_segment += audio[end_time:]  # type: ignore[misc]
+        return looped_segment
+
+
+def run_benchmark(
+    durations: list[float], audio: AudioSegment, repeats: int = 3
+) -> list[dict]:
+    """
+    Times building the loop both ways per duration and checks that the
+    outputs are identical.
+    """
+    legacy, current = LegacyAudioDeterrent(), AudioDeterrent()
+    legacy.audio = current.audio = audio
+    results = []
+    for duration in durations:
+        expected = legacy._loop_gunshots(duration)
+        looped = current._loop_gunshots(duration)
+        results.append(
+            {
+                "duration": duration,
+                "seconds": looped.duration_seconds,
+                "legacy_ms": time_call(
+                    lambda: legacy._loop_gunshots(duration), repeats
+                ),
+                "array_ms": time_call(
+                    lambda: current._loop_gunshots(duration), repeats
+                ),
+                "equivalent": looped.raw_data == expected.raw_data,
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark gunshot loop synthesis against chained pydub appends"
+    )
+    parser.add_argument("--durations", type=float, nargs="+", default=DURATIONS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--clip", help="Audio file to loop, default a synthetic 2.5s clip"
+    )
+    args = parser.parse_args()
+    audio = AudioSegment.from_file(args.clip) if args.clip else synthetic_gunshots()
+
+    print(
+        f"{'duration':>9}{'output s':>10}{'legacy ms':>11}"
+        f"{'array ms':>10}{'speedup':>9}  equivalent"
+    )
+    for r in run_benchmark(args.durations, audio, repeats=args.repeats):
+        print(
+            f"{r['duration']:>9.1f}{r['seconds']:>10.2f}{r['legacy_ms']:>11.1f}"
+            f"{r['array_ms']:>10.1f}{r['legacy_ms'] / r['array_ms']:>8.1f}x"
+            f"  {r['equivalent']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
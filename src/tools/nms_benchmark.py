@@ -0,0 +1,158 @@
+import argparse
+
+import cv2
+import numpy as np
+
+from src.config import CONFIDENCE_THRESHOLD, SCORE_THRESHOLD
+from src.detection.nms import decode_outputs, nms
+from src.utils.timing import time_call
+
+NUM_CLASSES = 80
+NUM_ANCHORS = 8400  # YOLOv8 at 640x640
+
+
+def synthetic_outputs(
+    candidates: int, clusters: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Builds a raw (4 + classes, anchors) output with `candidates` anchors above
+    threshold, jittered around `clusters` objects so NMS has real work to do.
+    """
+    outputs = np.zeros((4 + NUM_CLASSES, NUM_ANCHORS), dtype=np.float32)
+    outputs[4:] = rng.uniform(0, 0.3, size=(NUM_CLASSES, NUM_ANCHORS))
+    anchors = rng.choice(NUM_ANCHORS, size=candidates, replace=False)
+    centers = rng.uniform(50, 590, size=(clusters, 2))
+    sizes = rng.uniform(20, 200, size=(clusters, 2))
+    classes = rng.integers(0, NUM_CLASSES, size=clusters)
+    owner = rng.integers(0, clusters, size=candidates)
+
+    outputs[0:2, anchors] = (centers[owner] + rng.normal(0, 8, (candidates, 2))).T
+    outputs[2:4, anchors] = (sizes[owner] * rng.uniform(0.8, 1.2, (candidates, 2))).T
+    outputs[4 + classes[owner], anchors] = rng.uniform(0.5, 1.0, size=candidates)
+    return outputs
+
+
+def legacy_decode_nms(
+    outputs: np.ndarray, confidence_threshold: float, iou_threshold: float
+) -> list[tuple]:
+    """
+    The per-anchor Python loop and class-agnostic cv2.dnn.NMSBoxes path that
+    detect_objects used before the vectorized version.
+    """
+    boxes, confidences, class_ids = [], [], []
+    for detection in outputs.T:
+        class_scores = detection[4:]
+        class_id = np.argmax(class_scores)
+        confidence = class_scores[class_id]
+        if confidence > confidence_threshold:
+            cx, cy, w, h = detection[:4]
+            x1 = int(cx - w / 2)
+            y1 = int(cy - h / 2)
+            x2 = int(cx + w / 2)
+            y2 = int(cy + h / 2)
+            boxes.append([x1, y1, x2 - x1, y2 - y1])
+            confidences.append(float(confidence))
+            class_ids.append(class_id)
+
+    indices = cv2.dnn.NMSBoxes(boxes, confidences, confidence_threshold, iou_threshold)
+    return [
+        (boxes[i][0], boxes[i][1], boxes[i][0] + boxes[i][2], boxes[i][1] + boxes[i][3])
+        for i in np.asarray(indices).ravel()
+    ]
+
+
+def batched_reference(
+    outputs: np.ndarray, confidence_threshold: float, iou_threshold: float
+) -> list[tuple]:
+    """
+    Class-aware reference using cv2.dnn.NMSBoxesBatched on the same candidates.
+    """
+    boxes, scores, class_ids = decode_outputs(outputs, confidence_threshold)
+    xywh = np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]])
+    indices = cv2.dnn.NMSBoxesBatched(
+        xywh.tolist(),
+        scores.tolist(),
+        class_ids.tolist(),
+        confidence_threshold,
+        iou_threshold,
+    )
+    return [tuple(boxes[i]) for i in np.asarray(indices).ravel()]
+
+
+def vectorized_decode_nms(
+    outputs: np.ndarray,
+    confidence_threshold: float,
+    iou_threshold: float,
+    top_k: int | None = None,
+) -> list[tuple]:
+    boxes, scores, class_ids = decode_outputs(outputs, confidence_threshold)
+    keep = nms(boxes, scores, class_ids, iou_threshold, top_k=top_k)
+    return [tuple(boxes[i]) for i in keep]
+
+
+def run_benchmark(
+    scenarios: dict[str, tuple[int, int]],
+    repeats: int = 20,
+    seed: int = 0,
+    confidence_threshold: float = CONFIDENCE_THRESHOLD,
+    iou_threshold: float = SCORE_THRESHOLD,
+) -> list[dict]:
+    """
+    Times both paths per scenario and checks the vectorized result against
+    the class-aware OpenCV reference.
+
+    Args:
+        scenarios: name -> (candidate anchors, objects)
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for name, (candidates, clusters) in scenarios.items():
+        outputs = synthetic_outputs(candidates, clusters, rng)
+        args = (outputs, confidence_threshold, iou_threshold)
+        vectorized = vectorized_decode_nms(*args)
+        results.append(
+            {
+                "scenario": name,
+                "candidates": candidates,
+                "kept": len(vectorized),
+                "legacy_ms": time_call(lambda: legacy_decode_nms(*args), repeats),
+                "vectorized_ms": time_call(
+                    lambda: vectorized_decode_nms(*args), repeats
+                ),
+                "equivalent": vectorized == batched_reference(*args),
+            }
+        )
+    return results
+
+
+SCENARIOS = {
+    "empty": (0, 1),
+    "one cat": (30, 1),
+    "busy": (500, 10),
+    "crowded": (4000, 60),
+    "worst case": (NUM_ANCHORS, 200),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark vectorized class-aware NMS against cv2.dnn.NMSBoxes"
+    )
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'scenario':<12}{'cands':>7}{'kept':>6}{'legacy ms':>11}"
+        f"{'vector ms':>11}{'speedup':>9}  equivalent"
+    )
+    for r in run_benchmark(SCENARIOS, repeats=args.repeats, seed=args.seed):
+        print(
+            f"{r['scenario']:<12}{r['candidates']:>7}{r['kept']:>6}"
+            f"{r['legacy_ms']:>11.2f}{r['vectorized_ms']:>11.2f}"
+            f"{r['legacy_ms'] / r['vectorized_ms']:>8.1f}x  {r['equivalent']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
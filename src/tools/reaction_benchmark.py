@@ -0,0 +1,402 @@
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from src.config import (
+    DETECTION_HOLD_TIME,
+    DETERRENT_DURATION,
+    FREQUENCY,
+    INPUT_SIZE,
+    PREPROCESS_MODE,
+)
+from src.decision import DeterrentController
+from src.deterrent._deterrent import Deterrent
+from src.loop import DetectionLoop
+from src.pipeline import Pipeline
+
+STAGES = ("capture", "inference", "hold", "activation", "total")
+
+
+@dataclass
+class Appearance:
+    start: float  # Seconds since the run started
+    end: float
+
+
+@dataclass
+class ReactionEvent:
+    appearance: Appearance
+    appeared_at: float = 0.0
+    inference_started: float | None = None
+    first_detected: float | None = None
+    activate_called: float | None = None
+    fired_at: float | None = None
+
+    @property
+    def fired(self) -> bool:
+        return self.fired_at is not None
+
+    def breakdown(self) -> dict[str, float]:
+        """
+        Splits the reaction time into consecutive stages that sum to 'total'.
+        """
+        assert self.fired, "Cat was never deterred"
+        return {
+            "capture": self.inference_started - self.appeared_at,  # type: ignore[operator]
+            "inference": self.first_detected - self.inference_started,  # type: ignore[operator]
+            "hold": self.activate_called - self.first_detected,  # type: ignore[operator]
+            "activation": self.fired_at - self.activate_called,  # type: ignore[operator]
+            "total": self.fired_at - self.appeared_at,  # type: ignore[operator]
+        }
+
+
+class SyntheticCatSource:
+    """
+    Camera stand-in that paints a bright cat-sized block while a cat is present.
+
+    Frames are captured on a fixed fps grid, so read() returns the latest
+    frame and its capture time, just like a camera with a one-frame buffer.
+    """
+
+    def __init__(
+        self,
+        appearances: list[Appearance],
+        fps: float = 30.0,
+        size: tuple[int, int] = (480, 640),
+        tail: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.appearances = appearances
+        self.fps = fps
+        self.duration = max((a.end for a in appearances), default=0.0) + tail
+        self._clock = clock
+        self.started_at = 0.0
+        height, width = size
+        self._empty = np.zeros((height, width, 3), dtype=np.uint8)
+        self._cat = self._empty.copy()
+        self._cat[height // 3 : 2 * height // 3, width // 3 : 2 * width // 3] = 255
+
+    def start(self) -> None:
+        self.started_at = self._clock()
+
+    def appearance_at(self, captured_at: float) -> Appearance | None:
+        elapsed = captured_at - self.started_at
+        for appearance in self.appearances:
+            if appearance.start <= elapsed < appearance.end:
+                return appearance
+        return None
+
+    def read(self) -> tuple[np.ndarray, float]:
+        elapsed = self._clock() - self.started_at
+        captured_at = self.started_at + math.floor(elapsed * self.fps) / self.fps
+        frame = self._cat if self.appearance_at(captured_at) else self._empty
+        return frame, captured_at
+
+    def release(self) -> None:
+        pass
+
+
+class VideoFrameSource(SyntheticCatSource):
+    """
+    Replays a recorded clip in real time, dropping frames the loop is too
+    slow for. Appearances are the known cat intervals in the clip.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        appearances: list[Appearance],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video {path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frames = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        super().__init__(appearances, fps=fps, size=(1, 1), tail=0.0, clock=clock)
+        self.duration = frames / fps
+        self._index = -1
+        self._frame = self._empty
+
+    def read(self) -> tuple[np.ndarray, float]:
+        elapsed = self._clock() - self.started_at
+        target = math.floor(elapsed * self.fps)
+        while self._index < target - 1 and self.cap.grab():
+            self._index += 1
+        ret, frame = self.cap.read()
+        if ret:
+            self._index += 1
+            self._frame = frame
+        return self._frame, self.started_at + self._index / self.fps
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class SourceCamera:
+    """
+    cv2.VideoCapture stand-in that copies source frames into the pipeline's
+    buffers, like a camera decoding into them, and remembers when each
+    buffer's frame was captured.
+    """
+
+    def __init__(self, source: SyntheticCatSource) -> None:
+        self.source = source
+        self.captured_at: dict[int, float] = {}
+
+    def read(self, image: np.ndarray | None = None) -> tuple[bool, np.ndarray]:
+        frame, captured_at = self.source.read()
+        if image is None or image.shape != frame.shape:
+            image = frame.copy()
+        else:
+            np.copyto(image, frame)
+        # A buffer is only read into again once the pipeline released it
+        self.captured_at[id(image)] = captured_at
+        return True, image
+
+    def release(self) -> None:
+        pass
+
+
+class BenchmarkLoop(DetectionLoop):
+    """
+    Detection loop that records when each appearance was first detected and
+    when the deterrent was asked to fire for it.
+    """
+
+    def __init__(
+        self,
+        source: SyntheticCatSource,
+        detect: Callable[[np.ndarray], dict],
+        deterrent: Deterrent,
+        controller: DeterrentController,
+        events: dict[int, ReactionEvent],
+        duration: float,
+    ) -> None:
+        super().__init__(
+            SourceCamera(source),
+            deterrent,
+            controller=controller,
+            duration=duration,
+            clock=time.monotonic,
+        )
+        # The detectors take raw frames
+        self._letterbox = False
+        self.source = source
+        self._detect = detect
+        self.events = events
+
+    def detect(self, frame: np.ndarray) -> dict:
+        captured_at = self.cap.captured_at[id(frame)]
+        inference_started = time.monotonic()
+        detection = self._detect(frame)
+        return {
+            **detection,
+            "captured_at": captured_at,
+            "inference_started": inference_started,
+        }
+
+    def decide(self, detection: dict, now: float) -> bool:
+        appearance = self.source.appearance_at(detection["captured_at"])
+        event = self.events[id(appearance)] if appearance else None
+        if event is not None and event.activate_called is None:
+            if detection["detected"] and self.controller.cat_detected_since is None:
+                event.inference_started = detection["inference_started"]
+                event.first_detected = now
+        fire = super().decide(detection, now)
+        if fire and event is not None and event.activate_called is None:
+            if event.first_detected is not None:
+                event.activate_called = time.monotonic()
+        return fire
+
+
+class InstrumentedDeterrent(Deterrent):
+    """
+    Stub deterrent that takes `latency` seconds to fire and records when it did.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.fired_at: list[float] = []
+
+    def setup(self):
+        pass
+
+    def activate(self, duration: float):
+        if self.latency:
+            time.sleep(self.latency)
+        self.fired_at.append(time.monotonic())
+
+    def cleanup(self):
+        pass
+
+
+def oracle_detector(inference_time: float = 0.0) -> Callable[[np.ndarray], dict]:
+    """
+    Returns a detector that sees the synthetic cat block, optionally taking
+    `inference_time` seconds per frame to mimic model cost.
+    """
+
+    def detect(frame: np.ndarray) -> dict:
+        if inference_time:
+            time.sleep(inference_time)
+        height, width = frame.shape[:2]
+        return {"detected": bool(frame[height // 2, width // 2, 0] > 128)}
+
+    return detect
+
+
+def model_detector() -> Callable[[np.ndarray], dict]:
+    """
+    Returns the production detector working on raw frames.
+    """
+    from src.detection.detector import detect_cat
+    from src.detection.preprocessing import BlobPreprocessor
+
+    preprocessor = BlobPreprocessor(input_size=INPUT_SIZE, mode=PREPROCESS_MODE)
+    return lambda frame: detect_cat(frame, preprocessor=preprocessor)
+
+
+def run_benchmark(
+    source: SyntheticCatSource,
+    detect: Callable[[np.ndarray], dict],
+    deterrent: InstrumentedDeterrent,
+    controller: DeterrentController,
+    frequency: float = FREQUENCY,
+    duration: float = DETERRENT_DURATION,
+) -> list[ReactionEvent]:
+    """
+    Runs the detection pipeline against the source and returns one event per
+    appearance. Activation time includes the hand-off to the deterrent stage.
+    """
+    events = {id(a): ReactionEvent(a) for a in source.appearances}
+    loop = BenchmarkLoop(source, detect, deterrent, controller, events, duration)
+    pipeline = Pipeline(
+        loop, frequency=frequency, report_interval=0, clock=time.monotonic
+    )
+
+    async def run() -> None:
+        source.start()
+        for event in events.values():
+            event.appeared_at = source.started_at + event.appearance.start
+        asyncio.get_running_loop().call_later(source.duration, pipeline.stop)
+        await pipeline.run()
+
+    asyncio.run(run())
+
+    # Activations run on their own stage, so match each to the next firing
+    for event in events.values():
+        if event.activate_called is not None:
+            i = bisect.bisect_left(deterrent.fired_at, event.activate_called)
+            if i < len(deterrent.fired_at):
+                event.fired_at = deterrent.fired_at[i]
+    return list(events.values())
+
+
+def summarize(events: list[ReactionEvent]) -> dict[str, dict[str, float]]:
+    """
+    Returns mean, p50, p90 and max per stage in milliseconds over fired events.
+    """
+    fired = [e.breakdown() for e in events if e.fired]
+    summary = {}
+    for stage in STAGES:
+        values = np.array([b[stage] for b in fired]) * 1000
+        summary[stage] = {
+            "mean": float(values.mean()) if values.size else math.nan,
+            "p50": float(np.percentile(values, 50)) if values.size else math.nan,
+            "p90": float(np.percentile(values, 90)) if values.size else math.nan,
+            "max": float(values.max()) if values.size else math.nan,
+        }
+    return summary
+
+
+def format_report(events: list[ReactionEvent]) -> str:
+    summary = summarize(events)
+    fired = sum(e.fired for e in events)
+    lines = [
+        f"Reaction time over {fired}/{len(events)} appearances (ms)",
+        f"{'stage':<12}{'mean':>9}{'p50':>9}{'p90':>9}{'max':>9}",
+    ]
+    for stage, stats in summary.items():
+        lines.append(
+            f"{stage:<12}"
+            + "".join(f"{stats[k]:>9.1f}" for k in ("mean", "p50", "p90", "max"))
+        )
+    return "\n".join(lines)
+
+
+def synthetic_appearances(
+    count: int, present: float, gap: float, fps: float, seed: int = 0
+) -> list[Appearance]:
+    """
+    Cats appear `count` times for `present` seconds, `gap` seconds apart, with
+    a random sub-frame offset so capture quantization is sampled evenly.
+    """
+    rng = random.Random(seed)
+    appearances = []
+    start = gap
+    for _ in range(count):
+        offset = rng.uniform(0, 1 / fps)
+        appearances.append(Appearance(start + offset, start + offset + present))
+        start += present + gap
+    return appearances
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure time from a cat appearing to the deterrent firing"
+    )
+    parser.add_argument("--appearances", type=int, default=5)
+    parser.add_argument("--present", type=float, default=3.0, help="Seconds per visit")
+    parser.add_argument("--gap", type=float, default=2.0, help="Seconds between visits")
+    parser.add_argument("--fps", type=float, default=30.0, help="Synthetic camera FPS")
+    parser.add_argument("--frequency", type=float, default=FREQUENCY)
+    parser.add_argument("--hold", type=float, default=DETECTION_HOLD_TIME)
+    parser.add_argument("--inference-ms", type=float, default=0.0)
+    parser.add_argument("--activation-ms", type=float, default=0.0)
+    parser.add_argument("--video", help="Recorded clip instead of synthetic frames")
+    parser.add_argument(
+        "--events", help="JSON list of [start, end] cat intervals in the clip"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.video:
+        if not args.events:
+            raise SystemExit("--events is required with --video")
+        with open(args.events) as f:
+            appearances = [Appearance(start, end) for start, end in json.load(f)]
+        source: SyntheticCatSource = VideoFrameSource(args.video, appearances)
+        detect = model_detector()
+    else:
+        appearances = synthetic_appearances(
+            args.appearances, args.present, args.gap, args.fps, seed=args.seed
+        )
+        source = SyntheticCatSource(appearances, fps=args.fps)
+        detect = oracle_detector(args.inference_ms / 1000)
+
+    deterrent = InstrumentedDeterrent(latency=args.activation_ms / 1000)
+    controller = DeterrentController(hold_time=args.hold)
+    try:
+        events = run_benchmark(
+            source, detect, deterrent, controller, frequency=args.frequency
+        )
+    finally:
+        source.release()
+    print(format_report(events))
+
+
+if __name__ == "__main__":
+    main()
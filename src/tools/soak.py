@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config import FREQUENCY, INPUT_SIZE, PREPROCESS_MODE
+from src.deterrent._deterrent import Deterrent
+
+MIB = 1024 * 1024
+
+
+class FakeCamera:
+    """
+    cv2.VideoCapture stand-in that serves a fixed frame at no cost.
+
+    Like OpenCV, read(image) decodes into `image` when it has the right
+    shape and allocates a new frame otherwise.
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        self._frame = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        self.reads = 0
+        self.allocations = 0
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self, image: np.ndarray | None = None) -> tuple[bool, np.ndarray]:
+        self.reads += 1
+        if image is None or image.shape != self._frame.shape:
+            self.allocations += 1
+            return True, self._frame.copy()
+        np.copyto(image, self._frame)
+        return True, image
+
+    def release(self) -> None:
+        pass
+
+
+class NullDeterrent(Deterrent):
+    def setup(self):
+        pass
+
+    def activate(self, duration: float):
+        pass
+
+    def cleanup(self):
+        pass
+
+
+class SimulatedClock:
+    """
+    Advances by `step` seconds per call, so thousands of loop passes cover
+    hours of simulated time without sleeping.
+    """
+
+    def __init__(self, step: float = FREQUENCY, start: float = 0.0) -> None:
+        self.step = step
+        self.now = start
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+@dataclass
+class SoakReport:
+    iterations: int
+    growth_per_iteration: float  # Traced bytes still alive per pass
+    peak_in_flight: int  # Most traced memory above the start, bytes
+    rss_start: int
+    rss_end: int
+
+    @property
+    def rss_growth(self) -> int:
+        return self.rss_end - self.rss_start
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size, or the peak where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and KiB elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_soak(
+    pipeline, iterations: int, warmup: int = 50, poll: float = 0.005
+) -> SoakReport:
+    """
+    Runs the pipeline until `iterations` frames have been through inference
+    after `warmup` frames and a first dropped frame, and measures memory
+    with tracemalloc and RSS.
+
+    Growth is the traced memory still alive at the end divided by the frames
+    processed. The transient peak is the highest traced memory above the
+    starting level at any point, so it covers everything in flight at once:
+    queued frames, executor futures and the model's buffers.
+    """
+    inference = pipeline.stats["inference"]
+    measured: dict[str, int] = {}
+
+    async def measure() -> None:
+        # The frame pool only stops growing once the queue has overflowed
+        while inference.items < warmup or inference.dropped == 0:
+            await asyncio.sleep(poll)
+        gc.collect()
+        tracemalloc.start()
+        measured["rss_start"] = rss_bytes()
+        measured["start"], _ = tracemalloc.get_traced_memory()
+        first = inference.items
+        while inference.items < first + iterations:
+            await asyncio.sleep(poll)
+        measured["frames"] = inference.items - first
+        gc.collect()
+        measured["end"], measured["peak"] = tracemalloc.get_traced_memory()
+        measured["rss_end"] = rss_bytes()
+        pipeline.stop()
+
+    async def soak() -> None:
+        monitor = asyncio.create_task(measure())
+        try:
+            await pipeline.run()
+        finally:
+            monitor.cancel()
+
+    try:
+        asyncio.run(soak())
+    finally:
+        tracemalloc.stop()
+
+    return SoakReport(
+        iterations=measured["frames"],
+        growth_per_iteration=(measured["end"] - measured["start"]) / measured["frames"],
+        peak_in_flight=measured["peak"] - measured["start"],
+        rss_start=measured["rss_start"],
+        rss_end=measured["rss_end"],
+    )
+
+
+def check_report(
+    report: SoakReport,
+    max_growth_per_iteration: float,
+    max_peak_in_flight: int,
+    max_rss_growth: int,
+) -> list[str]:
+    """
+    Returns a description of every limit the run exceeded.
+    """
+    failures = []
+    if report.growth_per_iteration > max_growth_per_iteration:
+        failures.append(
+            f"traced memory grew {report.growth_per_iteration:.1f} B/iteration "
+            f"(limit {max_growth_per_iteration:.1f})"
+        )
+    if report.peak_in_flight > max_peak_in_flight:
+        failures.append(
+            f"{report.peak_in_flight} B were in flight at once "
+            f"(limit {max_peak_in_flight})"
+        )
+    if report.rss_growth > max_rss_growth:
+        failures.append(
+            f"RSS grew {report.rss_growth / MIB:.1f} MiB "
+            f"(limit {max_rss_growth / MIB:.1f})"
+        )
+    return failures
+
+
+def build_loop(input_size: int = INPUT_SIZE, width: int = 640, height: int = 480):
+    """
+    The production loop with the fused preprocessor, a fake camera, a
+    no-op deterrent and a simulated clock.
+    """
+    from src.detection.preprocessing import BlobPreprocessor
+    from src.loop import DetectionLoop
+
+    return DetectionLoop(
+        FakeCamera(width, height),
+        NullDeterrent(),
+        preprocessor=BlobPreprocessor(input_size=input_size, mode=PREPROCESS_MODE),
+        clock=SimulatedClock(),
+    )
+
+
+def build_pipeline(
+    input_size: int = INPUT_SIZE,
+    width: int = 640,
+    height: int = 480,
+    frequency: float = 0.001,
+):
+    """
+    The production pipeline around build_loop(), reading as fast as it can
+    and deciding on a simulated clock.
+    """
+    from src.pipeline import Pipeline
+
+    return Pipeline(
+        build_loop(input_size, width, height),
+        frequency=frequency,
+        report_interval=0,
+        clock=SimulatedClock(),
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Soak-test the detection pipeline for memory growth"
+    )
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--input-size", type=int, default=INPUT_SIZE)
+    parser.add_argument(
+        "--max-growth", type=float, default=16.0, help="Bytes kept per frame"
+    )
+    parser.add_argument(
+        "--max-peak-mib", type=float, default=8.0, help="Transient MiB in flight"
+    )
+    parser.add_argument("--max-rss-mib", type=float, default=16.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pipeline = build_pipeline(input_size=args.input_size)
+    report = run_soak(pipeline, args.iterations, warmup=args.warmup)
+    print(
+        f"{report.iterations} frames: "
+        f"{report.growth_per_iteration:.1f} B kept/frame, "
+        f"peak {report.peak_in_flight / 1024:.0f} KiB in flight, "
+        f"RSS {report.rss_start / MIB:.1f} -> {report.rss_end / MIB:.1f} MiB"
+    )
+    failures = check_report(
+        report,
+        max_growth_per_iteration=args.max_growth,
+        max_peak_in_flight=int(args.max_peak_mib * MIB),
+        max_rss_growth=int(args.max_rss_mib * MIB),
+    )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
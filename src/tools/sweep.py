@@ -0,0 +1,403 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import cv2
+import numpy as np
+
+from src.config import (
+    CONFIDENCE_THRESHOLD,
+    FREQUENCY,
+    INPUT_SIZE,
+    NMS_MAX_DETECTIONS,
+    NMS_TOP_K,
+    PREPROCESS_MODE,
+    SCORE_THRESHOLD,
+)
+from src.models.autotune import pin_threads
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    input_size: int
+    mode: str
+    confidence_threshold: float
+    score_threshold: float
+    frequency: float
+
+
+@dataclass
+class SweepResult:
+    point: SweepPoint
+    latency_ms: float  # Mean per-frame detection latency
+    latency_p90_ms: float
+    precision: float  # Predicted cat events that overlap a labelled one
+    recall: float  # Labelled cat events hit at least once
+    samples: int
+    pareto: bool = False
+
+
+@dataclass
+class ChunkResult:
+    """
+    Per-frame results of one (input size, mode) over a slice of the video.
+    Columns of `latency` and `detected` follow the threshold pairs.
+    """
+
+    times: np.ndarray  # (F,) seconds into the video
+    latency: np.ndarray  # (F, T) seconds
+    detected: np.ndarray  # (F, T) bool
+
+
+def _init_worker(threads: int) -> None:
+    # One process per core, so keep OpenCV, and tuned models, from adding threads
+    pin_threads(threads)
+
+
+def evaluate_chunk(
+    video: str,
+    input_size: int,
+    mode: str,
+    thresholds: list[tuple[float, float]],
+    start: int,
+    stop: int,
+    stride: int = 1,
+) -> ChunkResult:
+    """
+    Runs the detector on frames [start, stop) of the video and records, for
+    every (confidence, IoU) pair, whether an interested class survived NMS
+    and how long the frame took.
+
+    The forward pass is shared by all pairs; each pair is charged for the
+    preprocessing and inference plus its own decode and NMS.
+    """
+    from src.detection.detector import INTERESTED_CLASS_IDS, get_model
+    from src.detection.nms import decode_outputs, nms
+    from src.detection.preprocessing import BlobPreprocessor
+
+    net = get_model(input_size)
+    preprocessor = BlobPreprocessor(input_size=input_size, mode=mode)
+
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {video}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    times, latencies, detections = [], [], []
+    try:
+        for index in range(start, stop):
+            if index % stride:
+                if not cap.grab():
+                    break
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            began = time.perf_counter()
+            blob, _, _, _ = preprocessor(frame)
+            net.setInput(blob)
+            outputs = net.forward()[0]
+            shared = time.perf_counter() - began
+
+            row_latency, row_detected = [], []
+            for confidence_threshold, score_threshold in thresholds:
+                began = time.perf_counter()
+                boxes, scores, class_ids = decode_outputs(outputs, confidence_threshold)
+                keep = nms(
+                    boxes,
+                    scores,
+                    class_ids,
+                    score_threshold,
+                    top_k=NMS_TOP_K,
+                    max_detections=NMS_MAX_DETECTIONS,
+                )
+                row_detected.append(
+                    bool(np.isin(class_ids[keep], INTERESTED_CLASS_IDS).any())
+                )
+                row_latency.append(shared + time.perf_counter() - began)
+
+            times.append(index / fps)
+            latencies.append(row_latency)
+            detections.append(row_detected)
+    finally:
+        cap.release()
+
+    count = len(thresholds)
+    return ChunkResult(
+        times=np.array(times, dtype=np.float64),
+        latency=np.array(latencies, dtype=np.float64).reshape(-1, count),
+        detected=np.array(detections, dtype=bool).reshape(-1, count),
+    )
+
+
+def simulate_loop(
+    times: np.ndarray,
+    latency: np.ndarray,
+    detected: np.ndarray,
+    frequency: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replays the pipeline over per-frame results: frames are captured every
+    `frequency` seconds and inference always takes the newest one, so a
+    detector slower than the capture interval looks at fewer frames.
+
+    Returns sample times, detected flags and latencies of the visited frames.
+    """
+    if times.size == 0:
+        empty = np.empty(0)
+        return empty, empty.astype(bool), empty
+    indices = []
+    t = times[0]
+    while t <= times[-1]:
+        i = max(0, int(np.searchsorted(times, t, side="right")) - 1)
+        indices.append(i)
+        t += max(latency[i], frequency)
+    visited = np.array(indices)
+    return times[visited], detected[visited], latency[visited]
+
+
+def score_events(
+    sample_times: np.ndarray,
+    hits: np.ndarray,
+    intervals: list[tuple[float, float]],
+) -> tuple[float, float]:
+    """
+    Event-level precision and recall.
+
+    A labelled interval is recalled if any positive sample falls inside it.
+    Runs of consecutive positive samples form predicted events, which are
+    true positives if any of their samples falls inside a labelled interval.
+    Precision is NaN when nothing was predicted.
+    """
+    inside = np.zeros(len(sample_times), dtype=bool)
+    recalled = 0
+    for start, end in intervals:
+        within = (sample_times >= start) & (sample_times < end)
+        inside |= within
+        recalled += bool((within & hits).any())
+    recall = recalled / len(intervals) if intervals else math.nan
+
+    # Label each run of consecutive hits, then check each run for a true hit
+    run_starts = hits & ~np.concatenate(([False], hits[:-1]))
+    run_ids = np.cumsum(run_starts)[hits]
+    predicted = int(run_starts.sum())
+    if predicted == 0:
+        return math.nan, recall
+    true_runs = np.unique(run_ids[inside[hits]])
+    return len(true_runs) / predicted, recall
+
+
+def pareto_front(results: list[SweepResult]) -> list[SweepResult]:
+    """
+    Marks and returns the results no other result beats on latency,
+    precision and recall at once. NaN scores count as zero.
+    """
+
+    def key(r: SweepResult) -> tuple[float, float, float]:
+        return (
+            r.latency_ms,
+            -np.nan_to_num(r.precision),
+            -np.nan_to_num(r.recall),
+        )
+
+    keys = [key(r) for r in results]
+    front = []
+    for r, k in zip(results, keys):
+        r.pareto = not any(
+            all(a <= b for a, b in zip(other, k)) and other != k for other in keys
+        )
+        if r.pareto:
+            front.append(r)
+    return sorted(front, key=lambda r: r.latency_ms)
+
+
+def run_sweep(
+    video: str,
+    intervals: list[tuple[float, float]],
+    input_sizes: list[int],
+    modes: list[str],
+    confidence_thresholds: list[float],
+    score_thresholds: list[float],
+    frequencies: list[float],
+    workers: int | None = None,
+    chunk_frames: int = 300,
+    stride: int = 1,
+    threads_per_worker: int = 1,
+) -> list[SweepResult]:
+    """
+    Evaluates every grid point on a labelled clip.
+
+    Each (input size, mode) pair runs the model once per frame, split into
+    chunks across a process pool. Thresholds and loop frequency are then
+    applied to the recorded outputs, so they add almost nothing to the run.
+
+    Args:
+        video: Path to the clip
+        intervals: Labelled (start, end) seconds when a cat is in view
+    """
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video {video}")
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    thresholds = list(itertools.product(confidence_thresholds, score_thresholds))
+    models = list(itertools.product(input_sizes, modes))
+    chunks = range(0, frame_count, chunk_frames)
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(threads_per_worker,),
+    ) as pool:
+        futures = {
+            (size, mode): [
+                pool.submit(
+                    evaluate_chunk,
+                    video,
+                    size,
+                    mode,
+                    thresholds,
+                    start,
+                    min(start + chunk_frames, frame_count),
+                    stride,
+                )
+                for start in chunks
+            ]
+            for size, mode in models
+        }
+        merged = {}
+        for model, parts in futures.items():
+            done = [f.result() for f in parts]
+            merged[model] = ChunkResult(
+                times=np.concatenate([c.times for c in done]),
+                latency=np.concatenate([c.latency for c in done]),
+                detected=np.concatenate([c.detected for c in done]),
+            )
+
+    results = []
+    for (size, mode), chunk in merged.items():
+        for t, (confidence, score) in enumerate(thresholds):
+            for frequency in frequencies:
+                sample_times, hits, latency = simulate_loop(
+                    chunk.times, chunk.latency[:, t], chunk.detected[:, t], frequency
+                )
+                precision, recall = score_events(sample_times, hits, intervals)
+                latency_ms = latency * 1000
+                results.append(
+                    SweepResult(
+                        point=SweepPoint(size, mode, confidence, score, frequency),
+                        latency_ms=float(latency_ms.mean()) if latency.size else 0.0,
+                        latency_p90_ms=(
+                            float(np.percentile(latency_ms, 90))
+                            if latency.size
+                            else 0.0
+                        ),
+                        precision=precision,
+                        recall=recall,
+                        samples=len(sample_times),
+                    )
+                )
+    pareto_front(results)
+    return results
+
+
+def format_table(results: list[SweepResult]) -> str:
+    lines = [
+        f"{'size':>5} {'mode':<5}{'conf':>6}{'iou':>6}{'freq':>7}"
+        f"{'lat ms':>9}{'p90 ms':>9}{'prec':>7}{'recall':>8}{'frames':>8}  pareto"
+    ]
+    for r in sorted(results, key=lambda r: r.latency_ms):
+        p = r.point
+        lines.append(
+            f"{p.input_size:>5} {p.mode:<5}{p.confidence_threshold:>6.2f}"
+            f"{p.score_threshold:>6.2f}{p.frequency:>7.2f}"
+            f"{r.latency_ms:>9.1f}{r.latency_p90_ms:>9.1f}"
+            f"{r.precision:>7.2f}{r.recall:>8.2f}{r.samples:>8}"
+            f"  {'*' if r.pareto else ''}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(results: list[SweepResult], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        fields = list(asdict(results[0].point)) if results else []
+        writer.writerow(
+            fields
+            + ["latency_ms", "latency_p90_ms", "precision", "recall", "samples"]
+            + ["pareto"]
+        )
+        for r in results:
+            writer.writerow(
+                list(asdict(r.point).values())
+                + [r.latency_ms, r.latency_p90_ms, r.precision, r.recall, r.samples]
+                + [r.pareto]
+            )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Sweep detector settings over labelled footage"
+    )
+    parser.add_argument("video", help="Recorded clip")
+    parser.add_argument(
+        "events", help="JSON list of [start, end] cat intervals in the clip"
+    )
+    parser.add_argument("--input-size", type=int, nargs="+", default=[INPUT_SIZE])
+    parser.add_argument(
+        "--mode", nargs="+", choices=["pad", "crop"], default=[PREPROCESS_MODE]
+    )
+    parser.add_argument(
+        "--confidence", type=float, nargs="+", default=[CONFIDENCE_THRESHOLD]
+    )
+    parser.add_argument(
+        "--iou", type=float, nargs="+", default=[SCORE_THRESHOLD], help="NMS IoU"
+    )
+    parser.add_argument("--frequency", type=float, nargs="+", default=[FREQUENCY])
+    parser.add_argument("--workers", type=int, help="Processes, default all cores")
+    parser.add_argument(
+        "--threads-per-worker", type=int, default=1, help="OpenCV threads per process"
+    )
+    parser.add_argument("--chunk", type=int, default=300, help="Frames per task")
+    parser.add_argument("--stride", type=int, default=1, help="Use every Nth frame")
+    parser.add_argument("--csv", help="Also write all results to this CSV file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with open(args.events) as f:
+        intervals = [(start, end) for start, end in json.load(f)]
+
+    results = run_sweep(
+        args.video,
+        intervals,
+        input_sizes=args.input_size,
+        modes=args.mode,
+        confidence_thresholds=args.confidence,
+        score_thresholds=args.iou,
+        frequencies=args.frequency,
+        workers=args.workers,
+        chunk_frames=args.chunk,
+        stride=args.stride,
+        threads_per_worker=args.threads_per_worker,
+    )
+    print(format_table(results))
+    print()
+    print("Pareto front (latency vs precision/recall):")
+    print(format_table(pareto_front(results)))
+    if args.csv:
+        write_csv(results, args.csv)
+
+
+if __name__ == "__main__":
+    main()
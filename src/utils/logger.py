@@ -1,19 +1,123 @@
-from loguru import logger
 import sys
+import threading
+import time
+from collections.abc import Callable, Hashable
 
-logger.remove()
+from loguru import logger
 
-# Info and below -> stdout
-logger.add(
-    sys.stdout,
-    level="DEBUG",
-    filter=lambda record: record["level"].no < 40,
-    format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>",
+from src.config import (
+    LOG_ENQUEUE,
+    LOG_JSON_PATH,
+    LOG_LEVEL,
+    LOG_RATE_LIMIT,
+    LOG_RETENTION,
+    LOG_ROTATION,
+    LOG_SAMPLE_EVERY,
 )
 
-# Errors and above -> stderr
-logger.add(
-    sys.stderr,
-    level="ERROR",
-    format="<red>{time:HH:mm:ss}</red> | <level>{message}</level>",
-)
+_min_level_no: int = 0
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    json_path: str | None = LOG_JSON_PATH,
+    rotation: str = LOG_ROTATION,
+    retention: int = LOG_RETENTION,
+    enqueue: bool = LOG_ENQUEUE,
+) -> None:
+    """
+    (Re)configures the logger sinks.
+
+    With enqueue=True every sink is fed through a queue and written from a
+    background thread, so the caller never blocks on terminal or disk I/O.
+    Call logger.complete() before exiting to flush pending messages.
+    """
+    global _min_level_no
+    logger.remove()
+
+    # Info and below -> stdout
+    logger.add(
+        sys.stdout,
+        level=level,
+        filter=lambda record: record["level"].no < 40,
+        format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>",
+        enqueue=enqueue,
+    )
+
+    # Errors and above -> stderr
+    logger.add(
+        sys.stderr,
+        level="ERROR",
+        format="<red>{time:HH:mm:ss}</red> | <level>{message}</level>",
+        enqueue=enqueue,
+    )
+
+    # Optional structured log, one JSON object per line
+    if json_path:
+        logger.add(
+            json_path,
+            level=level,
+            serialize=True,
+            rotation=rotation,
+            retention=retention,
+            enqueue=enqueue,
+        )
+
+    _min_level_no = logger.level(level).no
+
+
+def debug_enabled() -> bool:
+    """
+    Returns True if DEBUG messages reach any sink. Cheap enough for hot paths.
+    """
+    return _min_level_no <= 10
+
+
+class RateLimiter:
+    """
+    Per-key gate for log messages emitted on every frame.
+
+    A key passes at most once every `interval` seconds and, when `sample` > 1,
+    only on every `sample`-th call. Dropped calls are counted per key.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOG_RATE_LIMIT,
+        sample: int = LOG_SAMPLE_EVERY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.sample = max(1, sample)
+        self._clock = clock
+        self._last: dict[Hashable, float] = {}
+        self._calls: dict[Hashable, int] = {}
+        self.suppressed: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Returns True if a message for `key` should be logged now.
+        """
+        with self._lock:
+            calls = self._calls.get(key, 0) + 1
+            self._calls[key] = calls
+            now = self._clock()
+            last = self._last.get(key)
+            if calls % self.sample == 0 and (
+                last is None or now - last >= self.interval
+            ):
+                self._last[key] = now
+                return True
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._last.clear()
+            self._calls.clear()
+            self.suppressed.clear()
+
+
+configure_logging()
+rate_limiter = RateLimiter()
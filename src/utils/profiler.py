@@ -0,0 +1,228 @@
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from src.config import PROFILE_DIR, PROFILE_DURATION, PROFILE_INTERVAL, PROFILE_TOP
+from src.utils.logger import logger
+
+# Pipeline executor threads are named "<stage>_<n>"; the event loop runs
+# decision and display on the main thread
+MAIN_STAGE = "main"
+
+# Leaf frames of a thread that is waiting for work rather than doing any
+IDLE_LEAVES = {
+    ("thread.py", "_worker"),
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("threading.py", "Thread.join"),
+    ("queue.py", "Queue.get"),
+}
+
+Stack = tuple[str, ...]
+
+
+def stage_of(thread_name: str) -> str:
+    """
+    Maps a thread name to the pipeline stage it serves.
+    """
+    if thread_name == "MainThread":
+        return MAIN_STAGE
+    return re.sub(r"_\d+$", "", thread_name)
+
+
+def frame_label(code) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_qualname}"
+
+
+def is_idle(stack: Stack) -> bool:
+    leaf = stack[-1]
+    filename, _, name = leaf.partition(":")
+    return (filename, name) in IDLE_LEAVES or (
+        filename == "selectors.py" and name.endswith(".select")
+    )
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the Python stack of every thread and attributes the
+    samples to pipeline stages by thread name.
+
+    Nothing runs while stopped; once started, a single daemon thread samples
+    for `duration` seconds and then writes the stacks in collapsed format
+    (one "stage;outer;...;inner count" line each, readable by flamegraph.pl
+    and speedscope) together with a per-stage summary of the top functions.
+    """
+
+    def __init__(
+        self,
+        duration: float = PROFILE_DURATION,
+        interval: float = PROFILE_INTERVAL,
+        output_dir: str = PROFILE_DIR,
+        top: int = PROFILE_TOP,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            duration: Seconds to sample before writing the results
+            interval: Seconds between samples
+            top: Functions listed per stage in the summary
+        """
+        self.duration = duration
+        self.interval = interval
+        self.output_dir = output_dir
+        self.top = top
+        self._clock = clock
+        self.stacks: Counter[tuple[str, Stack]] = Counter()
+        self.idle: Counter[str] = Counter()
+        self.samples = 0
+        self.started_at: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float | None = None) -> bool:
+        """
+        Starts a profiling window. Returns False if one is already running.
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self.stacks.clear()
+            self.idle.clear()
+            self.samples = 0
+            self.started_at = self._clock()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self.duration if duration is None else duration,),
+                name="profiler",
+                daemon=True,
+            )
+            self._thread.start()
+        logger.info(
+            "Profiling for {:.0f}s every {:.0f} ms",
+            self.duration if duration is None else duration,
+            1000 * self.interval,
+        )
+        return True
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Ends the current window early; its results are still written.
+        """
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def toggle(self) -> None:
+        if self.running:
+            # Called from signal handlers, so leave the writing to the thread
+            self.stop(wait=False)
+        else:
+            self.start()
+
+    def install_signal(self, signum: int | None = None) -> bool:
+        """
+        Toggles profiling whenever the process receives `signum`, SIGUSR1 by
+        default. Returns False where the signal does not exist (Windows).
+        """
+        signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+        if signum is None:
+            logger.warning("No SIGUSR1 on this platform, profiling toggle disabled")
+            return False
+        signal.signal(signum, lambda *_: self.toggle())
+        logger.debug("Send signal {} to toggle profiling", signum)
+        return True
+
+    def sample(self) -> None:
+        """
+        Records the current stack of every thread except the profiler's own.
+        """
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            stack = tuple(reversed(labels))
+            stage = stage_of(names.get(ident, str(ident)))
+            if is_idle(stack):
+                self.idle[stage] += 1
+            else:
+                self.stacks[(stage, stack)] += 1
+        self.samples += 1
+
+    def _run(self, duration: float) -> None:
+        deadline = time.monotonic() + duration
+        try:
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                self.sample()
+                self._stop.wait(self.interval)
+            self.write()
+        except Exception as e:
+            logger.error("Profiler failed: {}", e)
+
+    def summary(self) -> str:
+        """
+        Top functions per stage by cumulative samples, i.e. time spent in the
+        function or anything it called, and by self samples.
+        """
+        stages: dict[str, Counter[Stack]] = {}
+        for (stage, stack), count in self.stacks.items():
+            stages.setdefault(stage, Counter())[stack] = count
+
+        lines = [
+            f"{self.samples} samples every {1000 * self.interval:.0f} ms",
+            "",
+        ]
+        for stage in sorted(stages.keys() | self.idle.keys()):
+            stacks = stages.get(stage, Counter())
+            busy = sum(stacks.values())
+            idle = self.idle[stage]
+            total = busy + idle
+            lines.append(
+                f"== {stage}: {busy} busy / {total} samples "
+                f"({busy / total if total else 0:.0%} busy)"
+            )
+            cumulative: Counter[str] = Counter()
+            own: Counter[str] = Counter()
+            for stack, count in stacks.items():
+                # Count recursive functions once per stack
+                for label in set(stack):
+                    cumulative[label] += count
+                own[stack[-1]] += count
+            lines.append(f"{'cum %':>7}{'self %':>8}  function")
+            for label, count in cumulative.most_common(self.top):
+                lines.append(f"{count / busy:>7.1%}{own[label] / busy:>8.1%}  {label}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self) -> tuple[Path, Path]:
+        """
+        Writes the collapsed stacks and the summary. Returns both paths.
+        """
+        directory = Path(self.output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime(
+            "%Y%m%d-%H%M%S", time.localtime(self.started_at or self._clock())
+        )
+        stacks_path = directory / f"profile-{stamp}.folded"
+        summary_path = directory / f"profile-{stamp}.txt"
+        with open(stacks_path, "w") as f:
+            for (stage, stack), count in sorted(self.stacks.items()):
+                f.write(f"{';'.join((stage, *stack))} {count}\n")
+        summary_path.write_text(self.summary())
+        logger.info("Wrote profile to {} and {}", stacks_path, summary_path)
+        return stacks_path, summary_path
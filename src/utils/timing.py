@@ -0,0 +1,16 @@
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+
+def time_call(func: Callable[[], object], repeats: int) -> float:
+    """
+    Returns the median wall time of `repeats` calls in milliseconds.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return 1000 * float(np.median(times))
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
-from src.detection.camera import get_camera, read_frame
+from src.detection.camera import get_camera, read_frame, configure_capture
 import cv2
 
 
@@ -37,6 +37,15 @@ def test_read_frame(mock_camera, monkeypatch):
     assert frame == "mock_frame"
 
 
+def test_read_frame_into_buffer(mock_camera):
+    """Test read_frame passes the previous frame to the capture to reuse."""
+    buffer = MagicMock()
+    mock_camera.read.return_value = (True, buffer)
+    frame = read_frame(mock_camera, preprocess=False, out=buffer)
+    mock_camera.read.assert_called_once_with(buffer)
+    assert frame is buffer
+
+
 def test_read_frame_error(mock_camera):
     """Test read_frame raises RuntimeError if frame cannot be read."""
     mock_camera.read.return_value = (False, None)
@@ -58,3 +67,50 @@ def test_read_frame_preprocess(monkeypatch, mock_camera):
     monkeypatch.setattr("src.detection.camera.letterbox_image", fake_letterbox_image)
     frame = read_frame(mock_camera, input_size=640, preprocess=True)
     assert frame == "processed_frame"
+
+
+def _fake_capture(accepted: dict):
+    """Capture mock that stores set() values the driver 'accepts'."""
+    props: dict = {}
+    cap = MagicMock(spec=cv2.VideoCapture)
+    cap.isOpened.return_value = True
+
+    def fake_set(prop, value):
+        if prop in accepted:
+            props[prop] = accepted[prop]
+        else:
+            props[prop] = value
+        return True
+
+    cap.set.side_effect = fake_set
+    cap.get.side_effect = lambda prop: props.get(prop, 0.0)
+    return cap
+
+
+def test_configure_capture_applied(monkeypatch):
+    """Test requested capture properties are set and read back."""
+    cap = _fake_capture({})
+    monkeypatch.setattr(cv2, "VideoCapture", lambda index: cap)
+    get_camera(width=640, height=480, fps=30, fourcc="MJPG", buffer_size=1)
+    cap.set.assert_any_call(cv2.CAP_PROP_BUFFERSIZE, 1)
+    actual = configure_capture(cap)
+    assert actual == {
+        "width": 640,
+        "height": 480,
+        "fps": 30.0,
+        "fourcc": "MJPG",
+        "buffer_size": 1,
+    }
+
+
+def test_configure_capture_rejected(monkeypatch):
+    """Test properties the driver ignores are reported with actual values."""
+    warnings = []
+    cap = _fake_capture({cv2.CAP_PROP_FRAME_WIDTH: 1920, cv2.CAP_PROP_BUFFERSIZE: 4})
+    monkeypatch.setattr(
+        "src.detection.camera.logger.warning", lambda *args: warnings.append(args)
+    )
+    actual = configure_capture(cap, width=640, buffer_size=1)
+    assert actual["width"] == 1920
+    assert actual["buffer_size"] == 4
+    assert [w[1] for w in warnings] == ["width", "buffer_size"]
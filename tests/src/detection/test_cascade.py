@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+from src.detection.cascade import ResolutionCascade
+
+
+@pytest.fixture
+def raw_frame():
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def clock():
+    now = [0.0]
+    return now
+
+
+def _fake_detect(monkeypatch, responses, calls):
+    def fake_detect_blob(blob, confidence_threshold=None):
+        size = blob.shape[2]
+        calls.append(size)
+        return [dict(d) for d in responses.get(size, [])]
+
+    def fake_detect_blob_any(blob, confidence_threshold=None):
+        return any(d["label"] == "cat" for d in fake_detect_blob(blob))
+
+    monkeypatch.setattr("src.detection.detector.detect_blob", fake_detect_blob)
+    monkeypatch.setattr("src.detection.detector.detect_blob_any", fake_detect_blob_any)
+
+
+def _cat(score=0.9):
+    return {"bbox": (0, 80, 10, 90), "class_id": 15, "label": "cat", "score": score}
+
+
+def test_cascade_idle_stays_low(raw_frame, clock, monkeypatch):
+    calls = []
+    _fake_detect(monkeypatch, {}, calls)
+    cascade = ResolutionCascade(low_size=320, high_size=640, clock=lambda: clock[0])
+    result = cascade.detect(raw_frame)
+    assert result == {"detected": False}
+    assert calls == [320]
+    assert cascade.report()[320]["frames"] == 1
+    assert cascade.report()[640]["frames"] == 0
+
+
+def test_cascade_escalates_and_holds(raw_frame, clock, monkeypatch):
+    calls = []
+    responses = {320: [_cat(0.3)], 640: [_cat()]}
+    _fake_detect(monkeypatch, responses, calls)
+    cascade = ResolutionCascade(
+        low_size=320, high_size=640, hold_time=1.0, clock=lambda: clock[0]
+    )
+    result = cascade.detect(raw_frame, debug=True)
+    assert result["detected"]
+    assert calls == [320, 640]
+    # Boxes are mapped back to raw frame coordinates
+    assert result["detections"][0]["bbox"] == (0, 0, 10, 10)
+
+    # Within the hold window the low tier is skipped
+    clock[0] = 0.5
+    responses[640] = []
+    cascade.detect(raw_frame)
+    assert calls == [320, 640, 640]
+
+    # After the hold window without confirmation it drops back to low
+    clock[0] = 2.0
+    responses[320] = []
+    cascade.detect(raw_frame)
+    assert calls == [320, 640, 640, 320]
+
+
+def test_cascade_log_report(raw_frame, monkeypatch):
+    _fake_detect(monkeypatch, {}, [])
+    cascade = ResolutionCascade(low_size=320, high_size=640)
+    cascade.detect(raw_frame)
+    cascade.log_report()
+    report = cascade.report()
+    assert report[320]["share"] == pytest.approx(1.0)
@@ -111,3 +111,112 @@ def test_debug_draw_with_detection(monkeypatch, dummy_frame):
         {"detections": [{"bbox": (1, 2, 3, 4), "label": "cat", "score": 0.9}]},
     )
     assert called["rectangle"] and called["putText"]
+
+
+def test_get_model_caches_variants(monkeypatch):
+    import src.detection.detector as detector_mod
+
+    loaded = []
+    monkeypatch.setattr(detector_mod, "_models", {})
+    monkeypatch.setattr(
+        detector_mod, "load_model", lambda size: loaded.append(size) or MagicMock()
+    )
+    assert detector_mod.get_model(640) is detector_mod.model
+    small = detector_mod.get_model(320)
+    assert detector_mod.get_model(320) is small
+    assert loaded == [320]
+
+
+def test_detect_cat_with_preprocessor(monkeypatch):
+    """Test raw frames are preprocessed and boxes mapped back to frame coordinates."""
+    from src.detection.preprocessing import BlobPreprocessor
+
+    seen = []
+
+    def fake_detect_blob(blob):
+        seen.append(blob.shape)
+        return [
+            {"bbox": (0, 80, 320, 560), "class_id": 15, "label": "cat", "score": 0.9}
+        ]
+
+    monkeypatch.setattr("src.detection.detector.detect_blob", fake_detect_blob)
+    raw = np.zeros((480, 640, 3), dtype=np.uint8)
+    result = detect_cat(raw, debug=True, preprocessor=BlobPreprocessor(640))
+    assert seen == [(1, 3, 640, 640)]
+    assert result["detected"] is True
+    assert result["detections"][0]["bbox"] == (0, 0, 320, 480)
+
+
+def test_detect_blob_matches_detect_objects(dummy_frame):
+    """Test both entry points produce the same detections on the real model."""
+    import cv2
+    from src.detection.detector import detect_blob
+
+    blob = cv2.dnn.blobFromImage(dummy_frame, 1 / 255.0, (640, 640), swapRB=True)
+    assert detect_blob(blob) == detect_objects(dummy_frame)
+
+
+def test_interested_present_matches_full_decode():
+    """Test the boolean fast path agrees with the full decode below the NMS caps."""
+    from src.config import INTERESTED_CLASSES
+    from src.detection.detector import (
+        CAT_CLASS_ID,
+        interested_present,
+        postprocess_outputs,
+    )
+
+    rng = np.random.default_rng(0)
+    agreed = {True: 0, False: 0}
+    for _ in range(200):
+        outputs = np.empty((84, 300), dtype=np.float32)
+        outputs[:2] = rng.uniform(0, 640, (2, 300))
+        outputs[2:4] = rng.uniform(5, 200, (2, 300))
+        outputs[4:] = rng.uniform(0, 0.5, (80, 300)) ** 3
+        # Cat candidates, some beaten by another class on the same anchor
+        anchors = rng.choice(300, rng.integers(0, 4), replace=False)
+        outputs[4 + CAT_CLASS_ID, anchors] = rng.uniform(0.3, 0.9, anchors.size)
+        outputs[4 + 16, anchors[::2]] = rng.uniform(0.3, 0.9, anchors[::2].size)
+        for threshold in (0.25, 0.5):
+            expected = any(
+                d["label"] in INTERESTED_CLASSES
+                for d in postprocess_outputs(outputs, threshold, 0.45)
+            )
+            assert interested_present(outputs, threshold) == expected
+            agreed[expected] += 1
+    assert agreed[True] and agreed[False]
+
+
+def test_interested_present_ignores_nms_caps(monkeypatch):
+    """Test a cat the capped full decode drops in a crowd is still reported."""
+    import src.detection.detector as detector_mod
+    from src.detection.detector import (
+        CAT_CLASS_ID,
+        interested_present,
+        postprocess_outputs,
+    )
+
+    monkeypatch.setattr(detector_mod, "NMS_TOP_K", 20)
+    monkeypatch.setattr(detector_mod, "NMS_MAX_DETECTIONS", 10)
+    outputs = np.zeros((84, 30), dtype=np.float32)
+    # Thirty separate people, all more confident than the cat on the last anchor
+    outputs[0] = np.arange(30) * 30 + 10
+    outputs[1] = 20
+    outputs[2:4] = 20
+    outputs[4, :29] = 0.9
+    outputs[4 + CAT_CLASS_ID, 29] = 0.6
+    labels = [d["label"] for d in postprocess_outputs(outputs, 0.5, 0.45)]
+    assert labels == ["person"] * 10
+    assert interested_present(outputs, 0.5)
+
+    monkeypatch.setattr(detector_mod, "NMS_TOP_K", None)
+    monkeypatch.setattr(detector_mod, "NMS_MAX_DETECTIONS", None)
+    labels = [d["label"] for d in postprocess_outputs(outputs, 0.5, 0.45)]
+    assert "cat" in labels
+
+
+def test_detect_cat_without_debug_skips_decoding(dummy_frame, monkeypatch):
+    """Test boxes are not decoded when nobody asks for them."""
+    import src.detection.detector as detector_mod
+
+    monkeypatch.setattr(detector_mod, "postprocess_outputs", None)
+    assert detect_cat(dummy_frame) == {"detected": False}
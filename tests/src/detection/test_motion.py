@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from src.detection import motion as motion_mod
+from src.detection.motion import MotionCropDetector, expand_box, merge_boxes
+
+
+def _background():
+    return np.full((480, 640, 3), 60, dtype=np.uint8)
+
+
+def _with_square(x, y, size=40):
+    frame = _background()
+    frame[y : y + size, x : x + size] = 255
+    return frame
+
+
+@pytest.fixture
+def fake_detector(monkeypatch):
+    """Fake detector that finds a cat in the middle of every image it gets."""
+    calls = []
+
+    def detect_objects(image):
+        size = image.shape[0]
+        calls.append(("boxes", size))
+        c = size // 2
+        return [
+            {
+                "bbox": (c - 10, c - 10, c + 10, c + 10),
+                "class_id": 15,
+                "label": "cat",
+                "score": 0.9,
+            }
+        ]
+
+    def detect_any(image):
+        calls.append(("any", image.shape[0]))
+        return True
+
+    monkeypatch.setattr(motion_mod.detector, "detect_objects", detect_objects)
+    monkeypatch.setattr(motion_mod.detector, "detect_any", detect_any)
+    return calls
+
+
+def _warmed_up(**kwargs):
+    detector = MotionCropDetector(
+        crop_size=320, full_size=640, refresh_frames=0, **kwargs
+    )
+    for _ in range(5):
+        detector.crops(_background())
+    return detector
+
+
+def test_expand_box_grows_and_clips():
+    assert expand_box((100, 100, 140, 120), 0.5, 0, 640, 480) == (80, 80, 160, 140)
+    assert expand_box((0, 0, 10, 10), 0.0, 100, 640, 480) == (0, 0, 55, 55)
+
+
+def test_merge_boxes():
+    overlapping = [(0, 0, 50, 50), (40, 40, 100, 100), (300, 300, 310, 310)]
+    assert merge_boxes(overlapping, 3) == [(0, 0, 100, 100), (300, 300, 310, 310)]
+    # Over the limit, the closest pair is merged first
+    apart = [(0, 0, 10, 10), (20, 0, 30, 10), (400, 400, 410, 410)]
+    assert merge_boxes(apart, 2) == [(0, 0, 30, 10), (400, 400, 410, 410)]
+    assert len(merge_boxes(apart, 1)) == 1
+
+
+def test_still_frames_skip_inference(fake_detector):
+    detector = _warmed_up()
+    assert detector.detect(_background(), debug=True) == {
+        "detected": False,
+        "detections": [],
+    }
+    assert fake_detector == []
+    assert detector.stats.still_frames == 1
+
+
+def test_crop_boxes_map_back_to_frame(fake_detector):
+    detector = _warmed_up(margin=0.0, min_crop=0)
+    result = detector.detect(_with_square(580, 200), debug=True)
+    assert fake_detector == [("boxes", 320)]
+    (crop,) = detector.last_crops
+    x1, y1, x2, y2 = crop
+    assert 570 <= x1 <= 580 and x2 == 620 and 190 <= y1 <= 200 <= y2 - 40
+    # The fake cat sits in the middle of the crop
+    (cat,) = result["detections"]
+    cx, cy = (
+        (cat["bbox"][0] + cat["bbox"][2]) / 2,
+        (cat["bbox"][1] + cat["bbox"][3]) / 2,
+    )
+    assert cx == pytest.approx((x1 + x2) / 2, abs=2)
+    assert cy == pytest.approx((y1 + y2) / 2, abs=2)
+    assert detector.stats.crop_frames == 1
+    assert detector.stats.crops == 1
+
+
+def test_detection_keeps_full_frame_until_cat_leaves(fake_detector):
+    detector = _warmed_up()
+    assert detector.detect(_with_square(100, 100))["detected"]
+    # A cat that stopped moving is still checked on the full frame
+    detector.detect(_background())
+    assert fake_detector == [("any", 320), ("any", 640)]
+    assert detector.stats.full_frames == 1
+
+
+def test_periodic_full_frame_refresh(fake_detector, monkeypatch):
+    monkeypatch.setattr(motion_mod.detector, "detect_any", lambda image: False)
+    detector = MotionCropDetector(refresh_frames=3)
+    for _ in range(6):
+        detector.detect(_background())
+    assert detector.stats.full_frames == 2
+    assert detector.stats.still_frames == 4
+
+
+def test_large_motion_runs_full_frame(fake_detector):
+    detector = _warmed_up()
+    frame = _background()
+    frame[:, :400] = 200
+    detector.detect(frame)
+    assert fake_detector == [("any", 640)]
+
+
+def test_log_report(fake_detector):
+    detector = _warmed_up()
+    detector.detect(_with_square(300, 300), debug=True)
+    detector.log_report()
+    assert detector.stats.crop_mean_ms >= 0
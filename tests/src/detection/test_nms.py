@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+from src.detection.nms import decode_outputs, nms
+from src.tools.nms_benchmark import (
+    batched_reference,
+    legacy_decode_nms,
+    synthetic_outputs,
+    vectorized_decode_nms,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(42)
+
+
+def test_decode_outputs():
+    outputs = np.array(
+        [
+            [10, 30],  # cx
+            [10, 30],  # cy
+            [20, 40],  # w
+            [20, 40],  # h
+            [0.1, 0.1],  # class 0 score
+            [0.2, 0.2],  # class 1 score
+            [0.9, 0.3],  # class 2 score
+        ],
+        dtype=np.float32,
+    )
+    boxes, scores, class_ids = decode_outputs(outputs, 0.5)
+    assert boxes.tolist() == [[0, 0, 20, 20]]
+    assert scores.tolist() == pytest.approx([0.9])
+    assert class_ids.tolist() == [2]
+
+
+@pytest.mark.parametrize("candidates,clusters", [(30, 1), (500, 10), (4000, 60)])
+def test_nms_matches_opencv_batched(rng, candidates, clusters):
+    outputs = synthetic_outputs(candidates, clusters, rng)
+    assert vectorized_decode_nms(outputs, 0.5, 0.4) == batched_reference(
+        outputs, 0.5, 0.4
+    )
+
+
+def test_nms_single_class_matches_nmsboxes(rng):
+    """With one class, class-aware NMS equals the previous class-agnostic path."""
+    outputs = synthetic_outputs(1000, 15, rng)
+    outputs[5:] = 0.0
+    outputs[4] = np.where(outputs[0] != 0, rng.uniform(0.5, 1.0, 8400), 0.1)
+    assert vectorized_decode_nms(outputs, 0.5, 0.4) == legacy_decode_nms(
+        outputs, 0.5, 0.4
+    )
+
+
+def test_nms_is_class_aware():
+    boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [1, 1, 10, 10]])
+    scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+    class_ids = np.array([0, 1, 0])
+    assert nms(boxes, scores, class_ids, 0.4).tolist() == [0, 1]
+
+
+def test_nms_top_k_and_max_detections():
+    boxes = np.array([[i * 20, 0, i * 20 + 10, 10] for i in range(5)])
+    scores = np.array([0.5, 0.9, 0.7, 0.6, 0.8], dtype=np.float32)
+    class_ids = np.zeros(5, dtype=np.int64)
+    assert nms(boxes, scores, class_ids, 0.4).tolist() == [1, 4, 2, 3, 0]
+    assert nms(boxes, scores, class_ids, 0.4, top_k=2).tolist() == [1, 4]
+    assert nms(boxes, scores, class_ids, 0.4, max_detections=3).tolist() == [1, 4, 2]
+
+
+def test_nms_empty():
+    empty = np.empty((0, 4), dtype=np.int32)
+    assert nms(empty, np.empty(0), np.empty(0), 0.4).size == 0
+
+
+def test_nms_negative_coordinates_stay_class_separated():
+    boxes = np.array([[-50, -50, 0, 0], [-50, -50, 0, 0]])
+    scores = np.array([0.9, 0.8], dtype=np.float32)
+    assert nms(boxes, scores, np.array([0, 1]), 0.4).tolist() == [0, 1]
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock, patch
+from src.detection.prefilter import (
+    PresencePrefilter,
+    calibrate_threshold,
+    load_presence_classifier,
+)
+
+
+@pytest.fixture
+def dummy_frame():
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+def test_prefilter_downscales_and_gates(dummy_frame):
+    seen = []
+
+    def classifier(image):
+        seen.append(image.shape)
+        return 0.1
+
+    prefilter = PresencePrefilter(
+        classifier=classifier, input_size=32, threshold=0.5, refresh_frames=0
+    )
+    assert not prefilter.should_run(dummy_frame)
+    assert seen == [(32, 32, 3)]
+    prefilter.threshold = 0.05
+    assert prefilter.should_run(dummy_frame)
+    assert prefilter.stats.frames == 2
+    assert prefilter.stats.avoided == 1
+    assert prefilter.stats.avoided_ratio == pytest.approx(0.5)
+
+
+def test_prefilter_force_and_refresh(dummy_frame):
+    classifier = MagicMock(return_value=0.0)
+    prefilter = PresencePrefilter(
+        classifier=classifier, threshold=0.5, refresh_frames=3
+    )
+    assert prefilter.should_run(dummy_frame, force=True)
+    classifier.assert_not_called()
+    results = [prefilter.should_run(dummy_frame) for _ in range(3)]
+    assert results == [False, False, True]
+    prefilter.log_report()
+
+
+def test_calibrate_threshold():
+    scores = [0.9, 0.8, 0.3, 0.7, 0.1, 0.05]
+    labels = [True, True, True, True, False, False]
+    assert calibrate_threshold(scores, labels, target_recall=1.0) == pytest.approx(0.3)
+    assert calibrate_threshold(scores, labels, target_recall=0.75) == pytest.approx(0.7)
+    with pytest.raises(ValueError):
+        calibrate_threshold([0.1], [False])
+
+
+def test_load_presence_classifier_logits(dummy_frame):
+    net = MagicMock()
+    net.forward.return_value = np.array([[0.0, 0.0]], dtype=np.float32)
+    with patch("cv2.dnn.readNetFromONNX", return_value=net):
+        classify = load_presence_classifier("presence.onnx")
+    assert classify(np.zeros((64, 64, 3), dtype=np.uint8)) == pytest.approx(0.5)
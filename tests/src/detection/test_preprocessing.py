@@ -1,6 +1,10 @@
 import pytest
 import numpy as np
-from src.detection.preprocessing import letterbox_image
+from src.detection.preprocessing import (
+    BlobPreprocessor,
+    letterbox_image,
+    unletterbox_box,
+)
 
 
 @pytest.fixture
@@ -30,3 +34,54 @@ def test_invalid_mode(dummy_frame):
     """Test letterbox_image with an invalid mode."""
     with pytest.raises(ValueError):
         letterbox_image(dummy_frame, input_size=640, mode="invalid")
+
+
+def test_unletterbox_box_roundtrip(dummy_frame):
+    """Test boxes map back from letterboxed to original coordinates."""
+    _, scale, pad_w, pad_h = letterbox_image(dummy_frame, input_size=320, mode="pad")
+    assert unletterbox_box((0, 40, 160, 160), scale, pad_w, pad_h) == (0, 0, 320, 240)
+
+
+@pytest.mark.parametrize("mode", ["pad", "crop"])
+@pytest.mark.parametrize("shape", [(480, 640, 3), (720, 1280, 3), (640, 480, 3)])
+def test_blob_preprocessor_parity(mode, shape):
+    """Test the fused path matches letterbox_image + cv2.dnn.blobFromImage."""
+    import cv2
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=shape, dtype=np.uint8)
+    letterboxed, scale, pad_w, pad_h = letterbox_image(frame, 320, mode=mode)
+    expected = cv2.dnn.blobFromImage(
+        letterboxed, 1 / 255.0, (320, 320), swapRB=True, crop=False
+    )
+
+    preprocessor = BlobPreprocessor(input_size=320, mode=mode)
+    blob, fused_scale, fused_pad_w, fused_pad_h = preprocessor(frame)
+    assert blob.dtype == np.float32
+    assert blob.shape == (1, 3, 320, 320)
+    np.testing.assert_allclose(blob, expected, atol=1e-6)
+    assert fused_scale == scale
+    if mode == "pad":
+        assert (fused_pad_w, fused_pad_h) == (pad_w, pad_h)
+
+
+def test_blob_preprocessor_reuses_buffer(dummy_frame):
+    """Test the blob is reused and padding survives repeated calls."""
+    preprocessor = BlobPreprocessor(input_size=320, mode="pad")
+    first, *_ = preprocessor(dummy_frame)
+    second, *_ = preprocessor(np.full_like(dummy_frame, 255))
+    assert first is second
+    assert second[0, 0, 0, 0] == pytest.approx(114 / 255.0)
+    assert second[0, 0, 160, 160] == pytest.approx(1.0)
+
+
+def test_blob_preprocessor_crop_box_mapping():
+    """Test crop offsets map boxes back to original coordinates."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    _, scale, pad_w, pad_h = BlobPreprocessor(input_size=480, mode="crop")(frame)
+    assert unletterbox_box((0, 0, 480, 480), scale, pad_w, pad_h) == (80, 0, 560, 480)
+
+
+def test_blob_preprocessor_invalid_mode():
+    with pytest.raises(ValueError):
+        BlobPreprocessor(mode="invalid")
@@ -0,0 +1,176 @@
+import threading
+import time
+import cv2
+import numpy as np
+import pytest
+import src.detection.detector as detector
+from src.detection.inference_server import (
+    BatchingDetector,
+    InferenceRequestHandler,
+    InferenceServer,
+)
+from src.detection.remote import RemoteInferenceClient
+
+CAT = 15
+
+
+def fake_forward(calls, delay=0.0):
+    """Forward pass that finds one cat per image and records batch sizes."""
+
+    def forward(blob):
+        calls.append(blob.shape[0])
+        time.sleep(delay)
+        outputs = np.zeros((blob.shape[0], 84, 4), dtype=np.float32)
+        outputs[:, :4, 0] = [32, 24, 20, 10]
+        outputs[:, 4 + CAT, 0] = 0.9
+        return outputs
+
+    return forward
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def start(forward, max_batch=8, max_wait=0.01):
+        server = InferenceServer(
+            ("127.0.0.1", 0), BatchingDetector(forward, max_batch, max_wait)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+FRAME = np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def test_remote_roundtrip_reuses_connection(server_factory):
+    calls = []
+    server, url = server_factory(fake_forward(calls))
+    client = RemoteInferenceClient(url, timeout=2)
+    for _ in range(3):
+        detections = client.detect(FRAME, 0.5, 0.4)
+        (cat,) = detections
+        assert cat["bbox"] == (22, 19, 42, 29)
+        assert (cat["class_id"], cat["label"]) == (CAT, "cat")
+        assert cat["score"] == pytest.approx(0.9)
+    assert client.connections_opened == 1
+    assert server.connections == 1
+    assert calls == [1, 1, 1]
+    client.close()
+
+
+def test_stale_pooled_connection_is_retried(server_factory, monkeypatch):
+    # The server closes connections idle for longer than this
+    monkeypatch.setattr(InferenceRequestHandler, "timeout", 0.1)
+    calls = []
+    _, url = server_factory(fake_forward(calls))
+    client = RemoteInferenceClient(url, timeout=2)
+    assert len(client.detect(FRAME, 0.5, 0.4)) == 1
+    time.sleep(0.3)
+    assert len(client.detect(FRAME, 0.5, 0.4)) == 1
+    assert client.connections_opened == 2
+    assert client.stats.failures == 0
+    assert client.available()
+    assert calls == [1, 1]
+    client.close()
+
+
+def test_fresh_connection_failure_is_not_retried():
+    client = RemoteInferenceClient("http://127.0.0.1:9", timeout=0.2)
+    assert client.detect(FRAME, 0.5, 0.4) is None
+    assert client.connections_opened == 1
+    assert client.stats.failures == 1
+
+
+def test_server_batches_concurrent_clients(server_factory):
+    calls = []
+    server, url = server_factory(fake_forward(calls, delay=0.05), max_wait=0.05)
+    clients = [RemoteInferenceClient(url, timeout=2) for _ in range(4)]
+    results = []
+    threads = [
+        threading.Thread(target=lambda c=c: results.append(c.detect(FRAME, 0.5, 0.4)))
+        for c in clients
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 4 and all(len(r) == 1 for r in results)
+    assert max(calls) > 1
+    assert sum(calls) == 4
+
+
+def test_server_runs_unbatchable_model_singly(server_factory):
+    calls = []
+    batched = fake_forward(calls)
+
+    def fixed_batch(blob):
+        # Like an export with batch fixed to one, which cv2.dnn refuses to reshape
+        if blob.shape[0] != 1:
+            raise cv2.error("Assertion failed: outTotal == inpTotal")
+        return batched(blob)
+
+    detector_ = BatchingDetector(fixed_batch, max_batch=4, max_wait=0.05)
+    detector_.start()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(detector_.submit(FRAME, 0.5, 0.4))
+        )
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    detector_.stop()
+    assert len(results) == 3 and all(len(r) == 1 for r in results)
+    assert not detector_.batching
+    assert detector_.batch_sizes[1] == 3
+
+
+def test_slow_server_falls_back_and_backs_off(server_factory):
+    _, url = server_factory(fake_forward([], delay=0.5))
+    now = [0.0]
+    client = RemoteInferenceClient(
+        url, timeout=0.1, retry_interval=10, clock=lambda: now[0]
+    )
+    assert client.detect(FRAME, 0.5, 0.4) is None
+    assert client.detect(FRAME, 0.5, 0.4) is None
+    assert client.stats.failures == 1
+    assert client.stats.skipped == 1
+    now[0] = 11
+    assert client.available()
+
+
+def test_detect_objects_uses_local_model_when_unreachable(monkeypatch):
+    client = RemoteInferenceClient("http://127.0.0.1:9", timeout=0.2)
+    monkeypatch.setattr(detector, "remote", client)
+    local = []
+    monkeypatch.setattr(
+        detector,
+        "detect_blob",
+        lambda blob, **kwargs: local.append(blob.shape) or [],
+    )
+    assert detector.detect_objects(np.zeros((64, 64, 3), np.uint8)) == []
+    assert local == [(1, 3, 64, 64)]
+    assert client.stats.failures == 1
+
+
+def test_detect_objects_prefers_remote(server_factory, monkeypatch):
+    _, url = server_factory(fake_forward([]))
+    monkeypatch.setattr(detector, "remote", RemoteInferenceClient(url, timeout=2))
+    monkeypatch.setattr(detector, "detect_blob", None)
+    detections = detector.detect_objects(np.zeros((64, 64, 3), np.uint8))
+    assert [d["label"] for d in detections] == ["cat"]
+
+
+def test_invalid_url():
+    with pytest.raises(ValueError):
+        RemoteInferenceClient("https://example.com")
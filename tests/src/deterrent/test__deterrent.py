@@ -23,3 +23,9 @@ def test_dummy_deterrent_methods():
     assert d.setup() == "setup"
     assert d.activate(1.0) == "activate 1.0"
     assert d.cleanup() == "cleanup"
+
+
+def test_prepare_and_discard_are_optional():
+    d = DummyDeterrent()
+    assert d.prepare(1.0) is None
+    assert d.discard() is None
@@ -1,7 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from src.deterrent.audio_deterrent import AudioDeterrent
-from pydub import AudioSegment
 
 
 @pytest.fixture
@@ -56,14 +55,38 @@ def test_audio_deterrent_activate_play_error(audio_deterrent):
             audio_deterrent.activate(duration=1.5)
 
 
-def test_splice_and_loop_mp3():
-    audio = MagicMock(spec=AudioSegment)
-    segment = MagicMock(spec=AudioSegment)
-    audio.__getitem__.return_value = segment
-    segment.append.return_value = segment
-    audio.__add__.return_value = audio
-    result = AudioDeterrent._splice_and_loop_mp3(audio, 0, 1000, 2, cross_fade=100)
-    assert result is not None
+@pytest.mark.parametrize(
+    "frame_rate, channels, sample_width, cross_fade",
+    [
+        (44100, 2, 2, 100),
+        (48000, 1, 2, 100),
+        (22050, 2, 2, 50),
+        (44100, 1, 1, 100),
+        (44100, 2, 4, 100),
+        (44100, 2, 2, None),
+    ],
+)
+def test_splice_and_loop_mp3_matches_pydub(
+    frame_rate, channels, sample_width, cross_fade
+):
+    """Test the sample-array loop is identical to chained pydub appends."""
+    from src.tools.loop_benchmark import LegacyAudioDeterrent, synthetic_gunshots
+
+    audio = synthetic_gunshots(2.0, frame_rate, channels).set_sample_width(sample_width)
+    for loop_times in (1, 2, 7):
+        args = (audio, 0, 1430.0, loop_times, cross_fade)
+        expected = LegacyAudioDeterrent._splice_and_loop_mp3(*args)
+        result = AudioDeterrent._splice_and_loop_mp3(*args)
+        assert result.raw_data == expected.raw_data
+        assert result.frame_rate == frame_rate
+        assert result.channels == channels
+
+
+def test_splice_and_loop_mp3_crossfade_too_long():
+    from src.tools.loop_benchmark import synthetic_gunshots
+
+    with pytest.raises(ValueError):
+        AudioDeterrent._splice_and_loop_mp3(synthetic_gunshots(1.0), 0, 150, 3)
 
 
 def test_loop_gunshots_longer_duration(audio_deterrent):
@@ -77,3 +100,46 @@ def test_loop_gunshots_longer_duration(audio_deterrent):
         result = audio_deterrent._loop_gunshots(duration=2.0)
         assert result == "spliced"
         mock_splice.assert_called()
+
+
+def test_audio_deterrent_reuses_loop(audio_deterrent):
+    with (
+        patch("src.deterrent.audio_deterrent.play") as mock_play,
+        patch.object(
+            AudioDeterrent, "_loop_gunshots", return_value="looped"
+        ) as mock_loop,
+    ):
+        audio_deterrent.activate(duration=3.0)
+        audio_deterrent.activate(duration=3.0)
+        audio_deterrent.activate(duration=5.0)
+    assert mock_loop.call_count == 2
+    mock_play.assert_called_with("looped")
+    audio_deterrent.audio = MagicMock()
+    audio_deterrent.cleanup()
+    assert audio_deterrent._loops == {}
+
+
+def test_audio_deterrent_prepare_builds_loop_once(audio_deterrent):
+    import threading
+
+    release = threading.Event()
+
+    def slow_loop(duration):
+        release.wait(5)
+        return "looped"
+
+    with (
+        patch("src.deterrent.audio_deterrent.play") as mock_play,
+        patch.object(
+            AudioDeterrent, "_loop_gunshots", side_effect=slow_loop
+        ) as mock_loop,
+    ):
+        audio_deterrent.prepare(3.0)
+        # Activation during the build waits for it instead of building again
+        activation = threading.Thread(target=audio_deterrent.activate, args=(3.0,))
+        activation.start()
+        release.set()
+        activation.join(5)
+        audio_deterrent.prepare(3.0)
+    assert mock_loop.call_count == 1
+    mock_play.assert_called_once_with("looped")
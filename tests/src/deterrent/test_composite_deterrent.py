@@ -0,0 +1,115 @@
+import time
+import pytest
+from src.deterrent._deterrent import Deterrent
+from src.deterrent.composite_deterrent import CompositeDeterrent
+
+
+class SlowDeterrent(Deterrent):
+    def __init__(self, delay: float = 0.0, fail: str | None = None) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[str] = []
+
+    def _step(self, name: str):
+        self.calls.append(name)
+        if self.fail == name:
+            raise RuntimeError(f"{name} failed")
+        time.sleep(self.delay)
+
+    def setup(self):
+        self._step("setup")
+
+    def prepare(self, duration: float):
+        self._step("prepare")
+
+    def discard(self):
+        self._step("discard")
+
+    def activate(self, duration: float):
+        self._step("activate")
+
+    def cleanup(self):
+        self._step("cleanup")
+
+
+def test_composite_activates_in_parallel():
+    children = {
+        "a": SlowDeterrent(0.2),
+        "b": SlowDeterrent(0.2),
+        "c": SlowDeterrent(0.2),
+    }
+    composite = CompositeDeterrent(children, timeout=2.0)
+    start = time.perf_counter()
+    composite.setup()
+    composite.activate(0.0)
+    elapsed = time.perf_counter() - start
+    composite.cleanup()
+    # Setup and activation each take one child's time, not the sum
+    assert elapsed < 1.0
+    assert all(latency is not None for latency in composite.latencies.values())
+    assert all(c.calls == ["setup", "activate", "cleanup"] for c in children.values())
+
+
+def test_composite_isolates_errors_and_timeouts():
+    children = {
+        "broken": SlowDeterrent(fail="activate"),
+        "slow": SlowDeterrent(0.5),
+        "ok": SlowDeterrent(),
+    }
+    composite = CompositeDeterrent(children, timeout=0.2)
+    children["slow"].delay = 0.0
+    composite.setup()
+    children["slow"].delay = 0.5
+    composite.activate(0.0)
+    assert composite.latencies["broken"] is None
+    assert composite.latencies["slow"] is None
+    assert composite.latencies["ok"] is not None
+    # A child still busy from the last activation is skipped
+    composite.activate(0.0)
+    assert children["slow"].calls.count("activate") == 1
+    composite.cleanup()
+
+
+def test_composite_cleans_up_busy_children():
+    children = {"slow": SlowDeterrent(), "ok": SlowDeterrent()}
+    composite = CompositeDeterrent(children, timeout=0.1)
+    composite.setup()
+    children["slow"].delay = 1.0
+    composite.activate(0.0)
+    assert composite.latencies["slow"] is None
+    children["slow"].delay = 0.0
+    composite.cleanup()
+    # Cleaned up while its activation is still running
+    assert children["slow"].calls == ["setup", "activate", "cleanup"]
+    assert children["ok"].calls == ["setup", "activate", "cleanup"]
+
+
+def test_composite_drops_children_failing_setup():
+    composite = CompositeDeterrent(
+        {"bad": SlowDeterrent(fail="setup"), "good": SlowDeterrent()}
+    )
+    composite.setup()
+    assert list(composite.active) == ["good"]
+    composite.cleanup()
+
+
+def test_composite_all_setup_failures():
+    composite = CompositeDeterrent({"bad": SlowDeterrent(fail="setup")})
+    with pytest.raises(RuntimeError):
+        composite.setup()
+
+
+def test_composite_requires_children():
+    with pytest.raises(ValueError):
+        CompositeDeterrent({})
+
+
+def test_composite_forwards_prepare_and_discard():
+    children = {"a": SlowDeterrent(fail="prepare"), "b": SlowDeterrent()}
+    composite = CompositeDeterrent(children, timeout=1.0)
+    composite.setup()
+    composite.prepare(1.0)
+    composite.discard()
+    composite.cleanup()
+    assert children["a"].calls == ["setup", "prepare", "discard", "cleanup"]
+    assert children["b"].calls == ["setup", "prepare", "discard", "cleanup"]
@@ -1,9 +1,12 @@
 import pytest
+import time
 from unittest.mock import patch, MagicMock
 import sys
 import types
 from src.deterrent.gpio_deterrent import GpioDeterrent
+from src.deterrent.gpio_pulse import FakeGPIO, PulseScheduler, burst, duty_cycle
 import src.deterrent.gpio_deterrent as gpio_mod
+import src.deterrent.gpio_pulse as gpio_pulse
 
 
 @pytest.fixture
@@ -11,43 +14,53 @@ def gpio_deterrent():
     return GpioDeterrent()
 
 
-def test_gpio_deterrent_setup(gpio_deterrent):
-    """Test the setup method of GpioDeterrent."""
+@pytest.fixture
+def mock_gpio(monkeypatch):
     mock_gpio = MagicMock()
-    mock_time = MagicMock()
-    sys.modules["RPi"] = types.SimpleNamespace(GPIO=mock_gpio)  # type: ignore
-    sys.modules["RPi.GPIO"] = mock_gpio
-    sys.modules["time"] = mock_time
+    monkeypatch.setitem(sys.modules, "RPi", types.SimpleNamespace(GPIO=mock_gpio))
+    monkeypatch.setitem(sys.modules, "RPi.GPIO", mock_gpio)
+    monkeypatch.setattr(gpio_mod, "GPIO", mock_gpio, raising=False)
+    return mock_gpio
+
+
+@pytest.fixture
+def fake_gpio():
+    return FakeGPIO()
+
+
+def _rising(edges):
+    return [t for t, _, high in edges if high]
+
+
+def _falling(edges):
+    return [t for t, _, high in edges if not high]
+
+
+def test_gpio_deterrent_setup(gpio_deterrent, mock_gpio):
+    """Test the setup method of GpioDeterrent."""
     with patch("src.deterrent.gpio_deterrent.IS_PI", True):
-        setattr(gpio_mod, "GPIO", mock_gpio)
         gpio_deterrent.setup()
         mock_gpio.setmode.assert_called_once()
         mock_gpio.setup.assert_called_once()
+        gpio_deterrent.cleanup()
 
 
-def test_gpio_deterrent_activate(gpio_deterrent):
-    """Test the activate method of GpioDeterrent."""
-    mock_gpio = MagicMock()
-    mock_time = MagicMock()
-    sys.modules["RPi"] = types.SimpleNamespace(GPIO=mock_gpio)  # type: ignore
-    sys.modules["RPi.GPIO"] = mock_gpio
-    sys.modules["time"] = mock_time
+def test_gpio_deterrent_activate(gpio_deterrent, mock_gpio):
+    """Test activate returns immediately and the pin goes low after the pulse."""
     with patch("src.deterrent.gpio_deterrent.IS_PI", True):
-        setattr(gpio_mod, "GPIO", mock_gpio)
-        setattr(gpio_mod, "time", mock_time)
-        gpio_deterrent.activate(duration=1.5)
+        gpio_deterrent.setup()
+        start = time.perf_counter()
+        gpio_deterrent.activate(duration=0.05)
+        assert time.perf_counter() - start < 0.01
+        time.sleep(0.1)
         mock_gpio.output.assert_any_call(gpio_deterrent.pin, mock_gpio.HIGH)
-        mock_time.sleep.assert_called_once_with(1.5)
-        mock_gpio.output.assert_any_call(gpio_deterrent.pin, mock_gpio.LOW)
+        mock_gpio.output.assert_called_with(gpio_deterrent.pin, mock_gpio.LOW)
+        gpio_deterrent.cleanup()
 
 
-def test_gpio_deterrent_cleanup(gpio_deterrent):
+def test_gpio_deterrent_cleanup(gpio_deterrent, mock_gpio):
     """Test the cleanup method of GpioDeterrent."""
-    mock_gpio = MagicMock()
-    sys.modules["RPi"] = types.SimpleNamespace(GPIO=mock_gpio)  # type: ignore
-    sys.modules["RPi.GPIO"] = mock_gpio
     with patch("src.deterrent.gpio_deterrent.IS_PI", True):
-        setattr(gpio_mod, "GPIO", mock_gpio)
         gpio_deterrent.cleanup()
         mock_gpio.cleanup.assert_called_once()
 
@@ -65,3 +78,96 @@ def test_gpio_deterrent_activate_not_pi(gpio_deterrent):
 def test_gpio_deterrent_cleanup_not_pi(gpio_deterrent):
     with patch("src.deterrent.gpio_deterrent.IS_PI", False):
         gpio_deterrent.cleanup()  # Should do nothing
+
+
+def test_gpio_deterrent_fake_backend(fake_gpio):
+    """Test the deterrent drives a fake backend off the Pi."""
+    deterrent = GpioDeterrent(backend=fake_gpio)
+    deterrent.setup()
+    deterrent.activate(0.05)
+    time.sleep(0.1)
+    deterrent.cleanup()
+    assert [high for _, _, high in fake_gpio.edges] == [True, False]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return PulseScheduler(FakeGPIO(clock), pin=17, clock=clock)
+
+
+def _drive(scheduler, clock, until, late=0.0):
+    """
+    Does the timer thread's work on the fake clock: wakes the scheduler at
+    every edge it asks for, `late` seconds after it, up to `until`.
+    """
+    while True:
+        next_edge = scheduler._step(clock.now)
+        if next_edge + late > until:
+            clock.now = until
+            return
+        clock.now = next_edge + late
+
+
+def test_pulse_timing(scheduler, clock):
+    """Test a single pulse lasts its duration."""
+    scheduler.pulse(0.1)
+    _drive(scheduler, clock, until=1.0)
+    assert scheduler.backend.edges == [(0.0, 17, True), (0.1, 17, False)]
+
+
+def test_pulse_extends_on_retrigger(scheduler, clock):
+    """Test re-triggering an active pulse extends it without a new edge."""
+    scheduler.pulse(0.1)
+    _drive(scheduler, clock, until=0.05)
+    scheduler.pulse(0.1)
+    _drive(scheduler, clock, until=1.0)
+    edges = scheduler.backend.edges
+    assert len(_rising(edges)) == 1
+    assert _falling(edges) == [pytest.approx(0.15)]
+
+
+def test_pulse_pattern_does_not_drift(scheduler, clock):
+    """Test late wake-ups do not push later edges off the schedule."""
+    scheduler.pulse(0.3, duty_cycle(period=0.05, duty=0.4))
+    _drive(scheduler, clock, until=1.0, late=0.003)
+    rising = _rising(scheduler.backend.edges)
+    falling = _falling(scheduler.backend.edges)
+    assert rising == pytest.approx([0.0] + [i * 0.05 + 0.003 for i in range(1, 6)])
+    assert falling == pytest.approx([i * 0.05 + 0.023 for i in range(6)])
+
+
+def test_stop_does_not_wait_for_spin(fake_gpio, monkeypatch):
+    """Test stop() is not held up while the timer thread busy-waits an edge."""
+    # Spin through the whole pulse instead of sleeping
+    monkeypatch.setattr(gpio_pulse, "SPIN_TIME", 10.0)
+    scheduler = PulseScheduler(fake_gpio, pin=17)
+    scheduler.start()
+    scheduler.pulse(5.0)
+    time.sleep(0.05)
+    start = time.monotonic()
+    scheduler.stop()
+    assert time.monotonic() - start < 1.0
+    assert [high for _, _, high in fake_gpio.edges] == [True, False]
+
+
+def test_burst_pattern():
+    assert burst(3, on=0.1, off=0.05, pause=0.5) == [
+        (0.1, 0.05),
+        (0.1, 0.05),
+        (0.1, 0.5),
+    ]
+    with pytest.raises(ValueError):
+        duty_cycle(1.0, 0.0)
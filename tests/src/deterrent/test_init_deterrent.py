@@ -1,8 +1,13 @@
+import json
+import subprocess
+import sys
+
 import pytest
 from src.deterrent import get_deterrent
 from src.deterrent.gpio_deterrent import GpioDeterrent
 from src.deterrent.audio_deterrent import AudioDeterrent
 from src.deterrent.speech_deterrent import SpeechDeterrent
+from src.deterrent.composite_deterrent import CompositeDeterrent
 
 
 def test_get_deterrent_gpio():
@@ -31,3 +36,69 @@ def test_get_deterrent_llm():
 def test_get_deterrent_invalid():
     with pytest.raises(ValueError):
         get_deterrent("invalid")
+
+
+def test_get_deterrent_composite():
+    d = get_deterrent(["gpio", "gunshots"])
+    assert isinstance(d, CompositeDeterrent)
+    assert isinstance(d.children["gpio"], GpioDeterrent)
+    assert isinstance(d.children["gunshots"], AudioDeterrent)
+
+
+def test_get_deterrent_composite_duplicates():
+    with pytest.raises(ValueError, match="gpio"):
+        get_deterrent(["gpio", "gunshots", "gpio"])
+
+
+# Cold start budget for importing and building the GPIO deterrent
+GPIO_IMPORT_BUDGET = 1.0  # Seconds
+HEAVY_MODULES = ["pydub", "pyttsx3", "langchain_ollama", "cv2"]
+
+COLD_START_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+from src.deterrent import get_deterrent
+get_deterrent("gpio")
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def test_gpio_cold_start_is_lazy():
+    """Selecting GPIO must not import other backends' dependencies."""
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["loaded"] == []
+    assert report["elapsed"] < GPIO_IMPORT_BUDGET
+
+
+def test_register_deterrent(monkeypatch):
+    from src.deterrent import DETERRENT_REGISTRY, register_deterrent
+
+    monkeypatch.setitem(DETERRENT_REGISTRY, "placeholder", DETERRENT_REGISTRY["gpio"])
+    register_deterrent(
+        "placeholder", "src.deterrent.gpio_deterrent:GpioDeterrent", pin=4
+    )
+    d = get_deterrent("placeholder")
+    assert isinstance(d, GpioDeterrent)
+    assert d.pin == 4
+
+
+def test_get_deterrent_entry_point(monkeypatch):
+    from importlib.metadata import EntryPoint
+
+    entry_point = EntryPoint(
+        name="plugin",
+        value="src.deterrent.gpio_deterrent:GpioDeterrent",
+        group="sink_snooper.deterrents",
+    )
+    monkeypatch.setattr("src.deterrent.entry_points", lambda group: [entry_point])
+    assert isinstance(get_deterrent("plugin"), GpioDeterrent)
@@ -1,6 +1,16 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from unittest.mock import patch, MagicMock
-from src.deterrent.speech_deterrent import SpeechDeterrent, SpeechProvider
+from src.deterrent.speech_deterrent import (
+    SpeechDeterrent,
+    SpeechProvider,
+    iter_sentences,
+)
+from src.deterrent.speech_worker import SpeechWorker
 
 
 @pytest.fixture
@@ -24,9 +34,20 @@ def _mock_engine_with_voice():
     mock_voice.languages = ["en_US"]
     mock_voice.id = "en_US_voice"
     mock_engine.getProperty.return_value = [mock_voice]
+    mock_engine.isBusy.return_value = False
     return mock_engine
 
 
+def _start_worker(speech, engine=None):
+    """Runs the speech worker on a fake engine without pyttsx3."""
+    engine = engine or MagicMock()
+    engine.isBusy.return_value = False
+    speech.engine = engine
+    speech.worker = SpeechWorker(lambda: engine)
+    speech.worker.start()
+    return engine
+
+
 def test_speech_deterrent_setup(speech_deterrent):
     with patch("src.deterrent.speech_deterrent.pyttsx3.init") as mock_init:
         mock_engine = _mock_engine_with_voice()
@@ -48,8 +69,11 @@ def test_speech_deterrent_activate_basic(speech_deterrent):
         mock_init.return_value = mock_engine
         speech_deterrent.setup()
         speech_deterrent.activate(duration=1.5)
+        assert speech_deterrent.wait_idle(timeout=1)
         mock_get_phrase.assert_called()
         mock_engine.say.assert_called_with("mock_phrase")
+        assert mock_engine.say.call_count == 2
+        speech_deterrent.cleanup()
 
 
 def test_speech_deterrent_cleanup(speech_deterrent):
@@ -96,14 +120,15 @@ def test_activate_creative(monkeypatch, creative_speech):
         mock_engine = _mock_engine_with_voice()
         mock_init.return_value = mock_engine
         mock_llm_inst = MagicMock()
-        mock_llm_inst.invoke.return_value = "creative response"
+        mock_llm_inst.stream.return_value = iter(["creative ", "response"])
         mock_llm.return_value = mock_llm_inst
         creative_speech.setup()
         creative_speech.engine = mock_engine
         creative_speech.llm = mock_llm_inst
         creative_speech.prompt = "prompt"
         creative_speech.activate(1.0)
-        mock_llm_inst.invoke.assert_called()
+        assert creative_speech.wait_idle(timeout=1)
+        mock_llm_inst.stream.assert_called()
         mock_engine.say.assert_called_with("creative response")
 
 
@@ -138,3 +163,302 @@ def test_speech_provider_specific():
     p = SpeechProvider(category="asian")
     assert p.category == "asian"
     assert isinstance(p.get_phrase(), str)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Streams a canned response token by token like Ollama's /api/generate."""
+
+    protocol_version = "HTTP/1.1"
+    tokens = ["Get ", "out ", "of ", "the ", "sink. ", "Now, ", "cat! ", "Shoo"]
+    token_delay = 0.05
+    client_ports: list[int] = []
+
+    def do_POST(self):
+        self.client_ports.append(self.client_address[1])
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in self.tokens:
+            time.sleep(self.token_delay)
+            self._write_chunk({"response": token, "done": False})
+        self._write_chunk({"response": "", "done": True, "done_reason": "stop"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, payload: dict):
+        payload = {"model": "fake", "created_at": "2025-01-01T00:00:00Z", **payload}
+        data = (json.dumps(payload) + "\n").encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_ollama():
+    FakeOllamaHandler.client_ports = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_iter_sentences():
+    chunks = ["Hello th", "ere. How", " are you?", ' "Fine!" ok', "ay"]
+    assert list(iter_sentences(chunks)) == [
+        "Hello there.",
+        "How are you?",
+        '"Fine!"',
+        "okay",
+    ]
+    assert list(iter_sentences([])) == []
+
+
+def test_activate_creative_streams_sentences(creative_speech, fake_ollama):
+    """Test time-to-first-audio is the first sentence, not the whole response."""
+    from langchain_ollama import OllamaLLM
+
+    spoken = []
+    engine = MagicMock()
+    engine.say.side_effect = lambda text: spoken.append((time.perf_counter(), text))
+    _start_worker(creative_speech, engine)
+    creative_speech.llm = OllamaLLM(model="fake", base_url=fake_ollama)
+    creative_speech.prompt = "prompt"
+
+    start = time.perf_counter()
+    creative_speech.activate(1.0)
+    assert creative_speech.wait_idle(timeout=2)
+    total = time.perf_counter() - start
+
+    assert [text for _, text in spoken] == ["Get out of the sink.", "Now, cat!", "Shoo"]
+    first_audio = spoken[0][0] - start
+    assert creative_speech.time_to_first_audio == pytest.approx(first_audio, abs=0.02)
+    # First sentence is 5 of 8 tokens, so audio starts well before the end
+    assert first_audio < total - 2 * FakeOllamaHandler.token_delay
+
+
+def _creative_with_fake_llm(creative_speech, url):
+    from langchain_ollama import OllamaLLM
+
+    _start_worker(creative_speech)
+    creative_speech.provider = MagicMock()
+    creative_speech.provider.get_phrase.return_value = "stock phrase"
+    creative_speech.llm = OllamaLLM(model="fake", base_url=url)
+    creative_speech.prompt = "prompt"
+    return creative_speech
+
+
+def test_activate_creative_falls_back_over_budget(
+    creative_speech, fake_ollama, monkeypatch
+):
+    monkeypatch.setattr(FakeOllamaHandler, "token_delay", 0.2)
+    speech = _creative_with_fake_llm(creative_speech, fake_ollama)
+    speech.latency_budget = 0.1
+    start = time.perf_counter()
+    speech.activate(1.0)
+    assert speech.wait_idle(timeout=1)
+    assert time.perf_counter() - start < 0.5
+    speech.engine.say.assert_called_once_with("stock phrase")
+    assert speech.creative_stats.fallbacks == 1
+    assert speech.creative_stats.fallback_rate == 1.0
+
+
+def test_activate_creative_falls_back_on_error(creative_speech):
+    _start_worker(creative_speech)
+    creative_speech.provider = MagicMock()
+    creative_speech.provider.get_phrase.return_value = "stock phrase"
+    creative_speech.llm = MagicMock()
+    creative_speech.llm.stream.side_effect = ConnectionError("unreachable")
+    creative_speech.prompt = "prompt"
+    creative_speech.activate(1.0)
+    assert creative_speech.wait_idle(timeout=1)
+    creative_speech.engine.say.assert_called_once_with("stock phrase")
+    assert creative_speech.creative_stats.fallbacks == 1
+
+
+def test_activate_creative_reuses_connection(creative_speech, fake_ollama):
+    speech = _creative_with_fake_llm(creative_speech, fake_ollama)
+    speech.activate(1.0)
+    assert speech.wait_idle(timeout=2)
+    speech.activate(1.0)
+    assert speech.wait_idle(timeout=2)
+    assert len(FakeOllamaHandler.client_ports) == 2
+    assert len(set(FakeOllamaHandler.client_ports)) == 1
+    assert speech.creative_stats.fallbacks == 0
+
+
+def test_setup_creative_warms_up(creative_speech):
+    with (
+        patch("src.deterrent.speech_deterrent.pyttsx3.init") as mock_init,
+        patch("src.deterrent.speech_deterrent.OllamaLLM") as mock_llm,
+    ):
+        mock_init.return_value = _mock_engine_with_voice()
+        creative_speech.setup()
+        deadline = time.monotonic() + 1.0
+        while not mock_llm.return_value.invoke.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        mock_llm.return_value.invoke.assert_called_once_with("")
+        assert mock_llm.call_args.kwargs["keep_alive"]
+
+
+def test_activate_returns_immediately_while_speaking(basic_speech):
+    engine = _start_worker(basic_speech)
+    engine.isBusy.return_value = True  # Each phrase plays until stopped
+    basic_speech.provider = MagicMock()
+    basic_speech.provider.get_phrase.return_value = "phrase"
+    start = time.perf_counter()
+    basic_speech.activate(3.0)
+    assert time.perf_counter() - start < 0.05
+    assert not basic_speech.wait_idle(timeout=0.1)
+    basic_speech.cleanup()
+
+
+def test_new_activation_preempts_stale_speech(basic_speech):
+    engine = _start_worker(basic_speech)
+    engine.isBusy.return_value = True
+    basic_speech.provider = MagicMock()
+    basic_speech.provider.get_phrase.side_effect = ["old 1", "old 2", "old 3"]
+    basic_speech.activate(3.0)
+    time.sleep(0.05)
+    engine.isBusy.return_value = False
+    basic_speech.provider.get_phrase.side_effect = ["new"]
+    basic_speech.activate(1.0)
+    assert basic_speech.wait_idle(timeout=1)
+    spoken = [c.args[0] for c in engine.say.call_args_list]
+    assert spoken == ["old 1", "new"]
+    engine.stop.assert_called()
+    stats = basic_speech.worker.stats
+    assert stats.preempted == 2  # One queued, one cut off, one never queued
+    basic_speech.cleanup()
+
+
+def test_long_activation_queues_phrases_in_turn(basic_speech):
+    engine = _start_worker(basic_speech)
+    basic_speech.worker.max_queue = 2
+    basic_speech.provider = MagicMock()
+    basic_speech.provider.get_phrase.side_effect = [f"phrase {i}" for i in range(6)]
+    basic_speech.activate(6.0)
+    assert basic_speech.wait_idle(timeout=1)
+    spoken = [c.args[0] for c in engine.say.call_args_list]
+    assert spoken == [f"phrase {i}" for i in range(6)]
+    stats = basic_speech.worker.stats
+    assert stats.dropped == 0
+    assert stats.max_depth == 1
+    basic_speech.cleanup()
+
+
+def test_worker_bounded_queue_and_latency():
+    release = threading.Event()
+    engine = MagicMock()
+    engine.say.side_effect = lambda text: release.wait(1)
+    engine.isBusy.return_value = False
+    worker = SpeechWorker(lambda: engine, max_queue=2)
+    worker.start()
+    worker.say("phrase 0")
+    time.sleep(0.05)
+    for i in range(1, 5):
+        worker.say(f"phrase {i}")
+    time.sleep(0.05)
+    release.set()
+    assert worker.wait_idle(timeout=1)
+    worker.stop()
+    # The first phrase was already playing, then two queued phrases survived
+    spoken = [c.args[0] for c in engine.say.call_args_list]
+    assert spoken[0] == "phrase 0"
+    assert spoken[1:] == ["phrase 3", "phrase 4"]
+    assert worker.stats.dropped == 2
+    assert worker.stats.max_depth == 2
+    assert worker.stats.max_latency >= 0.05
+
+
+def test_worker_start_raises_engine_error():
+    def broken():
+        raise RuntimeError("no audio device")
+
+    with pytest.raises(RuntimeError):
+        SpeechWorker(broken).start()
+
+
+def test_prepare_streams_during_hold_window(creative_speech):
+    engine = _start_worker(creative_speech)
+    creative_speech.llm = MagicMock()
+    creative_speech.llm.stream.return_value = iter(["Prepared. ", "Ready."])
+    creative_speech.prompt = "prompt"
+    creative_speech.prepare(1.0)
+    creative_speech.prepare(1.0)  # Already preparing, no second request
+    time.sleep(0.05)
+    creative_speech.activate(1.0)
+    assert creative_speech.wait_idle(timeout=1)
+    creative_speech.llm.stream.assert_called_once()
+    spoken = [c.args[0] for c in engine.say.call_args_list]
+    assert spoken == ["Prepared.", "Ready."]
+    assert creative_speech.time_to_first_audio < 0.05
+    creative_speech.cleanup()
+
+
+def _blocking_stream(release):
+    def stream(prompt):
+        yield "Early. "
+        release.wait(1)
+        yield "Late. "
+
+    return stream
+
+
+def test_discarded_stream_is_reused_while_running(creative_speech):
+    engine = _start_worker(creative_speech)
+    release = threading.Event()
+    creative_speech.llm = MagicMock()
+    creative_speech.llm.stream.side_effect = _blocking_stream(release)
+    creative_speech.prompt = "prompt"
+    creative_speech.prepare(1.0)
+    creative_speech.discard()
+    assert creative_speech._prepared is None
+
+    # The activation picks up the response instead of queueing another request
+    creative_speech.activate(1.0)
+    release.set()
+    assert creative_speech.wait_idle(timeout=1)
+    creative_speech.llm.stream.assert_called_once()
+    spoken = [c.args[0] for c in engine.say.call_args_list]
+    assert spoken == ["Early.", "Late."]
+    creative_speech.cleanup()
+
+
+def test_flickering_detection_keeps_one_request(creative_speech):
+    _start_worker(creative_speech)
+    release = threading.Event()
+    creative_speech.llm = MagicMock()
+    creative_speech.llm.stream.side_effect = _blocking_stream(release)
+    creative_speech.prompt = "prompt"
+    for _ in range(5):
+        creative_speech.prepare(1.0)
+        creative_speech.discard()
+    creative_speech.llm.stream.assert_called_once()
+    release.set()
+    creative_speech.cleanup()
+
+
+def test_finished_discarded_stream_is_not_reused(creative_speech):
+    _start_worker(creative_speech)
+    creative_speech.llm = MagicMock()
+    creative_speech.llm.stream.side_effect = lambda prompt: iter(["Done."])
+    creative_speech.prompt = "prompt"
+    creative_speech.prepare(1.0)
+    creative_speech.discard()
+    creative_speech._spare.thread.join(1)
+    creative_speech.prepare(1.0)
+    assert creative_speech.llm.stream.call_count == 2
+    creative_speech.cleanup()
+
+
+def test_prepare_is_noop_in_basic_mode(basic_speech):
+    basic_speech.llm = MagicMock()
+    basic_speech.prepare(1.0)
+    basic_speech.discard()
+    basic_speech.llm.stream.assert_not_called()
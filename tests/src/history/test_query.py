@@ -0,0 +1,72 @@
+import sys
+from datetime import datetime
+from src.history import query
+from src.history.store import DetectionLog
+
+
+def _run(monkeypatch, capsys, *argv):
+    monkeypatch.setattr(sys, "argv", ["query", *argv])
+    query.main()
+    return capsys.readouterr().out.splitlines()
+
+
+def _populate(directory):
+    log = DetectionLog(directory)
+    for t in ["2025-05-01T10:05:00", "2025-05-01T10:30:00", "2025-05-02T10:10:00"]:
+        det = {"bbox": (1, 2, 3, 4), "class_id": 15, "label": "cat", "score": 0.9}
+        log.append(datetime.fromisoformat(t).timestamp(), [det])
+    log.close()
+
+
+def test_query_records(tmp_path, monkeypatch, capsys):
+    _populate(tmp_path)
+    lines = _run(
+        monkeypatch,
+        capsys,
+        "--dir",
+        str(tmp_path),
+        "--start",
+        "2025-05-01",
+        "--end",
+        "2025-05-03",
+        "records",
+        "--limit",
+        "2",
+    )
+    assert len(lines) == 2
+    assert lines[0].startswith("2025-05-01T10:05:00 class=15 score=0.90")
+
+
+def test_query_visits_hour_of_day(tmp_path, monkeypatch, capsys):
+    _populate(tmp_path)
+    lines = _run(
+        monkeypatch,
+        capsys,
+        "--dir",
+        str(tmp_path),
+        "--start",
+        "2025-05-01",
+        "--end",
+        "2025-05-03",
+        "visits",
+        "--hour-of-day",
+        "--all-classes",
+    )
+    assert len(lines) == 24
+    assert lines[10].split()[:2] == ["10:00", "3"]
+
+
+def test_query_visits_series(tmp_path, monkeypatch, capsys):
+    _populate(tmp_path)
+    lines = _run(
+        monkeypatch,
+        capsys,
+        "--dir",
+        str(tmp_path),
+        "--start",
+        "2025-05-01",
+        "--end",
+        "2025-05-03",
+        "visits",
+    )
+    assert lines == ["2025-05-01T10:00      2", "2025-05-02T10:00      1"]
@@ -0,0 +1,132 @@
+import pytest
+import numpy as np
+from datetime import datetime
+from src.history.store import (
+    HEADER_SIZE,
+    RECORD_DTYPE,
+    DetectionLog,
+    hourly_visit_counts,
+    iter_records,
+    open_segment,
+    segment_path,
+)
+
+
+def _ts(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _cat(score=0.9, class_id=15):
+    return {"bbox": (1, 2, 3, 4), "class_id": class_id, "label": "cat", "score": score}
+
+
+def test_record_size():
+    assert RECORD_DTYPE.itemsize == 24
+    assert HEADER_SIZE == 16
+
+
+def test_append_and_read_back(tmp_path):
+    log = DetectionLog(tmp_path, flush_interval=0)
+    t = _ts("2025-05-01T10:00:00")
+    log.append(t, [_cat(0.9), _cat(0.7, class_id=16)])
+    log.append(t + 1, [])
+    log.close()
+
+    path = segment_path(tmp_path, datetime.fromtimestamp(t).date())
+    assert path.stat().st_size == HEADER_SIZE + 2 * RECORD_DTYPE.itemsize
+    records = open_segment(path)
+    assert records["class_id"].tolist() == [15, 16]
+    assert records["score"].tolist() == pytest.approx([0.9, 0.7])
+    assert records[0]["x2"] == 3
+
+
+def test_daily_segments_and_range_query(tmp_path):
+    log = DetectionLog(tmp_path)
+    times = [_ts("2025-05-01T23:59:00"), _ts("2025-05-02T00:01:00")]
+    times.append(_ts("2025-05-02T12:00:00"))
+    for t in times:
+        log.append(t, [_cat()])
+    log.close()
+    assert len(list(tmp_path.glob("*.det"))) == 2
+
+    slices = list(iter_records(tmp_path, times[0] + 1, times[2]))
+    found = np.concatenate([s["timestamp"] for s in slices])
+    assert found.tolist() == [times[1]]
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    log = DetectionLog(tmp_path)
+    t = _ts("2025-05-01T10:00:00")
+    log.append(t, [_cat()])
+    log.close()
+    path = segment_path(tmp_path, datetime.fromtimestamp(t).date())
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 5)
+    assert len(open_segment(path)) == 1
+
+
+def test_reopen_drops_torn_record(tmp_path):
+    t = _ts("2025-05-01T10:00:00")
+    log = DetectionLog(tmp_path)
+    log.append(t, [_cat()])
+    log.close()
+    path = segment_path(tmp_path, datetime.fromtimestamp(t).date())
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 10)
+
+    log = DetectionLog(tmp_path)
+    log.append(t + 1, [_cat(0.5)])
+    log.close()
+    assert path.stat().st_size == HEADER_SIZE + 2 * RECORD_DTYPE.itemsize
+    records = open_segment(path)
+    assert records["timestamp"].tolist() == [t, t + 1]
+    assert records["score"].tolist() == pytest.approx([0.9, 0.5])
+
+
+def test_reopen_rewrites_torn_header(tmp_path):
+    t = _ts("2025-05-01T10:00:00")
+    path = segment_path(tmp_path, datetime.fromtimestamp(t).date())
+    path.write_bytes(b"SSS")
+    log = DetectionLog(tmp_path)
+    log.append(t, [_cat()])
+    log.close()
+    assert open_segment(path)["timestamp"].tolist() == [t]
+
+
+def test_reopen_rejects_foreign_file(tmp_path):
+    t = _ts("2025-05-01T10:00:00")
+    path = segment_path(tmp_path, datetime.fromtimestamp(t).date())
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        DetectionLog(tmp_path).append(t, [_cat()])
+    assert path.read_bytes() == b"x" * 64
+
+
+def test_open_segment_rejects_foreign_file(tmp_path):
+    path = tmp_path / "2025-05-01.det"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        open_segment(path)
+
+
+def test_hourly_visit_counts(tmp_path):
+    log = DetectionLog(tmp_path)
+    # Visit 1 at 10:05 spans 10:05-10:06, visit 2 at 10:30, visit 3 next day 07:00
+    for t in ["2025-05-01T10:05:00", "2025-05-01T10:05:30", "2025-05-01T10:06:00"]:
+        log.append(_ts(t), [_cat()])
+    log.append(_ts("2025-05-01T10:30:00"), [_cat()])
+    log.append(_ts("2025-05-01T11:00:00"), [_cat(class_id=0)])
+    log.append(_ts("2025-05-02T07:00:00"), [_cat()])
+    log.close()
+
+    counts = hourly_visit_counts(
+        tmp_path,
+        _ts("2025-05-01T00:00:00"),
+        _ts("2025-05-03T00:00:00"),
+        class_ids=[15],
+        visit_gap=60,
+    )
+    assert counts == {
+        datetime(2025, 5, 1, 10): 2,
+        datetime(2025, 5, 2, 7): 1,
+    }
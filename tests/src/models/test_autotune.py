@@ -0,0 +1,118 @@
+import json
+import cv2
+import pytest
+from unittest.mock import MagicMock
+from src.models import autotune
+from src.models.autotune import (
+    DnnSettings,
+    apply_tuning,
+    cache_key,
+    candidate_settings,
+    tune_and_cache,
+)
+
+MODEL = "assets/yolov8n.onnx"
+CPU = DnnSettings(cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU, 1)
+
+
+@pytest.fixture(autouse=True)
+def restore_threads(monkeypatch):
+    monkeypatch.setattr(autotune, "_process_threads", None)
+    threads = cv2.getNumThreads()
+    yield
+    cv2.setNumThreads(threads)
+
+
+def test_candidate_settings_are_cpu_only():
+    candidates = candidate_settings([1, 2])
+    assert CPU in candidates
+    assert all(c.target in autotune.CPU_TARGET_NAMES for c in candidates)
+    assert {c.threads for c in candidates} == {1, 2}
+
+
+def test_tune_and_cache(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "tuning.json")
+    broken = DnnSettings(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE, 0, 1)
+    benchmark = autotune.benchmark
+
+    def fake_benchmark(model_path, settings, *args, **kwargs):
+        if settings == broken:
+            raise cv2.error("backend not built")
+        return benchmark(model_path, settings, *args, **kwargs)
+
+    monkeypatch.setattr(autotune, "benchmark", fake_benchmark)
+    best, results = tune_and_cache(
+        MODEL, 64, cache_path=cache_path, candidates=[CPU, broken], repeats=2
+    )
+    assert best == CPU
+    assert [s for s, _ in results] == [CPU]
+    entry = json.loads(open(cache_path).read())[cache_key(MODEL, 64)]
+    assert (entry["backend"], entry["target"], entry["threads"]) == (
+        CPU.backend,
+        CPU.target,
+        CPU.threads,
+    )
+
+
+def test_apply_tuning_uses_cache(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "tuning.json")
+    tuned = DnnSettings(cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU, 3)
+    autotune.save_cache(
+        {cache_key(MODEL, 640): {"backend": 3, "target": 0, "threads": 3}},
+        cache_path,
+    )
+    monkeypatch.setattr(autotune, "tune", MagicMock(side_effect=AssertionError))
+    net = MagicMock()
+    assert apply_tuning(net, MODEL, 640, mode="startup", cache_path=cache_path) == (
+        tuned
+    )
+    net.setPreferableBackend.assert_called_once_with(tuned.backend)
+    net.setPreferableTarget.assert_called_once_with(tuned.target)
+    assert cv2.getNumThreads() == 3
+    # Another input size (or model) is a different key
+    assert apply_tuning(net, MODEL, 320, mode="cache", cache_path=cache_path) is None
+
+
+def test_apply_tuning_startup_tunes_once(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "tuning.json")
+    monkeypatch.setattr(autotune, "candidate_settings", lambda: [CPU])
+    net = MagicMock()
+    assert apply_tuning(net, MODEL, 64, mode="startup", cache_path=cache_path) == CPU
+    monkeypatch.setattr(autotune, "tune", MagicMock(side_effect=AssertionError))
+    assert apply_tuning(net, MODEL, 64, mode="startup", cache_path=cache_path) == CPU
+
+
+def test_apply_tuning_off_and_missing_cache(tmp_path):
+    net = MagicMock()
+    missing = str(tmp_path / "none.json")
+    assert apply_tuning(net, MODEL, mode="off", cache_path=missing) is None
+    assert apply_tuning(net, MODEL, mode="cache", cache_path=missing) is None
+    net.setPreferableBackend.assert_not_called()
+
+
+def test_apply_tuning_sets_threads_once(tmp_path):
+    cache_path = str(tmp_path / "tuning.json")
+    autotune.save_cache(
+        {
+            cache_key(MODEL, 640): {"backend": 3, "target": 0, "threads": 3},
+            cache_key(MODEL, 320): {"backend": 3, "target": 0, "threads": 2},
+        },
+        cache_path,
+    )
+    apply_tuning(MagicMock(), MODEL, 640, mode="cache", cache_path=cache_path)
+    net = MagicMock()
+    apply_tuning(net, MODEL, 320, mode="cache", cache_path=cache_path)
+    # The second model gets its backend but not its thread count
+    net.setPreferableBackend.assert_called_once_with(3)
+    assert cv2.getNumThreads() == 3
+
+
+def test_pinned_threads_survive_tuning(tmp_path):
+    cache_path = str(tmp_path / "tuning.json")
+    autotune.save_cache(
+        {cache_key(MODEL, 640): {"backend": 3, "target": 0, "threads": 3}},
+        cache_path,
+    )
+    autotune.pin_threads(1)
+    apply_tuning(MagicMock(), MODEL, 640, mode="cache", cache_path=cache_path)
+    assert cv2.getNumThreads() == 1
@@ -0,0 +1,76 @@
+import sys
+from unittest.mock import MagicMock
+
+import onnx
+from onnx import TensorProto, helper
+
+from src.models import build, manifest
+
+
+def write_model(path):
+    # Identity followed by a no-op Add of zeros, which slimming removes
+    zeros = helper.make_tensor("zeros", TensorProto.FLOAT, [1], [0.0])
+    graph = helper.make_graph(
+        [
+            helper.make_node("Identity", ["images"], ["copy"]),
+            helper.make_node("Add", ["copy", "zeros"], ["output0"]),
+        ],
+        "model",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, 32, 32])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 3, 32, 32])],
+        initializer=[zeros],
+    )
+    onnx.save(helper.make_model(graph), str(path))
+
+
+def fake_ultralytics(monkeypatch, tmp_path):
+    yolo = MagicMock()
+    yolo.names = {0: "cat", 1: "dog"}
+
+    def export(**kwargs):
+        exported = tmp_path / f"export-{kwargs['imgsz']}.onnx"
+        write_model(exported)
+        return str(exported)
+
+    yolo.export.side_effect = export
+    module = MagicMock()
+    module.YOLO.return_value = yolo
+    monkeypatch.setitem(sys.modules, "ultralytics", module)
+    return yolo
+
+
+def test_build_exports_fixed_shape_and_records(monkeypatch, tmp_path):
+    yolo = fake_ultralytics(monkeypatch, tmp_path)
+    labels_path = tmp_path / "coco.names"
+    manifest_path = str(tmp_path / "models.json")
+    monkeypatch.setattr(
+        build, "get_model_path", lambda size: str(tmp_path / f"yolov8n-{size}.onnx")
+    )
+    monkeypatch.setattr(build, "LABELS_PATH", str(labels_path))
+
+    outputs = build.build([320, 416], manifest_path=manifest_path)
+
+    for call in yolo.export.call_args_list:
+        assert call.kwargs["dynamic"] is False
+        assert call.kwargs["batch"] == 1
+    assert labels_path.read_text() == "cat\ndog\n"
+    for output, size in zip(outputs, [320, 416]):
+        entry = manifest.verify_file(output, manifest_path)
+        assert entry["input_size"] == size
+        assert entry["slimmed"] is True
+        # The no-op Add is folded away
+        assert len(onnx.load(output).graph.node) < 2
+    manifest.verify_file(str(labels_path), manifest_path)
+
+
+def test_build_without_slim(monkeypatch, tmp_path):
+    fake_ultralytics(monkeypatch, tmp_path)
+    monkeypatch.setattr(
+        build, "get_model_path", lambda size: str(tmp_path / f"yolov8n-{size}.onnx")
+    )
+    monkeypatch.setattr(build, "LABELS_PATH", str(tmp_path / "coco.names"))
+
+    (output,) = build.build(
+        [320], simplify=False, manifest_path=str(tmp_path / "models.json")
+    )
+    assert len(onnx.load(output).graph.node) == 2
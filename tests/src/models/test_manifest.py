@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from src.models import manifest
+
+
+def test_record_and_verify(tmp_path):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights")
+    manifest_path = tmp_path / "models.json"
+    manifest.record_files([str(model)], str(manifest_path), input_size=320)
+    entry = manifest.verify_file(str(model), str(manifest_path))
+    assert entry["input_size"] == 320
+    assert entry["size"] == len(b"weights")
+    assert json.loads(manifest_path.read_text())["model.onnx"] == entry
+
+
+def test_record_keeps_other_entries(tmp_path):
+    manifest_path = str(tmp_path / "models.json")
+    for name in ["a.onnx", "b.onnx"]:
+        (tmp_path / name).write_bytes(name.encode())
+        manifest.record_files([str(tmp_path / name)], manifest_path)
+    assert set(manifest.load_manifest(manifest_path)) == {"a.onnx", "b.onnx"}
+
+
+def test_verify_missing_entry(tmp_path):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights")
+    with pytest.raises(FileNotFoundError, match="not in"):
+        manifest.verify_file(str(model), str(tmp_path / "models.json"))
+
+
+def test_verify_changed_file(tmp_path):
+    model = tmp_path / "model.onnx"
+    manifest_path = str(tmp_path / "models.json")
+    model.write_bytes(b"weights")
+    manifest.record_files([str(model)], manifest_path)
+    model.write_bytes(b"other weights")
+    with pytest.raises(RuntimeError, match="checksum"):
+        manifest.verify_file(str(model), manifest_path)
+
+
+def test_file_sha256_reads_once(tmp_path, monkeypatch):
+    model = tmp_path / "model.onnx"
+    model.write_bytes(b"weights")
+    manifest._sha256.cache_clear()
+    first = manifest.file_sha256(str(model))
+    assert manifest.file_sha256(str(model)) == first
+    assert manifest._sha256.cache_info().hits == 1
@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch, MagicMock
-from src.models import yolo_config
+from unittest.mock import patch
+from src.models import manifest, yolo_config
+from src.models.manifest import record_files
 from src.models.yolo_config import load_class_names, get_class_id, load_model
 
 
@@ -32,11 +33,29 @@ def test_load_class_names(tmp_path, monkeypatch):
     labels_path = tmp_path / "labels.names"
     labels_path.write_text("cat\ndog\n")
     monkeypatch.setattr(yolo_config, "LABELS_PATH", str(labels_path))
+    monkeypatch.setattr(yolo_config, "verify_file", lambda path: {})
     names = yolo_config.load_class_names()
     assert names == {0: "cat", 1: "dog"}
 
 
+def test_load_class_names_checksum_mismatch(tmp_path, monkeypatch):
+    labels_path = tmp_path / "coco.names"
+    manifest_path = tmp_path / "models.json"
+    labels_path.write_text("cat\ndog\n")
+    record_files([str(labels_path)], str(manifest_path))
+    labels_path.write_text("dog\ncat\n")
+    monkeypatch.setattr(yolo_config, "LABELS_PATH", str(labels_path))
+    monkeypatch.setattr(
+        yolo_config,
+        "verify_file",
+        lambda path: manifest.verify_file(path, str(manifest_path)),
+    )
+    with pytest.raises(RuntimeError, match="checksum"):
+        yolo_config.load_class_names()
+
+
 def test_load_model_existing(monkeypatch):
+    monkeypatch.setattr(yolo_config, "verify_file", lambda path: {})
     monkeypatch.setattr(yolo_config, "MODEL_PATH", "assets/yolov8n.onnx")
     monkeypatch.setattr(yolo_config.Path, "is_file", lambda self: True)
     with patch("cv2.dnn.readNetFromONNX") as mock_read:
@@ -45,23 +64,55 @@ def test_load_model_existing(monkeypatch):
         assert net == "net"
 
 
-def test_load_model_export(monkeypatch, tmp_path):
-    # Simulate model export path
+def test_load_model_missing(monkeypatch, tmp_path):
+    monkeypatch.setattr(yolo_config, "MODEL_PATH", str(tmp_path / "yolov8n.onnx"))
+    with patch("cv2.dnn.readNetFromONNX") as mock_read:
+        with pytest.raises(FileNotFoundError, match="src.models.build"):
+            yolo_config.load_model()
+        mock_read.assert_not_called()
+
+
+def test_load_model_checksum_mismatch(monkeypatch, tmp_path):
     model_path = tmp_path / "yolov8n.onnx"
-    labels_path = tmp_path / "coco.names"
+    manifest_path = tmp_path / "models.json"
+    model_path.write_bytes(b"model")
+    record_files([str(model_path)], str(manifest_path))
+    model_path.write_bytes(b"tampered")
     monkeypatch.setattr(yolo_config, "MODEL_PATH", str(model_path))
-    monkeypatch.setattr(yolo_config, "LABELS_PATH", str(labels_path))
-    monkeypatch.setattr(yolo_config.Path, "is_file", lambda self: False)
-    fake_yolo = MagicMock()
-    fake_yolo.export.return_value = str(model_path)
-    fake_yolo.names = {0: "cat", 1: "dog"}
-    with patch("ultralytics.YOLO", return_value=fake_yolo):
-        with (
-            patch("cv2.dnn.readNetFromONNX") as mock_read,
-            patch("shutil.move") as mock_move,
-        ):
-            mock_read.return_value = "net"
-            net = yolo_config.load_model()
-            assert net == "net"
-            mock_move.assert_called()
-            assert labels_path.read_text() == "cat\ndog\n"
+    monkeypatch.setattr(
+        yolo_config,
+        "verify_file",
+        lambda path: manifest.verify_file(path, str(manifest_path)),
+    )
+    with patch("cv2.dnn.readNetFromONNX") as mock_read:
+        with pytest.raises(RuntimeError, match="checksum"):
+            yolo_config.load_model()
+        mock_read.assert_not_called()
+
+
+def test_get_model_path_variant(monkeypatch):
+    monkeypatch.setattr(yolo_config, "MODEL_PATH", "assets/yolov8n.onnx")
+    assert yolo_config.get_model_path(640) == "assets/yolov8n.onnx"
+    assert yolo_config.get_model_path(320) == "assets/yolov8n-320.onnx"
+
+
+def test_load_model_variant(monkeypatch):
+    monkeypatch.setattr(yolo_config, "verify_file", lambda path: {})
+    monkeypatch.setattr(yolo_config, "MODEL_PATH", "assets/yolov8n.onnx")
+    monkeypatch.setattr(yolo_config.Path, "is_file", lambda self: True)
+    with patch("cv2.dnn.readNetFromONNX") as mock_read:
+        yolo_config.load_model(320)
+        mock_read.assert_called_once_with("assets/yolov8n-320.onnx")
+
+
+def test_load_model_missing_variant(monkeypatch):
+    monkeypatch.setattr(yolo_config, "verify_file", lambda path: {})
+    monkeypatch.setattr(yolo_config, "MODEL_PATH", "assets/yolov8n.onnx")
+    monkeypatch.setattr(
+        yolo_config.Path, "is_file", lambda self: str(self).endswith("yolov8n.onnx")
+    )
+    with patch("cv2.dnn.readNetFromONNX") as mock_read:
+        # The main model has a fixed input size and cannot stand in
+        with pytest.raises(FileNotFoundError, match="--input-size 320"):
+            yolo_config.load_model(320)
+        mock_read.assert_not_called()
@@ -0,0 +1,31 @@
+from src.decision import DeterrentController
+
+
+def test_controller_fires_after_hold_time():
+    controller = DeterrentController(hold_time=1.0, duration=1.5)
+    assert not controller.update(True, 0.0)
+    assert controller.cat_detected_since == 0.0
+    assert not controller.update(True, 0.5)
+    assert controller.update(True, 1.0)
+    # Fires only once while active
+    assert not controller.update(True, 1.2)
+
+
+def test_controller_rearms_after_duration():
+    controller = DeterrentController(hold_time=1.0, duration=1.5)
+    controller.update(True, 0.0)
+    assert controller.update(True, 1.0)
+    assert not controller.update(True, 1.5)
+    assert controller.cat_detected_since is None
+    assert not controller.update(True, 1.6)
+    assert controller.update(True, 2.6)
+
+
+def test_controller_resets_when_cat_leaves():
+    controller = DeterrentController(hold_time=1.0, duration=1.5)
+    controller.update(True, 0.0)
+    assert not controller.update(False, 0.5)
+    assert controller.cat_detected_since is None
+    assert not controller.update(True, 1.0)
+    assert not controller.update(True, 1.5)
+    assert controller.update(True, 2.0)
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+import src.loop as loop_mod
+from src.decision import DeterrentController
+from src.loop import NOT_DETECTED, DetectionLoop
+from src.tools.soak import FakeCamera, SimulatedClock
+
+CAT = {"bbox": (1, 2, 3, 4), "class_id": 15, "label": "cat", "score": 0.9}
+PERSON = {"bbox": (1, 2, 3, 4), "class_id": 0, "label": "person", "score": 0.9}
+
+
+def test_loop_records_and_fires(monkeypatch):
+    monkeypatch.setattr(
+        loop_mod,
+        "detect_cat",
+        lambda frame, debug, preprocessor: {
+            "detected": True,
+            "detections": [CAT, PERSON],
+        },
+    )
+    deterrent, history = MagicMock(), MagicMock()
+    loop = DetectionLoop(
+        FakeCamera(64, 48),
+        deterrent,
+        controller=DeterrentController(hold_time=0.2, duration=10),
+        preprocessor=MagicMock(),
+        history=history,
+        want_boxes=True,
+        duration=1.5,
+        clock=SimulatedClock(step=0.1),
+    )
+    for _ in range(4):
+        loop.step()
+    deterrent.activate.assert_called_once_with(1.5)
+    assert history.append.call_count == 4
+    assert history.append.call_args.args[1] == [CAT]
+
+
+def test_loop_prefilter_skip(monkeypatch):
+    detect = MagicMock()
+    monkeypatch.setattr(loop_mod, "detect_cat", detect)
+    prefilter = MagicMock()
+    prefilter.should_run.return_value = False
+    loop = DetectionLoop(
+        FakeCamera(64, 48), MagicMock(), prefilter=prefilter, preprocessor=MagicMock()
+    )
+    first = loop.step()
+    frame = loop.frame
+    assert loop.step() is NOT_DETECTED is first
+    assert loop.frame is frame
+    detect.assert_not_called()
+
+
+def test_loop_prepares_during_hold_and_discards(monkeypatch):
+    seen = iter([False, True, True, False, True, True, True])
+    deterrent = MagicMock()
+    loop = DetectionLoop(
+        FakeCamera(64, 48),
+        deterrent,
+        controller=DeterrentController(hold_time=0.2, duration=10),
+        duration=1.5,
+    )
+    calls = []
+    deterrent.prepare.side_effect = lambda d: calls.append(("prepare", d))
+    deterrent.discard.side_effect = lambda: calls.append(("discard",))
+    for i, detected in enumerate(seen):
+        if loop.decide({"detected": detected}, 0.1 * i):
+            calls.append(("fire",))
+    # The cat leaves during the first hold window and stays the second time
+    assert calls == [
+        ("prepare", 1.5),
+        ("discard",),
+        ("prepare", 1.5),
+        ("fire",),
+    ]
+
+
+def test_loop_hook_errors_are_contained():
+    deterrent = MagicMock()
+    deterrent.prepare.side_effect = RuntimeError("no device")
+    loop = DetectionLoop(FakeCamera(64, 48), deterrent)
+    assert loop.decide({"detected": True}, 0.0) is False
+    deterrent.prepare.assert_called_once()
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+import pytest
+from src.decision import DeterrentController
+from src.loop import DetectionLoop
+from src.pipeline import DropOldestQueue, Pipeline
+from src.tools.soak import FakeCamera
+
+
+def _loop(detect, deterrent=None, hold_time=0.0):
+    loop = DetectionLoop(
+        FakeCamera(64, 48),
+        deterrent or MagicMock(),
+        controller=DeterrentController(hold_time=hold_time, duration=100),
+        preprocessor=MagicMock(),
+    )
+    loop.detect = detect
+    return loop
+
+
+def _run_for(pipeline, seconds):
+    async def runner():
+        asyncio.get_running_loop().call_later(seconds, pipeline.stop)
+        await pipeline.run()
+
+    asyncio.run(runner())
+
+
+def test_drop_oldest_queue():
+    async def fill():
+        queue = DropOldestQueue(2)
+        for i in range(5):
+            queue.put_nowait(i)
+        return queue.dropped, [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(fill()) == (3, [3, 4])
+
+
+def test_slow_inference_drops_frames_without_stalling_capture():
+    def slow_detect(frame):
+        time.sleep(0.05)
+        return {"detected": False}
+
+    pipeline = Pipeline(_loop(slow_detect), frequency=0.005, report_interval=0)
+    _run_for(pipeline, 0.4)
+    capture, inference = pipeline.stats["capture"], pipeline.stats["inference"]
+    assert inference.items <= 9
+    assert capture.items > 2 * inference.items
+    assert inference.dropped > 0
+    assert inference.utilization() > 0.5
+
+
+class CountingCamera(FakeCamera):
+    """
+    Fills every read with its read number, so overwritten frames show.
+    """
+
+    def read(self, image=None):
+        ok, frame = super().read(image)
+        frame.fill(self.reads % 256)
+        return ok, frame
+
+
+@pytest.mark.parametrize("display", [None, lambda frame, detection: True])
+def test_capture_never_overwrites_frames_in_use(display):
+    seen = []
+
+    def slow_detect(frame):
+        value = frame[0, 0, 0]
+        time.sleep(0.05)
+        seen.append(bool((frame == value).all()))
+        return {"detected": False}
+
+    loop = _loop(slow_detect)
+    loop.cap = CountingCamera(64, 48)
+    pipeline = Pipeline(loop, frequency=0.002, report_interval=0, display=display)
+    _run_for(pipeline, 0.4)
+    assert len(seen) > 3
+    assert all(seen)
+    # Buffers are still reused once released
+    assert loop.cap.allocations < loop.cap.reads
+
+
+def test_slow_deterrent_does_not_stall_detection():
+    deterrent = MagicMock()
+    deterrent.activate.side_effect = lambda duration: time.sleep(0.3)
+    pipeline = Pipeline(
+        _loop(lambda frame: {"detected": True}, deterrent),
+        frequency=0.01,
+        report_interval=0,
+    )
+    _run_for(pipeline, 0.2)
+    # The deterrent is still busy but detection carried on
+    deterrent.activate.assert_called_once()
+    assert pipeline.stats["inference"].items > 10
+    assert pipeline.stats["decision"].items > 10
+
+
+def test_display_stops_pipeline():
+    shown = []
+
+    def display(frame, detection):
+        shown.append(frame.shape)
+        return len(shown) < 3
+
+    pipeline = Pipeline(
+        _loop(lambda frame: {"detected": False}),
+        frequency=0.01,
+        report_interval=0,
+        display=display,
+    )
+    asyncio.run(asyncio.wait_for(pipeline.run(), timeout=2))
+    assert shown == [(48, 64, 3)] * 3
+
+
+def test_stage_failure_propagates():
+    loop = _loop(lambda frame: {"detected": False})
+    loop.cap.read = MagicMock(return_value=(False, None))
+    pipeline = Pipeline(loop, frequency=0.01, report_interval=0)
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(pipeline.run(), timeout=2))
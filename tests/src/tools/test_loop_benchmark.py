@@ -0,0 +1,8 @@
+from src.tools.loop_benchmark import run_benchmark, synthetic_gunshots
+
+
+def test_run_benchmark_reports_equivalence():
+    results = run_benchmark([1.5, 6.0, 12.0], synthetic_gunshots(), repeats=1)
+    assert [r["duration"] for r in results] == [1.5, 6.0, 12.0]
+    assert all(r["equivalent"] for r in results)
+    assert all(r["legacy_ms"] > 0 and r["array_ms"] > 0 for r in results)
@@ -0,0 +1,8 @@
+from src.tools.nms_benchmark import run_benchmark
+
+
+def test_run_benchmark_reports_equivalence():
+    results = run_benchmark({"busy": (200, 5), "crowded": (2000, 40)}, repeats=1)
+    assert [r["scenario"] for r in results] == ["busy", "crowded"]
+    assert all(r["equivalent"] for r in results)
+    assert all(r["legacy_ms"] > 0 and r["vectorized_ms"] > 0 for r in results)
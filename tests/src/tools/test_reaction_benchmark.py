@@ -0,0 +1,63 @@
+import math
+import pytest
+from src.decision import DeterrentController
+from src.tools.reaction_benchmark import (
+    Appearance,
+    InstrumentedDeterrent,
+    SyntheticCatSource,
+    format_report,
+    oracle_detector,
+    run_benchmark,
+    summarize,
+    synthetic_appearances,
+)
+
+
+def test_synthetic_source_paints_cat():
+    now = [0.0]
+    source = SyntheticCatSource(
+        [Appearance(0.1, 0.2)], fps=10, size=(48, 64), clock=lambda: now[0]
+    )
+    source.start()
+    detect = oracle_detector()
+    frame, captured_at = source.read()
+    assert not detect(frame)["detected"]
+    now[0] = 0.15
+    frame, captured_at = source.read()
+    assert captured_at == pytest.approx(0.1)
+    assert detect(frame)["detected"]
+
+
+def test_run_benchmark_breakdown():
+    appearances = synthetic_appearances(2, present=0.3, gap=0.1, fps=100)
+    source = SyntheticCatSource(appearances, fps=100, size=(48, 64), tail=0.05)
+    deterrent = InstrumentedDeterrent(latency=0.01)
+    controller = DeterrentController(hold_time=0.05, duration=1.0)
+    events = run_benchmark(
+        source, oracle_detector(0.002), deterrent, controller, frequency=0.005
+    )
+    assert all(e.fired for e in events)
+    for event in events:
+        parts = event.breakdown()
+        assert parts["hold"] >= 0.05
+        assert parts["activation"] >= 0.01
+        assert parts["inference"] >= 0.002
+        assert parts["total"] == pytest.approx(
+            sum(parts[s] for s in ("capture", "inference", "hold", "activation"))
+        )
+
+    summary = summarize(events)
+    assert summary["total"]["max"] >= summary["total"]["p50"]
+    assert "2/2 appearances" in format_report(events)
+
+
+def test_summarize_no_events():
+    events = run_benchmark(
+        SyntheticCatSource([], fps=100, tail=0.01),
+        oracle_detector(),
+        InstrumentedDeterrent(),
+        DeterrentController(),
+        frequency=0.001,
+    )
+    assert events == []
+    assert math.isnan(summarize(events)["total"]["mean"])
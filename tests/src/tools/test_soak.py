@@ -0,0 +1,56 @@
+import numpy as np
+import src.models.yolo_config as yolo_config
+from src.tools.soak import (
+    FakeCamera,
+    SoakReport,
+    build_pipeline,
+    check_report,
+    run_soak,
+)
+
+MIB = 1024 * 1024
+
+
+def test_fake_camera_reads_into_buffer():
+    camera = FakeCamera(64, 48)
+    _, frame = camera.read()
+    _, again = camera.read(frame)
+    assert again is frame
+    assert camera.allocations == 1
+    _, other = camera.read(np.empty((1, 1, 3), dtype=np.uint8))
+    assert other.shape == (48, 64, 3)
+    assert camera.allocations == 2
+
+
+def test_steady_state_pipeline_does_not_grow(monkeypatch):
+    # The test model takes any input size, so it stands in for the variant
+    monkeypatch.setattr(
+        yolo_config, "get_model_path", lambda size: yolo_config.MODEL_PATH
+    )
+    pipeline = build_pipeline(input_size=128)
+    report = run_soak(pipeline, iterations=400, warmup=20)
+    assert report.iterations >= 400
+    # Frame buffers come back to the pool instead of being reallocated
+    assert pipeline.loop.cap.allocations <= pipeline._pool.max_free
+    assert (
+        check_report(
+            report,
+            max_growth_per_iteration=64,
+            max_peak_in_flight=2 * MIB,
+            max_rss_growth=16 * MIB,
+        )
+        == []
+    )
+
+
+def test_check_report_flags_each_limit():
+    report = SoakReport(
+        iterations=10,
+        growth_per_iteration=100.0,
+        peak_in_flight=3 * MIB,
+        rss_start=0,
+        rss_end=32 * MIB,
+    )
+    failures = check_report(report, 64, 2 * MIB, 16 * MIB)
+    assert len(failures) == 3
+    assert failures[0].startswith("traced memory grew 100.0 B/iteration")
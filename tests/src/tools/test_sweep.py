@@ -0,0 +1,123 @@
+import math
+import cv2
+import numpy as np
+import pytest
+import src.models.yolo_config as yolo_config
+from src.tools.sweep import (
+    SweepPoint,
+    SweepResult,
+    format_table,
+    pareto_front,
+    run_sweep,
+    score_events,
+    simulate_loop,
+)
+
+
+def _result(latency, precision, recall):
+    point = SweepPoint(640, "pad", 0.5, 0.4, 0.1)
+    return SweepResult(point, latency, latency, precision, recall, samples=1)
+
+
+def test_simulate_loop_skips_frames_while_busy():
+    times = np.arange(10) * 0.1
+    latency = np.full(10, 0.17)
+    detected = np.zeros(10, dtype=bool)
+    sample_times, _, _ = simulate_loop(times, latency, detected, frequency=0.05)
+    # Inference is busy for 0.17 s, so it skips to the newest frame each time
+    assert sample_times.tolist() == pytest.approx([0.0, 0.1, 0.3, 0.5, 0.6, 0.8])
+
+
+def test_score_events():
+    sample_times = np.arange(10, dtype=float)
+    hits = np.array([0, 1, 1, 0, 0, 1, 0, 0, 1, 1], dtype=bool)
+    # Runs at 1-2, 5 and 8-9; only 1-2 and 8-9 overlap a cat
+    precision, recall = score_events(sample_times, hits, [(1, 3), (6, 8), (8, 10)])
+    assert precision == pytest.approx(2 / 3)
+    assert recall == pytest.approx(2 / 3)
+
+
+def test_score_events_without_predictions():
+    precision, recall = score_events(np.arange(3.0), np.zeros(3, bool), [(0, 1)])
+    assert math.isnan(precision)
+    assert recall == 0
+
+
+def test_pareto_front():
+    fast = _result(10, 0.5, 0.5)
+    accurate = _result(50, 0.9, 0.9)
+    dominated = _result(60, 0.8, 0.9)
+    silent = _result(5, math.nan, 0.0)
+    front = pareto_front([accurate, dominated, fast, silent])
+    assert front == [silent, fast, accurate]
+    assert not dominated.pareto
+
+
+def _write_clip(tmp_path, bright=()):
+    """Writes a 10 fps clip of 12 black frames, white at the `bright` indices."""
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(12):
+        writer.write(np.full((48, 64, 3), 255 if i in bright else 0, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+class BrightCatNet:
+    """Finds a cat in bright frames and nothing in dark ones."""
+
+    def setInput(self, blob):
+        self.blob = blob
+
+    def forward(self):
+        outputs = np.zeros((1, 84, 4), dtype=np.float32)
+        outputs[0, :4, 0] = [32, 32, 20, 20]
+        if self.blob.mean() > 0.5:
+            outputs[0, 4 + 15, 0] = 0.9
+        return outputs
+
+
+def test_run_sweep_on_clip(tmp_path, monkeypatch):
+    # The test model takes any input size, so it stands in for the variant
+    monkeypatch.setattr(
+        yolo_config, "get_model_path", lambda size: yolo_config.MODEL_PATH
+    )
+    path = _write_clip(tmp_path)
+
+    results = run_sweep(
+        path,
+        [(0.2, 0.6)],
+        input_sizes=[64],
+        modes=["pad", "crop"],
+        confidence_thresholds=[0.3, 0.5],
+        score_thresholds=[0.4],
+        frequencies=[0.0, 0.2],
+        workers=2,
+        chunk_frames=5,
+    )
+    assert len(results) == 2 * 2 * 2
+    assert all(r.samples > 0 and r.latency_ms > 0 for r in results)
+    assert any(r.pareto for r in results)
+    assert len(format_table(results).splitlines()) == len(results) + 1
+
+
+def test_run_sweep_counts_detections(tmp_path, monkeypatch):
+    import src.detection.detector as detector
+
+    # Workers are forked, so they inherit the fake model
+    monkeypatch.setattr(detector, "get_model", lambda input_size: BrightCatNet())
+    # A cat in view from 0.2 s to 0.6 s
+    path = _write_clip(tmp_path, bright=range(2, 6))
+    (result,) = run_sweep(
+        path,
+        [(0.2, 0.6)],
+        input_sizes=[64],
+        modes=["pad"],
+        confidence_thresholds=[0.5],
+        score_thresholds=[0.4],
+        frequencies=[0.0],
+        workers=1,
+        chunk_frames=5,
+    )
+    assert result.recall == 1.0
+    assert result.precision == 1.0
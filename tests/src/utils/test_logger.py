@@ -24,3 +24,44 @@ def test_logger_error(loguru_capture):
     logger.error("Error message")
     loguru_capture.seek(0)
     assert "Error message" in loguru_capture.getvalue()
+
+
+def test_rate_limiter_interval():
+    """Test a key is only allowed once per interval."""
+    from src.utils.logger import RateLimiter
+
+    now = [0.0]
+    limiter = RateLimiter(interval=1.0, sample=1, clock=lambda: now[0])
+    assert limiter.allow("box")
+    assert not limiter.allow("box")
+    assert limiter.allow("other")
+    now[0] = 1.5
+    assert limiter.allow("box")
+    assert limiter.suppressed["box"] == 1
+
+
+def test_rate_limiter_sampling():
+    """Test only every Nth call for a key is allowed."""
+    from src.utils.logger import RateLimiter
+
+    limiter = RateLimiter(interval=0.0, sample=3)
+    allowed = [limiter.allow("box") for _ in range(9)]
+    assert allowed == [False, False, True] * 3
+
+
+def test_configure_logging_json_sink(tmp_path):
+    """Test the optional JSON-lines sink writes structured records."""
+    import json
+    from src.utils import logger as logger_mod
+
+    json_path = tmp_path / "log.jsonl"
+    logger_mod.configure_logging(level="INFO", json_path=str(json_path), enqueue=True)
+    try:
+        assert not logger_mod.debug_enabled()
+        logger.info("Structured {}", "message")
+        logger.complete()
+        record = json.loads(json_path.read_text().splitlines()[-1])
+        assert record["record"]["message"] == "Structured message"
+    finally:
+        logger_mod.configure_logging()
+    assert logger_mod.debug_enabled()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+from src.utils import profiler as profiler_mod
+from src.utils.profiler import SamplingProfiler, is_idle, stage_of
+
+
+def busy_inference(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_stage_of():
+    assert stage_of("inference_0") == "inference"
+    assert stage_of("capture_12") == "capture"
+    assert stage_of("MainThread") == "main"
+    assert stage_of("speech-worker") == "speech-worker"
+
+
+def test_is_idle():
+    assert is_idle(("thread.py:_worker",))
+    assert is_idle(("base_events.py:run_forever", "selectors.py:EpollSelector.select"))
+    assert not is_idle(("thread.py:_worker", "detector.py:detect_objects"))
+
+
+def test_sample_attributes_stacks_to_stage(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_inference, args=(stop,), name="inference_0")
+    worker.start()
+    profiler = SamplingProfiler(output_dir=str(tmp_path), top=5)
+    try:
+        for _ in range(20):
+            profiler.sample()
+            time.sleep(0.001)
+    finally:
+        stop.set()
+        worker.join()
+
+    stages = {stage for stage, _ in profiler.stacks}
+    assert "inference" in stages
+    inference = [s for (stage, s), _ in profiler.stacks.items() if stage == "inference"]
+    assert all("test_profiler.py:busy_inference" in stack for stack in inference)
+
+    stacks_path, summary_path = profiler.write()
+    lines = stacks_path.read_text().splitlines()
+    assert any(
+        line.startswith("inference;") and "busy_inference" in line for line in lines
+    )
+    summary = summary_path.read_text()
+    assert "== inference:" in summary
+    assert "test_profiler.py:busy_inference" in summary
+
+
+def test_window_writes_files_when_done(tmp_path):
+    profiler = SamplingProfiler(duration=0.05, interval=0.01, output_dir=str(tmp_path))
+    assert profiler.start()
+    assert not profiler.start()
+    profiler._thread.join(timeout=5)
+    assert not profiler.running
+    assert profiler.samples > 0
+    assert len(list(tmp_path.glob("profile-*.folded"))) == 1
+    assert len(list(tmp_path.glob("profile-*.txt"))) == 1
+
+
+def test_toggle_stops_early(tmp_path):
+    profiler = SamplingProfiler(duration=60, interval=0.01, output_dir=str(tmp_path))
+    profiler.toggle()
+    assert profiler.running
+    profiler.toggle()
+    profiler._thread.join(timeout=5)
+    assert not profiler.running
+    assert list(tmp_path.glob("profile-*.txt"))
+
+
+def test_install_signal(monkeypatch, tmp_path):
+    installed = {}
+    monkeypatch.setattr(
+        profiler_mod.signal,
+        "signal",
+        lambda num, handler: installed.update({num: handler}),
+    )
+    profiler = SamplingProfiler(duration=60, output_dir=str(tmp_path))
+    assert profiler.install_signal(10)
+    installed[10](10, None)
+    assert profiler.running
+    profiler.stop()
+    assert not profiler.running